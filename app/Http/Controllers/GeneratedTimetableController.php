@@ -7,8 +7,10 @@
 use App\Models\Lecturer;
 use App\Models\Section;
 use App\Models\Subject;
+use App\Models\TimetableGenerationJob;
 use App\Models\TimetablePreference;
 use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\Validator;
 use Symfony\Component\Process\Process;
 use Symfony\Component\Process\Exception\ProcessFailedException;
@@ -118,6 +120,14 @@
  *             enum={1, 2},
  *             description="Schedule optimization mode: 1=compact (minimize gaps), 2=spaced_out (maximize breaks)",
  *             example=1
+ *         ),
+ *         @OA\Property(
+ *             property="alternatives",
+ *             type="integer",
+ *             minimum=1,
+ *             maximum=10,
+ *             description="Optional number of distinct timetables to return, best first, as 'alternatives' (POST /api/generate-timetable only); the best one is saved",
+ *             example=3
  *         )
  *     )
  * )
@@ -169,19 +179,7 @@ class GeneratedTimetableController extends Controller
      */
     public function generate(Request $request)
     {
-        $validator = Validator::make($request->all(), [
-            'preferences' => 'required|array',
-            'preferences.subjects' => 'required|array',
-            'preferences.subjects.*' => 'exists:subjects,id',
-            'preferences.days' => 'required|array',
-            'preferences.days.*' => 'exists:days,id',
-            'preferences.start_time' => 'required|date_format:H:i',
-            'preferences.end_time' => 'required|date_format:H:i|after:preferences.start_time',
-            'preferences.enforce_ties' => 'required|string|in:yes,no',
-            'preferences.lecturers' => 'sometimes|array',
-            'preferences.lecturers.*' => 'exists:lecturers,id',
-            'preferences.mode' => 'required|integer|in:1,2', // 1=compact, 2=spaced_out
-        ]);
+        $validator = Validator::make($request->all(), $this->preferenceRules(true));
 
         if ($validator->fails()) {
             return response()->json($validator->errors(), 422);
@@ -200,87 +198,31 @@ public function generate(Request $request)
         
         $preferences = $validator->validated()['preferences'];
 
-        // 1. Generate available sections based on user criteria
-        $availableSections = $this->generateAvailableSections($preferences);
-
-        if (empty($availableSections)) {
-            return response()->json(['message' => 'No valid sections can be generated for the selected criteria.'], 422);
+        // Identical requests against an unchanged catalogue reuse the last
+        // result; the cache holds one timetable, so not for alternatives
+        $alternatives = (int) ($preferences['alternatives'] ?? 1);
+        $cacheKey = $this->resultCacheKey($preferences);
+        $cached = $alternatives > 1 ? null : $this->cachedResult($cacheKey);
+        if ($cached !== null) {
+            return response()->json($this->saveTimetable($user, $cached), 201);
         }
 
-        // 2. Prepare subject and lecturer names for preferences
-        $subjectNames = Subject::whereIn('id', $preferences['subjects'])->pluck('name')->all();
-        $lecturerNames = isset($preferences['lecturers']) ? Lecturer::whereIn('id', $preferences['lecturers'])->pluck('name')->all() : [];
-        $dayNames = Day::whereIn('id', $preferences['days'])->pluck('name')->all();
-
-        // 3. Transform preferences into the format expected by the Python script
-        $scheduleStyle = $preferences['mode'] == 1 ? 'compact' : 'spaced_out';
-        $enforceTies = $preferences['enforce_ties'] === 'yes';
-        
-        $scriptPreferences = [
-            'subjects' => $subjectNames,
-            'preferred_lecturers' => $lecturerNames,
-            'preferred_days' => $dayNames,
-            'preferred_start' => $preferences['start_time'] . ':00',
-            'preferred_end' => $preferences['end_time'] . ':00',
-            'schedule_style' => $scheduleStyle,
-            'enforce_ties' => $enforceTies,
-        ];
-
-        // 4. Map class data into the format expected by the Python script
-        $classesData = collect($availableSections)->map(function ($section) {
-            // Use the activity field from the database
-            $activity = $section->activity ?? 'Lecture';
-            
-            // Get tied sections - use the tied_to field if available
-            $tiedTo = [];
-            if ($section->tied_to && is_array($section->tied_to)) {
-                $tiedTo = $section->tied_to;
-            } elseif ($section->tied_to && is_string($section->tied_to)) {
-                // Handle comma-separated tied sections
-                $tiedTo = array_map('trim', explode(',', $section->tied_to));
-                $tiedTo = array_filter($tiedTo); // Remove empty values
-            }
-            
-            return [
-                'code' => $section->subject->code,
-                'subject' => $section->subject->name,
-                'activity' => $activity,
-                'section' => $section->section_number,
-                'days' => $section->day_of_week,
-                'start_time' => $section->start_time,
-                'end_time' => $section->end_time,
-                'venue' => $section->venue ?? 'TBD',
-                'tied_to' => $tiedTo,
-                'lecturer' => $section->lecturer ? $section->lecturer->name : 'TBD',
-            ];
-        });
-
-        // 5. Prepare the final input data for the script
-        $inputData = [
-            'classes' => $classesData->toArray(),
-            'preferences' => $scriptPreferences,
-        ];
-
-        // 6. Execute Python script
-        $pythonExecutable = env('PYTHON_EXECUTABLE', '/Users/biehatieha/code/yaya/timetable-api/.venv/bin/python');
-        $scriptPath = app_path('Http/Controllers/TimetableEngine/main.py');
+        // 1-6. Run the timetable engine (daemon if configured, else a Python process)
+        $result = $this->runEngine($preferences);
 
-        $process = new Process([$pythonExecutable, $scriptPath]);
-        $process->setWorkingDirectory(app_path('Http/Controllers/TimetableEngine'));
-        $process->setInput(json_encode($inputData));
-        $process->run();
+        if ($result === null) {
+            return response()->json(['message' => 'No valid sections can be generated for the selected criteria.'], 422);
+        }
 
-        if (!$process->isSuccessful()) {
-            $stdout = $process->getOutput();
-            $stderr = $process->getErrorOutput();
-            $exitCode = $process->getExitCode();
+        [$exitCode, $stdout, $stderr] = $result;
 
+        if ($exitCode !== 0) {
             // Log the detailed error for debugging
             \Log::error('Timetable generator script failed.', [
                 'exit_code' => $exitCode,
                 'stdout' => $stdout,
                 'stderr' => $stderr,
-                'input' => $inputData,
+                'preferences' => $preferences,
             ]);
 
             // The Python script is expected to send JSON errors to stdout.
@@ -302,28 +244,208 @@ public function generate(Request $request)
             ], 500);
         }
 
-        $rawOutput = $process->getOutput();
+        $rawOutput = $stdout;
         $output = json_decode($rawOutput, true);
 
         if (json_last_error() !== JSON_ERROR_NONE) {
             return response()->json(['message' => 'Failed to decode timetable from generator.', 'raw_output' => $rawOutput], 500);
         }
 
+        $this->logEngineMetrics($output, $preferences);
+
         if (isset($output['status']) && $output['status'] === 'error') {
             return response()->json(['message' => $output['message']], 422);
         }
 
-        // Deactivate any existing active timetables for the user
-        GeneratedTimetable::where('user_id', $user->id)->update(['active' => false]);
+        // 7. Save the new (best) timetable
+        $generatedTimetable = $this->saveTimetable($user, $output['timetable']);
+        if ($alternatives > 1) {
+            return response()->json(
+                $generatedTimetable->toArray() + ['alternatives' => $output['alternatives'] ?? []],
+                201
+            );
+        }
+
+        $this->cacheResult($cacheKey, $output['timetable']);
+
+        return response()->json($generatedTimetable, 201);
+    }
+
+    /**
+     * @OA\Post(
+     *      path="/api/generate-timetable/stream",
+     *      operationId="generateTimetableStream",
+     *      tags={"Generated Timetables"},
+     *      summary="Generate a timetable, streaming progress as Server-Sent Events",
+     *      description="Same request and validation as /api/generate-timetable, but the response is a text/event-stream. Each 'progress' event carries the generation, best and average score, and (when the best improves) the best timetable so far. A final 'result' event carries the saved GeneratedTimetable, or an 'error' event the failure message. Closing the connection cancels generation.",
+     *      security={{"bearerAuth":{}}},
+     *      @OA\RequestBody(
+     *          required=true,
+     *          @OA\JsonContent(ref="#/components/schemas/TimetableGenerationRequest")
+     *      ),
+     *      @OA\Response(response=200, description="Event stream of progress and the result", @OA\MediaType(mediaType="text/event-stream")),
+     *      @OA\Response(response=422, description="Validation error or no valid sections found"),
+     *      @OA\Response(response=401, description="Unauthenticated - Bearer token required")
+     * )
+     */
+    public function generateStream(Request $request)
+    {
+        $validator = Validator::make($request->all(), $this->preferenceRules());
+
+        if ($validator->fails()) {
+            return response()->json($validator->errors(), 422);
+        }
+
+        $user = $request->user();
+        $preferences = $validator->validated()['preferences'];
+        $cacheKey = $this->resultCacheKey($preferences);
+        $cached = $this->cachedResult($cacheKey);
+
+        $inputData = null;
+        if ($cached === null) {
+            $inputData = $this->usesCatalogueSnapshot()
+                ? $this->snapshotEngineInput($preferences)
+                : $this->buildEngineInput($preferences);
+
+            if ($inputData === null) {
+                return response()->json(['message' => 'No valid sections can be generated for the selected criteria.'], 422);
+            }
+
+            $inputData['stream'] = true;
+        }
+
+        return response()->stream(function () use ($user, $preferences, $inputData, $cacheKey, $cached) {
+            $sendEvent = function (string $event, array $data) {
+                echo "event: {$event}\n";
+                echo 'data: ' . json_encode($data) . "\n\n";
+                if (ob_get_level() > 0) {
+                    ob_flush();
+                }
+                flush();
+            };
+
+            if ($cached !== null) {
+                $sendEvent('result', $this->saveTimetable($user, $cached)->toArray());
+                return;
+            }
+
+            $finished = false;
+            foreach ($this->streamEngine($inputData, $preferences) as $event) {
+                if (($event['event'] ?? null) !== 'result') {
+                    $sendEvent('progress', $event);
+                    if (connection_aborted()) {
+                        // Leaving the loop closes the engine stream, which cancels the search
+                        break;
+                    }
+                    continue;
+                }
 
-        // 7. Save the new timetable
-        $generatedTimetable = GeneratedTimetable::create([
+                $finished = true;
+                $this->logEngineMetrics($event, $preferences);
+                if (($event['status'] ?? null) === 'success') {
+                    $this->cacheResult($cacheKey, $event['timetable']);
+                    $sendEvent('result', $this->saveTimetable($user, $event['timetable'])->toArray());
+                } else {
+                    $sendEvent('error', ['message' => $event['message'] ?? 'No timetable could be generated.']);
+                }
+                break;
+            }
+
+            if (!$finished && !connection_aborted()) {
+                $sendEvent('error', ['message' => 'The timetable generation process failed unexpectedly.']);
+            }
+        }, 200, [
+            'Content-Type' => 'text/event-stream',
+            'Cache-Control' => 'no-cache',
+            'X-Accel-Buffering' => 'no',
+        ]);
+    }
+
+    /**
+     * @OA\Post(
+     *      path="/api/generate-timetable/jobs",
+     *      operationId="queueTimetableGeneration",
+     *      tags={"Generated Timetables"},
+     *      summary="Queue a timetable generation",
+     *      description="Validates the request like /api/generate-timetable and queues it for the engine worker (TimetableEngine/worker.py) instead of running it inside the web request. Poll the returned job until its status is completed or failed.",
+     *      security={{"bearerAuth":{}}},
+     *      @OA\RequestBody(
+     *          required=true,
+     *          @OA\JsonContent(ref="#/components/schemas/TimetableGenerationRequest")
+     *      ),
+     *      @OA\Response(response=202, description="Generation queued", @OA\JsonContent(ref="#/components/schemas/TimetableGenerationJob")),
+     *      @OA\Response(response=422, description="Validation error or no valid sections found"),
+     *      @OA\Response(response=401, description="Unauthenticated - Bearer token required")
+     * )
+     */
+    public function queue(Request $request)
+    {
+        $validator = Validator::make($request->all(), $this->preferenceRules());
+
+        if ($validator->fails()) {
+            return response()->json($validator->errors(), 422);
+        }
+
+        $user = $request->user();
+        $preferences = $validator->validated()['preferences'];
+
+        // A cached result completes the job without involving the worker
+        $cached = $this->cachedResult($this->resultCacheKey($preferences));
+        if ($cached !== null) {
+            $job = TimetableGenerationJob::create([
+                'user_id' => $user->id,
+                'status' => TimetableGenerationJob::STATUS_COMPLETED,
+                'input' => [],
+                'available_at' => now()->getTimestamp(),
+                'generated_timetable_id' => $this->saveTimetable($user, $cached)->id,
+                'finished_at' => now(),
+            ]);
+
+            return response()->json($job->refresh()->load('generatedTimetable'), 202)
+                ->header('Location', url("/api/generate-timetable/jobs/{$job->id}"));
+        }
+
+        $inputData = $this->buildEngineInput($preferences);
+
+        if ($inputData === null) {
+            return response()->json(['message' => 'No valid sections can be generated for the selected criteria.'], 422);
+        }
+
+        $job = TimetableGenerationJob::create([
             'user_id' => $user->id,
-            'timetable' => $output['timetable'], // Access the nested timetable data
-            'active' => true,
+            'status' => TimetableGenerationJob::STATUS_QUEUED,
+            'input' => $inputData,
+            'available_at' => now()->getTimestamp(),
         ]);
 
-        return response()->json($generatedTimetable, 201);
+        return response()->json($job->refresh(), 202)
+            ->header('Location', url("/api/generate-timetable/jobs/{$job->id}"));
+    }
+
+    /**
+     * @OA\Get(
+     *      path="/api/generate-timetable/jobs/{id}",
+     *      operationId="getTimetableGenerationJob",
+     *      tags={"Generated Timetables"},
+     *      summary="Get the status and result of a queued timetable generation",
+     *      security={{"bearerAuth":{}}},
+     *      @OA\Parameter(name="id", in="path", required=true, @OA\Schema(type="integer")),
+     *      @OA\Response(response=200, description="Job status, with the generated timetable once completed", @OA\JsonContent(ref="#/components/schemas/TimetableGenerationJob")),
+     *      @OA\Response(response=404, description="No such job for this user"),
+     *      @OA\Response(response=401, description="Unauthenticated - Bearer token required")
+     * )
+     */
+    public function jobStatus(Request $request, $id)
+    {
+        $job = TimetableGenerationJob::with('generatedTimetable')
+            ->where('user_id', $request->user()->id)
+            ->find($id);
+
+        if (!$job) {
+            return response()->json(['message' => 'Timetable generation job not found.'], 404);
+        }
+
+        return response()->json($job);
     }
 
     /**
@@ -371,6 +493,515 @@ public function show(Request $request)
         return response()->json($timetable);
     }
 
+    /**
+     * Make a timetable the user's only active timetable.
+     */
+    private function saveTimetable($user, array $timetable): GeneratedTimetable
+    {
+        // Deactivate any existing active timetables for the user
+        GeneratedTimetable::where('user_id', $user->id)->update(['active' => false]);
+
+        return GeneratedTimetable::create([
+            'user_id' => $user->id,
+            'timetable' => $timetable,
+            'active' => true,
+        ]);
+    }
+
+    /**
+     * Result cache key for validated preferences.
+     *
+     * Built from the section catalogue version, the engine settings that shape
+     * the result and the preferences with their id lists sorted, so equivalent
+     * requests share an entry and any change to sections, subjects, lecturers
+     * or days starts a fresh set of entries.
+     */
+    private function resultCacheKey(array $preferences): string
+    {
+        $ids = fn ($values) => collect($values)->map(fn ($id) => (string) $id)->unique()->sort()->values()->all();
+
+        $normalized = [
+            'subjects' => $ids($preferences['subjects']),
+            'days' => $ids($preferences['days']),
+            'lecturers' => $ids($preferences['lecturers'] ?? []),
+            'start_time' => $preferences['start_time'],
+            'end_time' => $preferences['end_time'],
+            'enforce_ties' => $preferences['enforce_ties'],
+            'mode' => (int) $preferences['mode'],
+            'alternatives' => (int) ($preferences['alternatives'] ?? 1),
+            'deadline_ms' => (int) env('TIMETABLE_ENGINE_DEADLINE_MS', 0),
+            'ga_core' => (string) env('TIMETABLE_ENGINE_GA_CORE', ''),
+        ];
+
+        return 'timetable_result:' . sha1(Section::catalogueVersion() . '|' . json_encode($normalized));
+    }
+
+    /**
+     * A cached timetable for the key, or null (also when caching is disabled).
+     */
+    private function cachedResult(string $cacheKey): ?array
+    {
+        if ($this->resultCacheTtl() <= 0) {
+            return null;
+        }
+
+        return Cache::get($cacheKey);
+    }
+
+    private function cacheResult(string $cacheKey, array $timetable): void
+    {
+        if ($this->resultCacheTtl() > 0) {
+            Cache::put($cacheKey, $timetable, $this->resultCacheTtl());
+        }
+    }
+
+    private function resultCacheTtl(): int
+    {
+        return (int) env('TIMETABLE_RESULT_CACHE_TTL', 3600);
+    }
+
+    /**
+     * Validation rules for a timetable generation request. Only
+     * POST /api/generate-timetable returns alternatives, so the other
+     * endpoints reject preferences.alternatives rather than ignore it.
+     */
+    private function preferenceRules(bool $alternatives = false): array
+    {
+        return [
+            'preferences' => 'required|array',
+            'preferences.subjects' => 'required|array',
+            'preferences.subjects.*' => 'exists:subjects,id',
+            'preferences.days' => 'required|array',
+            'preferences.days.*' => 'exists:days,id',
+            'preferences.start_time' => 'required|date_format:H:i',
+            'preferences.end_time' => 'required|date_format:H:i|after:preferences.start_time',
+            'preferences.enforce_ties' => 'required|string|in:yes,no',
+            'preferences.lecturers' => 'sometimes|array',
+            'preferences.lecturers.*' => 'exists:lecturers,id',
+            'preferences.mode' => 'required|integer|in:1,2', // 1=compact, 2=spaced_out
+            'preferences.alternatives' => $alternatives ? 'sometimes|integer|min:1|max:10' : 'prohibited',
+        ];
+    }
+
+    /**
+     * Build the engine input document (classes and preferences) for validated
+     * preferences, or null when no sections match them.
+     */
+    private function buildEngineInput(array $preferences): ?array
+    {
+        // 1. Generate available sections based on user criteria
+        $availableSections = $this->generateAvailableSections($preferences);
+
+        if (empty($availableSections)) {
+            return null;
+        }
+
+        // 2-3. Preferences in the format expected by the Python script
+        $scriptPreferences = $this->enginePreferences($preferences);
+
+        // 4. Map class data into the format expected by the Python script
+        $classesData = collect($availableSections)->map(fn ($section) => $this->engineClassRow($section));
+
+        // 5. Prepare the final input data for the script
+        $inputData = $this->engineClasses($classesData->all()) + [
+            'preferences' => $scriptPreferences,
+        ];
+
+        return $this->withEngineOptions($inputData, $preferences);
+    }
+
+    /**
+     * Build an engine input document that references the engine server's
+     * catalogue snapshot instead of carrying the sections.
+     *
+     * The engine applies the same section filters as generateAvailableSections
+     * to its snapshot, matching subjects and lecturers by id as that query
+     * does, so neither the sections query nor their encoding is needed per
+     * request.
+     */
+    private function snapshotEngineInput(array $preferences): array
+    {
+        return $this->withEngineOptions([
+            'catalogue_version' => Section::catalogueVersion(),
+            'preferences' => $this->enginePreferences($preferences) + [
+                'subject_ids' => array_map('intval', $preferences['subjects']),
+                'lecturer_ids' => array_map('intval', $preferences['lecturers'] ?? []),
+            ],
+        ], $preferences);
+    }
+
+    /**
+     * Whether requests go to the engine server by catalogue snapshot.
+     */
+    private function usesCatalogueSnapshot(): bool
+    {
+        return env('TIMETABLE_ENGINE_SOCKET')
+            && filter_var(env('TIMETABLE_ENGINE_SNAPSHOTS', true), FILTER_VALIDATE_BOOLEAN);
+    }
+
+    /**
+     * Transform validated preferences into the format expected by the Python script.
+     */
+    private function enginePreferences(array $preferences): array
+    {
+        // Prepare subject and lecturer names for preferences
+        $subjectNames = Subject::whereIn('id', $preferences['subjects'])->pluck('name')->all();
+        $lecturerNames = isset($preferences['lecturers']) ? Lecturer::whereIn('id', $preferences['lecturers'])->pluck('name')->all() : [];
+        $dayNames = Day::whereIn('id', $preferences['days'])->pluck('name')->all();
+
+        $scheduleStyle = $preferences['mode'] == 1 ? 'compact' : 'spaced_out';
+        $enforceTies = $preferences['enforce_ties'] === 'yes';
+
+        return [
+            'subjects' => $subjectNames,
+            'preferred_lecturers' => $lecturerNames,
+            'preferred_days' => $dayNames,
+            'preferred_start' => $preferences['start_time'] . ':00',
+            'preferred_end' => $preferences['end_time'] . ':00',
+            'schedule_style' => $scheduleStyle,
+            'enforce_ties' => $enforceTies,
+        ];
+    }
+
+    /**
+     * A section as an engine class row.
+     */
+    private function engineClassRow(Section $section): array
+    {
+        // Use the activity field from the database
+        $activity = $section->activity ?? 'Lecture';
+        
+        // Get tied sections - use the tied_to field if available
+        $tiedTo = [];
+        if ($section->tied_to && is_array($section->tied_to)) {
+            $tiedTo = $section->tied_to;
+        } elseif ($section->tied_to && is_string($section->tied_to)) {
+            // Handle comma-separated tied sections
+            $tiedTo = array_map('trim', explode(',', $section->tied_to));
+            $tiedTo = array_filter($tiedTo); // Remove empty values
+        }
+        
+        return [
+            'code' => $section->subject->code,
+            'subject' => $section->subject->name,
+            'activity' => $activity,
+            'section' => $section->section_number,
+            'days' => $section->day_of_week,
+            'start_time' => $section->start_time,
+            'end_time' => $section->end_time,
+            'venue' => $section->venue ?? 'TBD',
+            'tied_to' => $tiedTo,
+            'lecturer' => $section->lecturer ? $section->lecturer->name : 'TBD',
+        ];
+    }
+
+    /**
+     * Every section as engine classes, for the engine server's snapshot. Rows
+     * also carry the subject and lecturer ids the snapshot filters on.
+     */
+    private function catalogueExport(): array
+    {
+        return $this->engineClasses(Section::with(['subject', 'lecturer'])->get()
+            ->map(fn ($section) => $this->engineClassRow($section) + [
+                'subject_id' => (int) $section->subject_id,
+                'lecturer_id' => $section->lecturer_id === null ? null : (int) $section->lecturer_id,
+            ])
+            ->all());
+    }
+
+    /**
+     * Engine class rows in the configured wire format.
+     *
+     * With TIMETABLE_ENGINE_WIRE_FORMAT=columnar the rows are sent as columns
+     * over a shared string table with times in minutes ("class_columns", see
+     * TimetableEngine/data_loader.py), and the engine answers without
+     * whitespace; otherwise they are sent as "classes" rows.
+     */
+    private function engineClasses(array $rows): array
+    {
+        if (env('TIMETABLE_ENGINE_WIRE_FORMAT', 'json') !== 'columnar') {
+            return ['classes' => $rows];
+        }
+
+        $strings = [];
+        $stringIds = [];
+        $stringId = function (string $value) use (&$strings, &$stringIds): int {
+            if (!isset($stringIds[$value])) {
+                $stringIds[$value] = count($strings);
+                $strings[] = $value;
+            }
+            return $stringIds[$value];
+        };
+        $minutes = fn (string $time): int => (int) substr($time, 0, 2) * 60 + (int) substr($time, 3, 2);
+
+        $columns = array_fill_keys(['code', 'subject', 'activity', 'section', 'days', 'venue', 'lecturer', 'start', 'end', 'tied_to'], []);
+        foreach ($rows as $row) {
+            foreach (['code', 'subject', 'activity', 'section', 'days', 'venue', 'lecturer'] as $name) {
+                $columns[$name][] = $stringId((string) $row[$name]);
+            }
+            $columns['start'][] = $minutes($row['start_time']);
+            $columns['end'][] = $minutes($row['end_time']);
+            $columns['tied_to'][] = array_map($stringId, array_values($row['tied_to']));
+        }
+        // Optional id columns, sent with catalogue exports
+        foreach (['subject_id', 'lecturer_id'] as $name) {
+            if ($rows && array_key_exists($name, $rows[0])) {
+                $columns[$name] = array_map(fn ($row) => $row[$name], $rows);
+            }
+        }
+        $columns['strings'] = $strings;
+
+        return ['class_columns' => $columns, 'compact' => true];
+    }
+
+    /**
+     * Add the engine options (the search deadline and the number of
+     * alternatives) to an input document.
+     */
+    private function withEngineOptions(array $inputData, array $preferences): array
+    {
+        // Cap the search time so the endpoint meets its latency target; the
+        // engine returns the best timetable found when the deadline passes
+        $deadlineMs = env('TIMETABLE_ENGINE_DEADLINE_MS');
+        if ($deadlineMs) {
+            $inputData['options']['deadline_ms'] = (int) $deadlineMs;
+        }
+
+        // Evolve with the NumPy gene-matrix GA instead of DEAP
+        $gaCore = env('TIMETABLE_ENGINE_GA_CORE');
+        if ($gaCore) {
+            $inputData['options']['ga_core'] = $gaCore;
+        }
+
+        // Ask for the per-phase timings that logEngineMetrics records
+        if (filter_var(env('TIMETABLE_ENGINE_METRICS', false), FILTER_VALIDATE_BOOLEAN)) {
+            $inputData['options']['metrics'] = true;
+        }
+
+        // One search returns every alternative, ranked
+        if (($preferences['alternatives'] ?? 1) > 1) {
+            $inputData['options']['alternatives'] = (int) $preferences['alternatives'];
+        }
+
+        return $inputData;
+    }
+
+    /**
+     * Log the engine's metrics block (TIMETABLE_ENGINE_METRICS=true), one
+     * structured entry per generation, for aggregating engine performance.
+     */
+    private function logEngineMetrics(?array $output, array $preferences): void
+    {
+        if (!isset($output['metrics'])) {
+            return;
+        }
+
+        \Log::info('Timetable engine metrics', $output['metrics'] + [
+            'status' => $output['status'] ?? null,
+            'subjects' => count($preferences['subjects']),
+        ]);
+    }
+
+    /**
+     * Run the timetable engine for validated preferences.
+     *
+     * Uses the long-lived engine server when TIMETABLE_ENGINE_SOCKET is set and
+     * reachable (by catalogue snapshot unless TIMETABLE_ENGINE_SNAPSHOTS is
+     * off), and falls back to spawning TimetableEngine/main.py otherwise.
+     * Both paths speak the same JSON contract.
+     *
+     * @return array{0: int, 1: string, 2: string}|null [exit code, stdout, stderr],
+     *         or null when no sections match the preferences
+     */
+    private function runEngine(array $preferences): ?array
+    {
+        $socket = env('TIMETABLE_ENGINE_SOCKET');
+        if ($socket && $this->usesCatalogueSnapshot()) {
+            $result = $this->runEngineDaemon($socket, $this->snapshotEngineInput($preferences));
+            if ($result !== null) {
+                return $result;
+            }
+            $socket = null; // Unreachable, go straight to the process
+        }
+
+        $inputData = $this->buildEngineInput($preferences);
+        if ($inputData === null) {
+            return null;
+        }
+
+        if ($socket) {
+            $result = $this->runEngineDaemon($socket, $inputData);
+            if ($result !== null) {
+                return $result;
+            }
+        }
+
+        $pythonExecutable = env('PYTHON_EXECUTABLE', '/Users/biehatieha/code/yaya/timetable-api/.venv/bin/python');
+        $scriptPath = app_path('Http/Controllers/TimetableEngine/main.py');
+
+        $process = new Process([$pythonExecutable, $scriptPath]);
+        $process->setWorkingDirectory(app_path('Http/Controllers/TimetableEngine'));
+        $process->setInput(json_encode($inputData));
+        $process->run();
+
+        return [$process->getExitCode(), $process->getOutput(), $process->getErrorOutput()];
+    }
+
+    /**
+     * Send one request to the engine server (TimetableEngine/server.py).
+     *
+     * The socket may be a Unix socket path or a host:port pair. Returns null if
+     * the server cannot be reached so the caller can fall back to a process.
+     */
+    private function runEngineDaemon(string $socket, array $inputData): ?array
+    {
+        $address = str_contains($socket, '/') ? 'unix://' . $socket : 'tcp://' . $socket;
+        $timeout = (float) env('TIMETABLE_ENGINE_TIMEOUT', 120);
+
+        $stream = @stream_socket_client($address, $errno, $errstr, 1.0);
+        if ($stream === false) {
+            \Log::warning('Timetable engine server unreachable, falling back to process.', [
+                'socket' => $socket,
+                'error' => $errstr,
+            ]);
+            return null;
+        }
+
+        stream_set_timeout($stream, (int) ceil($timeout));
+        fwrite($stream, json_encode($inputData) . "\n");
+        $response = fgets($stream);
+
+        if ($response !== false && $this->isUnknownCatalogue(json_decode($response, true))) {
+            // First request since the catalogue changed: send it, then retry
+            $this->loadCatalogueSnapshot($stream, $inputData['catalogue_version']);
+            fwrite($stream, json_encode($inputData) . "\n");
+            $response = fgets($stream);
+        }
+        $meta = stream_get_meta_data($stream);
+        fclose($stream);
+
+        if ($response === false) {
+            $reason = $meta['timed_out'] ? 'Timed out waiting for the engine server.' : 'The engine server closed the connection.';
+            return [1, '', $reason];
+        }
+
+        $output = json_decode($response, true);
+        $failed = !is_array($output) || ($output['status'] ?? null) === 'error';
+
+        return [$failed ? 1 : 0, $response, ''];
+    }
+
+    private function isUnknownCatalogue($output): bool
+    {
+        return is_array($output) && ($output['code'] ?? null) === 'unknown_catalogue_version';
+    }
+
+    /**
+     * Store the current catalogue in the engine server as the given version.
+     */
+    private function loadCatalogueSnapshot($stream, string $version): void
+    {
+        fwrite($stream, json_encode([
+            'command' => 'load_catalogue',
+            'version' => $version,
+        ] + $this->catalogueExport()) . "\n");
+        $response = json_decode((string) fgets($stream), true);
+
+        if (($response['status'] ?? null) !== 'success') {
+            \Log::warning('Timetable engine server rejected the catalogue snapshot.', [
+                'version' => $version,
+                'response' => $response,
+            ]);
+        }
+    }
+
+    /**
+     * Run the engine in streaming mode, yielding each NDJSON event it sends.
+     *
+     * Uses the engine server when TIMETABLE_ENGINE_SOCKET is set and reachable,
+     * otherwise a Python process. Stopping iteration early closes the socket or
+     * stops the process, which cancels the search. Input that references a
+     * catalogue snapshot is expanded to carry its sections for the process.
+     */
+    private function streamEngine(array $inputData, array $preferences): \Generator
+    {
+        $socket = env('TIMETABLE_ENGINE_SOCKET');
+        $stream = null;
+        if ($socket) {
+            $address = str_contains($socket, '/') ? 'unix://' . $socket : 'tcp://' . $socket;
+            $stream = @stream_socket_client($address, $errno, $errstr, 1.0);
+            if ($stream === false) {
+                \Log::warning('Timetable engine server unreachable, falling back to process.', [
+                    'socket' => $socket,
+                    'error' => $errstr,
+                ]);
+                $stream = null;
+            }
+        }
+
+        if ($stream !== null) {
+            try {
+                stream_set_timeout($stream, (int) ceil((float) env('TIMETABLE_ENGINE_TIMEOUT', 120)));
+                fwrite($stream, json_encode($inputData) . "\n");
+                $retried = false;
+                while (($line = fgets($stream)) !== false) {
+                    $event = json_decode($line, true);
+                    if (!$retried && $this->isUnknownCatalogue($event)) {
+                        $retried = true;
+                        $this->loadCatalogueSnapshot($stream, $inputData['catalogue_version']);
+                        fwrite($stream, json_encode($inputData) . "\n");
+                        continue;
+                    }
+                    if (is_array($event)) {
+                        yield $event;
+                    }
+                }
+            } finally {
+                fclose($stream);
+            }
+            return;
+        }
+
+        if (isset($inputData['catalogue_version'])) {
+            $fullInput = $this->buildEngineInput($preferences);
+            if ($fullInput === null) {
+                yield ['event' => 'result', 'status' => 'error', 'message' => 'No valid sections can be generated for the selected criteria.'];
+                return;
+            }
+            $inputData = ['stream' => true] + $fullInput;
+        }
+
+        $pythonExecutable = env('PYTHON_EXECUTABLE', '/Users/biehatieha/code/yaya/timetable-api/.venv/bin/python');
+        $process = new Process([$pythonExecutable, app_path('Http/Controllers/TimetableEngine/main.py')]);
+        $process->setWorkingDirectory(app_path('Http/Controllers/TimetableEngine'));
+        $process->setInput(json_encode($inputData));
+        $process->setTimeout(null);
+        $process->start();
+
+        try {
+            $buffer = '';
+            foreach ($process->getIterator(Process::ITER_SKIP_ERR) as $chunk) {
+                $buffer .= $chunk;
+                while (($newline = strpos($buffer, "\n")) !== false) {
+                    $event = json_decode(substr($buffer, 0, $newline), true);
+                    $buffer = substr($buffer, $newline + 1);
+                    if (is_array($event)) {
+                        yield $event;
+                    }
+                }
+            }
+        } finally {
+            if ($process->isRunning()) {
+                $process->stop(1);
+            } elseif (!$process->isSuccessful()) {
+                \Log::error('Timetable generator script failed.', [
+                    'exit_code' => $process->getExitCode(),
+                    'stderr' => $process->getErrorOutput(),
+                ]);
+            }
+        }
+    }
+
     /**
      * Generate all available sections based on user preferences
      * This creates the dynamic sections that will be used for timetable optimization
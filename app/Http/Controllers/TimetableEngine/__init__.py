@@ -6,9 +6,13 @@ class schedules based on user preferences and constraints.
 """
 
 from .models import Class, ScheduledClass, Timetable
-from .data_loader import load_classes_from_csv, load_classes_from_json, group_classes_by_section
+from .data_loader import (
+    load_classes_from_csv, iter_classes_from_csv, load_classes_from_json, load_classes_from_columns,
+    columns_from_rows, group_classes_by_section
+)
 from .genetic_algorithm import TimetableGenerator
 from .scoring import ScoreCalculator
+from .catalogue import SectionCatalogue
 from .formatter import format_timetable_as_json, format_timetable_as_text
 from . import constants
 
@@ -17,10 +21,14 @@ __all__ = [
     'ScheduledClass', 
     'Timetable',
     'load_classes_from_csv',
+    'iter_classes_from_csv',
     'load_classes_from_json',
+    'load_classes_from_columns',
+    'columns_from_rows',
     'group_classes_by_section',
     'TimetableGenerator',
     'ScoreCalculator',
+    'SectionCatalogue',
     'format_timetable_as_json',
     'format_timetable_as_text',
     'constants'
@@ -0,0 +1,71 @@
+"""
+Search budgets and stopping rules that scale with the request.
+
+size_search() turns the size of a gene map's search space into a population
+size and generation budget. Both grow with log2 of the space, the number of
+bits of information the search has to find, so a handful of sections gets a
+small population that settles in milliseconds while a large catalogue gets
+enough individuals and generations to explore it.
+
+ConvergenceMonitor replaces absolute fitness margins with relative ones. A
+search has stalled when its best fitness gained less than STAGNATION_TOLERANCE
+of itself over its window: the last STAGNATION_WINDOW generations, or
+STAGNATION_SHARE of the generation budget when that is longer, so long searches
+get to climb out of plateaus. It has converged when
+the population average is within CONVERGENCE_SPREAD of the best. Both hold
+whatever BASE_SCORE or the scoring profile weights are.
+"""
+
+import math
+from collections import deque
+from typing import Optional, Tuple
+
+from constants import (
+    POPULATION_PER_BIT, GENERATIONS_PER_BIT, MIN_POPULATION_SIZE, MAX_POPULATION_SIZE,
+    MIN_GENERATIONS, MAX_GENERATIONS, STAGNATION_WINDOW, STAGNATION_SHARE,
+    STAGNATION_TOLERANCE, CONVERGENCE_SPREAD,
+)
+
+
+def _clamp(value: float, low: int, high: int) -> int:
+    return max(low, min(high, round(value)))
+
+
+def size_search(search_space: int) -> Tuple[int, int]:
+    """(generations, population size) for a search space of the given size."""
+    bits = math.log2(max(2, search_space))
+    return (_clamp(GENERATIONS_PER_BIT * bits, MIN_GENERATIONS, MAX_GENERATIONS),
+            _clamp(POPULATION_PER_BIT * bits, MIN_POPULATION_SIZE, MAX_POPULATION_SIZE))
+
+
+def stagnation_window(generations: int) -> int:
+    """Generations over which a search of the given budget must keep improving."""
+    return max(STAGNATION_WINDOW, int(generations * STAGNATION_SHARE))
+
+
+class ConvergenceMonitor:
+    """Decides, generation by generation, whether a search has stopped improving."""
+
+    def __init__(self, window: int = STAGNATION_WINDOW,
+                 tolerance: float = STAGNATION_TOLERANCE,
+                 spread: float = CONVERGENCE_SPREAD):
+        self.tolerance = tolerance
+        self.spread = spread
+        self.recent_best = deque(maxlen=window)
+
+    def update(self, best: float, average: float) -> Optional[str]:
+        """
+        Record one generation's best and average fitness.
+
+        Returns "stagnated" or "converged" when the search should stop, else
+        None. Neither applies before a window of generations has run or while
+        nothing feasible (fitness 0) has been found.
+        """
+        self.recent_best.append(best)
+        if len(self.recent_best) < self.recent_best.maxlen or best <= 0:
+            return None
+        if (best - self.recent_best[0]) / best < self.tolerance:
+            return "stagnated"
+        if (best - average) / best < self.spread:
+            return "converged"
+        return None
@@ -0,0 +1,212 @@
+"""
+Vectorized whole-population fitness evaluation.
+
+This module scores a whole population in NumPy array operations instead of
+building a Timetable per individual. The population is encoded as an integer
+matrix (one row per individual, one column per gene) and every candidate
+section is precomputed into per-class day index, start/end minute and
+preference bonus arrays. The resulting scores match
+TimetableGenerator.evaluate exactly, including floating-point rounding,
+because every floating-point accumulation is performed in the same order.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from constants import (
+    DAYS, MINUTES_PER_DAY, BASE_SCORE, IDEAL_GAP_MINUTES, MAX_GAP_MINUTES,
+    STREAK_GAP_MINUTES, MAX_CONSECUTIVE_CLASSES,
+)
+
+
+class PopulationEvaluator:
+    """Scores populations for a TimetableGenerator using array operations."""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.enforce_ties = generator.enforce_ties
+        self.style = generator.score_calculator.style
+        self.profile = generator.score_calculator.scoring_profile
+        self.conflict_matrix = generator.conflict_matrix
+
+        self._build_class_table(generator.candidate_sections, generator.score_calculator)
+        self._build_decode_tables(generator.gene_map)
+
+        if self.style == "compact":
+            days_score_map = self.profile["days_score_map"]
+            self.utilization_scores = np.array(
+                [days_score_map.get(n, -4000) for n in range(len(DAYS) + 1)], dtype=np.int64
+            )
+        else:
+            self.utilization_scores = -np.arange(len(DAYS) + 1, dtype=np.int64) * \
+                self.profile["days_penalty_per_day"]
+
+    def _build_class_table(self, candidate_sections: Sequence[Sequence], score_calculator):
+        """Flatten every candidate section's classes into per-class arrays."""
+        days, starts, ends, bonuses = [], [], [], []
+        max_classes = max(len(section) for section in candidate_sections)
+        self.section_classes = np.full(
+            (len(candidate_sections), max_classes), -1, dtype=np.int64
+        )
+        # Classes on days the scalar path cannot schedule are left to it
+        self.supported = True
+
+        for section_id, section in enumerate(candidate_sections):
+            for position, cls in enumerate(section):
+                if cls.day_index < 0:
+                    self.supported = False
+                self.section_classes[section_id, position] = len(days)
+                days.append(cls.day_index if cls.day_index >= 0 else len(DAYS))
+                starts.append(cls.start_minutes)
+                ends.append(cls.end_minutes)
+                bonuses.append(score_calculator.class_preference_bonus(cls))
+
+        # Index -1 (padding) maps to an extra sentinel class sorted after all days
+        self.class_day = np.array(days + [len(DAYS)], dtype=np.int64)
+        self.class_start = np.array(starts + [0], dtype=np.int64)
+        self.class_end = np.array(ends + [0], dtype=np.int64)
+        self.class_bonus = np.array(bonuses + [0], dtype=np.int64)
+
+    def _build_decode_tables(self, gene_map: List[dict]):
+        """Turn gene map id tables into arrays indexed by gene values."""
+        self.decode_tables = []
+        for map_item in gene_map:
+            if self.enforce_ties:
+                pair_ids = map_item["pair_ids"]
+                width = max(len(tutorial_ids) for _, tutorial_ids in pair_ids)
+                lectures = np.array([lecture_id for lecture_id, _ in pair_ids], dtype=np.int64)
+                tutorials = np.array([
+                    [tutorial_ids[t % len(tutorial_ids)] for t in range(width)]
+                    for _, tutorial_ids in pair_ids
+                ], dtype=np.int64)
+                self.decode_tables.append((lectures, tutorials))
+            else:
+                self.decode_tables.append(np.array(map_item["section_ids"], dtype=np.int64))
+
+    def decode(self, population: np.ndarray) -> np.ndarray:
+        """Map a (individuals x genes) matrix to (individuals x sections) ids."""
+        columns = []
+        if self.enforce_ties:
+            for k, (lectures, tutorials) in enumerate(self.decode_tables):
+                lecture_choice = population[:, 2 * k]
+                tutorial_choice = population[:, 2 * k + 1]
+                columns.append(lectures[lecture_choice])
+                columns.append(tutorials[lecture_choice, tutorial_choice])
+        else:
+            for k, sections in enumerate(self.decode_tables):
+                columns.append(sections[population[:, k]])
+        return np.stack(columns, axis=1)
+
+    def feasible(self, section_ids: np.ndarray) -> np.ndarray:
+        """Return a boolean mask of rows whose sections never clash."""
+        ok = np.ones(len(section_ids), dtype=bool)
+        width = section_ids.shape[1]
+        for a in range(width):
+            for b in range(a + 1, width):
+                ok &= ~self.conflict_matrix[section_ids[:, a], section_ids[:, b]]
+        return ok
+
+    def evaluate(self, individuals: Sequence[Sequence[int]]) -> List[float]:
+        """Score a batch of individuals; equivalent to evaluate() on each."""
+        population = np.asarray(individuals, dtype=np.int64).reshape(len(individuals), -1)
+        section_ids = self.decode(population)
+        feasible = self.feasible(section_ids)
+        scores = np.zeros(len(population), dtype=np.float64)
+        if feasible.any():
+            scores[feasible] = self._score(section_ids[feasible])
+        return scores.tolist()
+
+    def _streak_score(self, length: np.ndarray) -> np.ndarray:
+        return np.where(
+            length == 1, -self.profile["streak_penalty_1"],
+            np.where(length == 2, self.profile["streak_bonus_2"],
+                     -(length - 2) * self.profile["streak_penalty_3_plus"])
+        )
+
+    def _score(self, section_ids: np.ndarray) -> np.ndarray:
+        """Score rows known to be feasible."""
+        count = len(section_ids)
+        rows = np.arange(count)
+        classes = self.section_classes[section_ids].reshape(count, -1)
+
+        # Order each row's classes by day then start time; the stable sort keeps
+        # insertion order for equal starts, like Timetable.add_section does
+        day = self.class_day[classes]
+        order = np.argsort(day * MINUTES_PER_DAY + self.class_start[classes], axis=1, kind="stable")
+        classes = np.take_along_axis(classes, order, axis=1)
+        day = self.class_day[classes]
+        start = self.class_start[classes]
+        end = self.class_end[classes]
+        valid = day < len(DAYS)
+
+        single_day_penalty = (
+            self.profile["penalty_for_single_class_day"] if self.style == "spaced_out"
+            else self.profile["streak_penalty_1"]
+        )
+        day_gap_scores = np.zeros((count, len(DAYS)), dtype=np.float64)
+        used = np.zeros((count, len(DAYS)), dtype=bool)
+        streak_total = np.zeros(count, dtype=np.int64)
+
+        # Per-day running state, reset whenever a new day starts
+        gap_total = np.zeros(count, dtype=np.float64)
+        consecutive = np.ones(count, dtype=np.int64)
+        streak = np.ones(count, dtype=np.int64)
+        in_day = np.ones(count, dtype=np.int64)
+
+        def finish_day(mask, previous_day):
+            nonlocal gap_total, consecutive, streak, in_day, streak_total
+            scaled = np.where(consecutive > MAX_CONSECUTIVE_CLASSES, gap_total * 0.7, gap_total)
+            gap_score = np.where(in_day > 1, scaled / np.maximum(in_day - 1, 1), 1.0)
+            day_score = np.where(in_day == 1, -single_day_penalty, self._streak_score(streak))
+            target = rows[mask], previous_day[mask]
+            day_gap_scores[target] = gap_score[mask]
+            used[target] = True
+            streak_total = np.where(mask, streak_total + day_score, streak_total)
+            gap_total = np.where(mask, 0.0, gap_total)
+            consecutive = np.where(mask, 1, consecutive)
+            streak = np.where(mask, 1, streak)
+            in_day = np.where(mask, 1, in_day)
+
+        for j in range(1, classes.shape[1]):
+            same_day = valid[:, j] & (day[:, j] == day[:, j - 1])
+            finish_day(valid[:, j - 1] & ~same_day, day[:, j - 1])
+
+            gap = start[:, j] - end[:, j - 1]
+            touching = same_day & (gap <= 0)
+            ideal = same_day & (gap > 0) & (gap <= IDEAL_GAP_MINUTES)
+            acceptable = same_day & (gap > IDEAL_GAP_MINUTES) & (gap <= MAX_GAP_MINUTES)
+            too_long = same_day & (gap > MAX_GAP_MINUTES)
+            gap_total = np.where(ideal, gap_total + 1.0, gap_total)
+            gap_total = np.where(acceptable, gap_total + 0.5, gap_total)
+            gap_total = np.where(too_long, gap_total + 0.1, gap_total)
+            consecutive = np.where(touching, consecutive + 1,
+                                   np.where(same_day, 1, consecutive))
+
+            in_streak = same_day & (gap <= STREAK_GAP_MINUTES)
+            broken = same_day & ~in_streak
+            streak_total = np.where(broken, streak_total + self._streak_score(streak), streak_total)
+            streak = np.where(in_streak, streak + 1, np.where(broken, 1, streak))
+            in_day = np.where(same_day, in_day + 1, in_day)
+
+        finish_day(valid[:, -1], day[:, -1])
+
+        # Average the day gap scores over utilized days, summing in DAYS order
+        days_used = used.sum(axis=1)
+        gap_sum = np.zeros(count, dtype=np.float64)
+        for d in range(len(DAYS)):
+            gap_sum = np.where(used[:, d], gap_sum + day_gap_scores[:, d], gap_sum)
+        gap_scores = np.where(
+            days_used > 0,
+            gap_sum / np.maximum(days_used, 1) * self.profile["gap_score_weight"],
+            0.0,
+        )
+
+        preference_bonus = np.where(valid, self.class_bonus[classes], 0).sum(axis=1)
+
+        scores = np.full(count, BASE_SCORE, dtype=np.float64)
+        scores += self.utilization_scores[days_used]
+        scores += preference_bonus
+        scores += gap_scores
+        scores += streak_total
+        return scores
@@ -0,0 +1,118 @@
+"""
+Fitness cache for the genetic algorithm.
+
+FitnessCache maps an individual's genes (as a tuple) to its fitness score
+with size-bounded least-recently-used eviction, and counts hits, misses and
+evictions so a run can report how much work the cache saved.
+
+Caches can also be shared between runs: shared_cache() returns the same
+FitnessCache for every generator with the same catalogue-and-preferences
+fingerprint, so repeated requests in a long-lived process (the engine server
+or an island worker) reuse earlier evaluations. Only the most recently used
+fingerprints are kept.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from constants import FITNESS_CACHE_SIZE, SHARED_CACHE_LIMIT
+
+
+class FitnessCache:
+    """Size-bounded LRU mapping from gene tuples to fitness scores."""
+
+    def __init__(self, max_size: Optional[int] = FITNESS_CACHE_SIZE):
+        self.max_size = max_size  # None means unbounded
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[float] = None) -> Optional[float]:
+        """Look up a score, counting the hit or miss and refreshing its recency."""
+        score = self._entries.get(key)
+        if score is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return score
+
+    def __getitem__(self, key: Hashable) -> float:
+        score = self.get(key)
+        if score is None:
+            raise KeyError(key)
+        return score
+
+    def __setitem__(self, key: Hashable, score: float):
+        entries = self._entries
+        entries[key] = score
+        entries.move_to_end(key)
+        if self.max_size is not None and len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Membership test; does not count as a lookup."""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FitnessCache):
+            return self._entries == other._entries
+        return NotImplemented
+
+    def items(self):
+        return self._entries.items()
+
+    def clear(self):
+        """Drop every entry (the counters are kept)."""
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Counters and occupancy, suitable for a run's statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hit_rate": self.hit_rate,
+        }
+
+    def stats_since(self, before: Dict[str, float]) -> Dict[str, float]:
+        """Counters accumulated since an earlier stats() snapshot."""
+        stats = self.stats()
+        for counter in ("hits", "misses", "evictions"):
+            stats[counter] -= before[counter]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Caches shared between runs, keyed by fingerprint, least recently used first
+_shared_caches: "OrderedDict[str, FitnessCache]" = OrderedDict()
+
+
+def shared_cache(fingerprint: str, max_size: Optional[int] = FITNESS_CACHE_SIZE) -> FitnessCache:
+    """Return the process-wide cache for a catalogue-and-preferences fingerprint."""
+    cache = _shared_caches.get(fingerprint)
+    if cache is None:
+        cache = _shared_caches[fingerprint] = FitnessCache(max_size)
+        if len(_shared_caches) > SHARED_CACHE_LIMIT:
+            _shared_caches.popitem(last=False)
+    else:
+        _shared_caches.move_to_end(fingerprint)
+    return cache
+
+
+def clear_shared_caches():
+    """Forget every shared cache."""
+    _shared_caches.clear()
@@ -0,0 +1,242 @@
+"""
+Compact section catalogue.
+
+A SectionCatalogue stores a whole class catalogue as a struct of arrays: one
+string table shared by every text column, per-class columns (day, start/end
+minute, venue and lecturer) and per-section columns
+(subject, code, activity, section name and the contiguous range of its
+classes). Exports from Laravel also carry each section's subjects.id and each
+class's lecturers.id ("db ids", -1 where absent), which the controller filters
+on. Every section has an integer id, so a catalogue of thousands of
+sections is a handful of flat arrays instead of thousands of small objects,
+which keeps memory and garbage-collector pressure low in a long-lived engine.
+
+Class objects are only materialized for the sections a request needs, and
+classes_where() applies the controller's day, time and lecturer filters on the
+columns before materializing anything, so a catalogue snapshot (snapshot.py)
+builds only the classes a request selects.
+"""
+
+import itertools
+from array import array
+from datetime import time
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models import Class
+
+
+class SectionCatalogue:
+    """Struct-of-arrays table of class sections with integer ids."""
+
+    def __init__(self):
+        # String table shared by every text column
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+        # Per-class columns, grouped so each section's classes are contiguous
+        self.class_day = array("I")  # String ids
+        self.class_start = array("H")  # Minutes since midnight
+        self.class_end = array("H")
+        self.class_venue = array("I")  # String ids
+        self.class_lecturer = array("I")
+        self.class_lecturer_db_id = array("q")  # lecturers.id, or -1
+
+        # Per-section columns
+        self.section_subject = array("I")  # String ids
+        self.section_code = array("I")
+        self.section_activity = array("I")
+        self.section_name = array("I")
+        self.section_first_class = array("I")
+        self.section_class_count = array("H")
+        self.section_tied_to: List[Tuple[int, ...]] = []
+        self.section_subject_db_id = array("q")  # subjects.id, or -1
+
+        self._subject_sections: Dict[int, List[int]] = {}
+        self._subject_db_sections: Dict[int, List[int]] = {}
+        self._times: Dict[int, time] = {}  # One time object per distinct minute
+
+    def intern(self, value: str) -> int:
+        """Return the string-table id of a value, adding it if new."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    @classmethod
+    def from_classes(cls, classes: Iterable[Class],
+                     db_ids: Optional[Iterable[Tuple[int, int]]] = None) -> "SectionCatalogue":
+        """
+        Build a catalogue from Class objects, grouping them into sections.
+
+        db_ids, if given, holds the (subject, lecturer) db ids of each class.
+        """
+        catalogue = cls()
+        if db_ids is None:
+            db_ids = itertools.repeat((-1, -1))
+        sections: Dict[Tuple[str, str, str], List[Tuple[Class, Tuple[int, int]]]] = {}
+        for class_obj, class_db_ids in zip(classes, db_ids):
+            key = (class_obj.subject, class_obj.activity, class_obj.section)
+            sections.setdefault(key, []).append((class_obj, class_db_ids))
+
+        for section_classes in sections.values():
+            first, (subject_db_id, _) = section_classes[0]
+            catalogue.add_section(
+                subject=first.subject,
+                code=first.code,
+                activity=first.activity,
+                name=first.section,
+                tied_to=first.tied_to,
+                sessions=[
+                    (c.days, c.start_minutes, c.end_minutes, c.venue, c.lecturer)
+                    for c, _ in section_classes
+                ],
+                subject_db_id=subject_db_id,
+                lecturer_db_ids=[lecturer_db_id for _, (_, lecturer_db_id) in section_classes],
+            )
+        return catalogue
+
+    def add_section(self, subject: str, code: str, activity: str, name: str,
+                    tied_to: Sequence[str],
+                    sessions: Sequence[Tuple[str, int, int, str, str]],
+                    subject_db_id: int = -1,
+                    lecturer_db_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        Append a section and its class sessions, returning the section id.
+
+        Each session is (day, start minutes, end minutes, venue, lecturer);
+        lecturer_db_ids, if given, holds each session's lecturer db id.
+        """
+        section_id = len(self.section_subject)
+        subject_id = self.intern(subject)
+        self.section_subject.append(subject_id)
+        self.section_code.append(self.intern(code))
+        self.section_activity.append(self.intern(activity))
+        self.section_name.append(self.intern(name))
+        self.section_first_class.append(len(self.class_day))
+        self.section_class_count.append(len(sessions))
+        self.section_tied_to.append(tuple(self.intern(t) for t in tied_to))
+        self._subject_sections.setdefault(subject_id, []).append(section_id)
+        self.section_subject_db_id.append(subject_db_id)
+        if subject_db_id >= 0:
+            self._subject_db_sections.setdefault(subject_db_id, []).append(section_id)
+
+        if lecturer_db_ids is None:
+            lecturer_db_ids = [-1] * len(sessions)
+        for (day, start, end, venue, lecturer), lecturer_db_id in zip(sessions, lecturer_db_ids):
+            self.class_day.append(self.intern(day))
+            self.class_start.append(start)
+            self.class_end.append(end)
+            self.class_venue.append(self.intern(venue))
+            self.class_lecturer.append(self.intern(lecturer))
+            self.class_lecturer_db_id.append(lecturer_db_id)
+        return section_id
+
+    def __len__(self) -> int:
+        """Number of class sessions in the catalogue."""
+        return len(self.class_day)
+
+    @property
+    def section_count(self) -> int:
+        return len(self.section_subject)
+
+    def subjects(self) -> List[str]:
+        """Names of every subject in the catalogue."""
+        return [self.strings[subject_id] for subject_id in self._subject_sections]
+
+    def sections_for_subjects(self, subjects: Iterable[str]) -> List[int]:
+        """Section ids offered for the given subject names."""
+        section_ids: List[int] = []
+        for subject in subjects:
+            subject_id = self._string_ids.get(subject)
+            if subject_id is not None:
+                section_ids.extend(self._subject_sections.get(subject_id, ()))
+        return section_ids
+
+    @property
+    def has_db_ids(self) -> bool:
+        """Whether the catalogue was built with subject db ids."""
+        return bool(self._subject_db_sections)
+
+    def sections_for_subject_db_ids(self, subject_db_ids: Iterable[int]) -> List[int]:
+        """Section ids offered for the given subject db ids."""
+        section_ids: List[int] = []
+        for subject_db_id in subject_db_ids:
+            section_ids.extend(self._subject_db_sections.get(int(subject_db_id), ()))
+        return section_ids
+
+    def class_ids(self, section_id: int) -> range:
+        """Indices into the per-class columns for one section."""
+        first = self.section_first_class[section_id]
+        return range(first, first + self.section_class_count[section_id])
+
+    def to_classes(self, section_ids: Optional[Iterable[int]] = None) -> List[Class]:
+        """Materialize Class objects for the given sections (default: all)."""
+        return self.classes_where(section_ids)
+
+    def classes_where(self, section_ids: Optional[Iterable[int]] = None,
+                      days: Optional[Collection[str]] = None,
+                      start: Optional[int] = None, end: Optional[int] = None,
+                      lecturers: Optional[Collection[str]] = None,
+                      lecturer_db_ids: Optional[Collection[int]] = None) -> List[Class]:
+        """
+        Materialize the classes of the given sections (default: all) that pass
+        the given filters.
+
+        A class must fall on one of days, start at or after start and end at or
+        before end (minutes since midnight), and be taught by one of lecturers
+        (names) and one of lecturer_db_ids; a filter left as None (or empty)
+        accepts every class.
+        """
+        if section_ids is None:
+            section_ids = range(self.section_count)
+        strings = self.strings
+        day_ids = self._string_id_set(days)
+        lecturer_ids = self._string_id_set(lecturers)
+        lecturer_db_ids = {int(i) for i in lecturer_db_ids} if lecturer_db_ids else None
+        classes = []
+        for section_id in section_ids:
+            subject = code = None
+            for class_id in self.class_ids(section_id):
+                if day_ids is not None and self.class_day[class_id] not in day_ids:
+                    continue
+                if lecturer_ids is not None and self.class_lecturer[class_id] not in lecturer_ids:
+                    continue
+                if (lecturer_db_ids is not None
+                        and self.class_lecturer_db_id[class_id] not in lecturer_db_ids):
+                    continue
+                start_minute = self.class_start[class_id]
+                end_minute = self.class_end[class_id]
+                if (start is not None and start_minute < start) or (end is not None and end_minute > end):
+                    continue
+                if subject is None:  # First class of the section that passes
+                    subject = strings[self.section_subject[section_id]]
+                    code = strings[self.section_code[section_id]]
+                    activity = strings[self.section_activity[section_id]]
+                    name = strings[self.section_name[section_id]]
+                    tied_to = [strings[t] for t in self.section_tied_to[section_id]]
+                classes.append(Class(
+                    code=code,
+                    subject=subject,
+                    activity=activity,
+                    section=name,
+                    days=strings[self.class_day[class_id]],
+                    start_time=self._time(start_minute),
+                    end_time=self._time(end_minute),
+                    venue=strings[self.class_venue[class_id]],
+                    tied_to=list(tied_to),
+                    lecturer=strings[self.class_lecturer[class_id]],
+                ))
+        return classes
+
+    def _string_id_set(self, values: Optional[Collection[str]]) -> Optional[set]:
+        """String ids of values, or None (no filter) when values is empty."""
+        if not values:
+            return None
+        return {self._string_ids[v] for v in values if v in self._string_ids}
+
+    def _time(self, minutes: int) -> time:
+        value = self._times.get(minutes)
+        if value is None:
+            value = self._times[minutes] = time(minutes // 60, minutes % 60)
+        return value
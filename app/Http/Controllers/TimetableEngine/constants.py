@@ -6,21 +6,53 @@ from datetime import timedelta
 
 # Days of the week for scheduling
 DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+MINUTES_PER_DAY = 24 * 60  # Width of one day in occupancy bitmasks
 
 # Scheduling preferences
 MAX_CONSECUTIVE_CLASSES = 2  # Maximum preferred consecutive classes per day
 IDEAL_GAP = timedelta(hours=1)  # 1 hour gap is ideal
 MAX_GAP = timedelta(hours=2)  # More than 2 hours gap is not preferred
+STREAK_GAP = timedelta(minutes=15)  # Classes this close together form a streak
+
+# The same thresholds in whole minutes, for integer scoring
+IDEAL_GAP_MINUTES = int(IDEAL_GAP.total_seconds() // 60)
+MAX_GAP_MINUTES = int(MAX_GAP.total_seconds() // 60)
+STREAK_GAP_MINUTES = int(STREAK_GAP.total_seconds() // 60)
 
 # Genetic Algorithm parameters
-DEFAULT_GENERATIONS = 20  # Reduced further for very fast response
-DEFAULT_POPULATION_SIZE = 50  # Reduced further for very fast response
+# Population size and generation budget grow with log2 of the search space
+# (the bits needed to pin down one timetable), within these bounds (adaptive.py)
+POPULATION_PER_BIT = 4
+GENERATIONS_PER_BIT = 2
+MIN_POPULATION_SIZE = 20
+MAX_POPULATION_SIZE = 500
+MIN_GENERATIONS = 10
+MAX_GENERATIONS = 150
+STAGNATION_WINDOW = 5  # Fewest generations over which the best fitness must keep improving
+STAGNATION_SHARE = 0.1  # ...or this share of the generation budget, if longer
+STAGNATION_TOLERANCE = 0.005  # Relative gain of the best over the window that counts as stalled
+CONVERGENCE_SPREAD = 0.001  # (best - average) / best below which the population has converged
 CROSSOVER_PROBABILITY = 0.8
 MUTATION_PROBABILITY = 0.3  # Increased for more exploration in fewer generations
 TOURNAMENT_SIZE = 3
+CROSSOVER_GENE_PROBABILITY = 0.5  # Chance each gene is swapped by uniform crossover
+MUTATION_GENE_PROBABILITY = 0.1  # Chance each gene of a mutant is redrawn
+GA_CORES = ("deap", "numpy")  # Evolution loops: DEAP individuals, or a NumPy gene matrix
+BATCH_EVALUATION_MIN_SIZE = 64  # Below this many new individuals, score one by one
+FITNESS_CACHE_SIZE = 50000  # Fitness cache entries kept per run (least recently used go first)
+DELTA_STATE_CACHE_SIZE = 1000  # Scored timetables whose per-day scores are kept for their children
+SHARED_CACHE_LIMIT = 4  # Catalogue/preference fingerprints whose caches a process keeps
+REPAIR_ATTEMPTS = 3  # Repair passes over a clashing individual before giving up
+EXACT_SOLVER_MAX_SPACE = 20000  # With engine="auto", smaller search spaces are solved exactly
+EXACT_SOLVER_CHECK_INTERVAL = 1024  # Search nodes between deadline/cancellation checks
+SNAPSHOT_CACHE_SIZE = 2  # Catalogue versions an engine process keeps parsed in memory
+MAX_ALTERNATIVES = 10  # Most distinct timetables one request may ask for
+ALTERNATIVE_MIN_DISTANCE = 1  # Sections by which alternatives must differ by default
 
-# Early termination threshold
-GOOD_FITNESS_THRESHOLD = 4000  # Lowered threshold for faster termination
+# Island model parameters
+DEFAULT_ISLANDS = 4  # Independent populations, one process each
+MIGRATION_INTERVAL = 5  # Generations between migrations
+MIGRATION_SIZE = 2  # Best individuals each island sends to its neighbour
 
 # Scoring weights for different schedule styles
 SCORING_PROFILES = {
@@ -43,6 +75,7 @@ SCORING_PROFILES = {
 
 # Base scores
 BASE_SCORE = 10000.0
+
 PREFERRED_LECTURER_BONUS = 200
 PREFERRED_DAY_BONUS = 50
 PREFERRED_TIME_BONUS = 25
@@ -2,89 +2,283 @@
 Data loading utilities for the timetable generator.
 
 This module handles loading class data from various sources:
-- CSV files (legacy support)
+- CSV files (seeder format, streamed row by row)
 - JSON data (primary method)
+- Columnar JSON (compact transport, see CLASS_COLUMNS)
+
+Repeated strings (subjects, lecturers, venues, days...) are interned so a
+large catalogue keeps one copy of each.
 """
 
 import csv
 import sys
-from typing import List, Dict
-from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, time
 from models import Class
+from catalogue import SectionCatalogue
 
+# Columnar class layout: one list per column, a shared string table that the
+# text columns index into, times as minutes since midnight and tied_to as
+# lists of string ids. Each repeated subject, venue or lecturer name is sent
+# once, and no time strings need parsing.
+STRING_COLUMNS = ("code", "subject", "activity", "section", "days", "venue", "lecturer")
+MINUTE_COLUMNS = ("start", "end")
+CLASS_COLUMNS = STRING_COLUMNS + MINUTE_COLUMNS + ("tied_to",)
+# Optional row fields (or columns) of catalogue exports: each class's
+# subjects.id and lecturers.id, which snapshot selection filters on like the
+# controller's section query does (see load_catalogue_from_document)
+DB_ID_COLUMNS = ("subject_id", "lecturer_id")
 
-def load_classes_from_csv(filename: str) -> List[Class]:
-    """Load classes from CSV file, including the 'Tied To' column."""
-    classes = []
-    with open(filename, mode="r", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            try:
-                # Parse time fields with flexible format support
-                start_time = (
-                    datetime.strptime(row["Start Time"], "%I:%M %p").time()
-                    if "AM" in row["Start Time"] or "PM" in row["Start Time"]
-                    else datetime.strptime(row["Start Time"], "%H:%M").time()
-                )
-                end_time = (
-                    datetime.strptime(row["End Time"], "%I:%M %p").time()
-                    if "AM" in row["End Time"] or "PM" in row["End Time"]
-                    else datetime.strptime(row["End Time"], "%H:%M").time()
-                )
-
-                # Parse the 'Tied To' column
-                tied_to_str = row.get("Tied To", "")
-                tied_to_list = [s.strip() for s in tied_to_str.split(",") if s.strip()]
-
-                classes.append(
-                    Class(
-                        code=row["Code"],
-                        subject=row["subject"],
-                        activity=row["Activity"],
-                        section=row["Section"],
-                        days=row["Days"],
-                        start_time=start_time,
-                        end_time=end_time,
-                        venue=row["Venue"],
-                        tied_to=tied_to_list,
-                        lecturer=row["Lecturer"] if row["Lecturer"] else "Not Assigned",
-                    )
-                )
-            except (ValueError, KeyError) as e:
-                print(f"Skipping row due to error: {e} in row {row}", file=sys.stderr)
-                continue
+
+def _intern(value):
+    """Intern strings so repeated values share one object; pass others through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# CSV header of each Class field (the seeder format); "Tied To" may be absent
+CSV_COLUMNS = {
+    "code": "Code", "subject": "subject", "activity": "Activity", "section": "Section",
+    "days": "Days", "start_time": "Start Time", "end_time": "End Time",
+    "venue": "Venue", "lecturer": "Lecturer",
+}
+CSV_ERROR_EXAMPLES = 5  # Skipped rows described in the summary on stderr
+
+
+@lru_cache(maxsize=None)
+def parse_clock(value: str) -> time:
+    """
+    Parse a CSV time ("3:00 PM", "15:00" or "15:00:00") into a time.
+
+    Catalogues repeat a few dozen distinct times across thousands of rows, so
+    results are memoized and each distinct string is parsed once.
+    """
+    text = value.strip()
+    meridiem = text[-2:].upper()
+    if meridiem in ("AM", "PM"):
+        text = text[:-2].rstrip()
+    parts = text.split(":")
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"time data '{value}' is not a recognised time")
+    hours, minutes = int(parts[0]), int(parts[1])
+    seconds = int(parts[2]) if len(parts) == 3 else 0
+    if meridiem in ("AM", "PM"):
+        if not 1 <= hours <= 12:
+            raise ValueError(f"time data '{value}' has an invalid hour")
+        hours = hours % 12 + (12 if meridiem == "PM" else 0)
+    if hours > 23 or minutes > 59 or seconds > 59:
+        raise ValueError(f"time data '{value}' is out of range")
+    return time(hours, minutes, seconds)
+
+
+def iter_classes_from_csv(file: Iterable[str],
+                          errors: Optional[List[Tuple[int, str]]] = None) -> Iterator[Class]:
+    """
+    Yield classes from CSV lines (an open file or any iterable of lines).
+
+    Rows are parsed as they are read, so large files are never held in memory
+    as rows. A row that cannot be parsed is skipped and, when an errors list
+    is given, recorded in it as (line number, message). A header without the
+    required columns raises ValueError.
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    positions = {name: index for index, name in enumerate(header)}
+    missing = [column for column in CSV_COLUMNS.values() if column not in positions]
+    if missing:
+        raise ValueError(f"CSV is missing the columns: {', '.join(missing)}.")
+    (code, subject, activity, section, days, start_time, end_time,
+     venue, lecturer) = (positions[column] for column in CSV_COLUMNS.values())
+    tied_to = positions.get("Tied To")
+    width = max(positions.values()) + 1
+    intern = sys.intern
+
+    for row in reader:
+        if not row:
+            continue  # Blank line
+        try:
+            if len(row) < width:
+                raise ValueError(f"expected {width} fields, got {len(row)}")
+            tied = row[tied_to] if tied_to is not None else ""
+            yield Class(
+                code=intern(row[code]),
+                subject=intern(row[subject]),
+                activity=intern(row[activity]),
+                section=intern(row[section]),
+                days=intern(row[days]),
+                start_time=parse_clock(row[start_time]),
+                end_time=parse_clock(row[end_time]),
+                venue=intern(row[venue]),
+                tied_to=[intern(s.strip()) for s in tied.split(",") if s.strip()] if tied else [],
+                lecturer=intern(row[lecturer]) if row[lecturer] else "Not Assigned",
+            )
+        except ValueError as e:
+            if errors is not None:
+                errors.append((reader.line_num, str(e)))
+
+
+def load_classes_from_csv(filename: str,
+                          errors: Optional[List[Tuple[int, str]]] = None) -> List[Class]:
+    """
+    Load classes from CSV file, including the 'Tied To' column.
+
+    Skipped rows are collected in errors when a list is given; otherwise a
+    single summary of them is printed to stderr.
+    """
+    collected: List[Tuple[int, str]] = [] if errors is None else errors
+    with open(filename, mode="r", encoding="utf-8", newline="") as file:
+        classes = list(iter_classes_from_csv(file, collected))
+    if errors is None and collected:
+        examples = "; ".join(f"line {line}: {message}"
+                             for line, message in collected[:CSV_ERROR_EXAMPLES])
+        more = len(collected) - CSV_ERROR_EXAMPLES
+        print(f"Skipped {len(collected)} rows of {filename}: {examples}"
+              + (f" (and {more} more)" if more > 0 else ""), file=sys.stderr)
     return classes
 
 
 def load_classes_from_json(classes_data: List[Dict]) -> List[Class]:
     """Load classes from a list of dictionaries (from JSON)."""
-    classes = []
+    return [cls for _, cls in _iter_json_rows(classes_data)]
+
+
+def _iter_json_rows(classes_data: List[Dict]) -> Iterator[Tuple[Dict, Class]]:
+    """Yield (row, Class) for each JSON class row, skipping invalid rows."""
     for row in classes_data:
         try:
             start_time = datetime.strptime(row["start_time"], "%H:%M:%S").time()
             end_time = datetime.strptime(row["end_time"], "%H:%M:%S").time()
 
-            classes.append(
-                Class(
-                    code=row["code"],
-                    subject=row["subject"],
-                    activity=row["activity"],
-                    section=row["section"],
-                    days=row["days"],
-                    start_time=start_time,
-                    end_time=end_time,
-                    venue=row["venue"],
-                    tied_to=row.get("tied_to", []),
-                    lecturer=row["lecturer"],
-                )
+            yield row, Class(
+                code=_intern(row["code"]),
+                subject=_intern(row["subject"]),
+                activity=_intern(row["activity"]),
+                section=_intern(row["section"]),
+                days=_intern(row["days"]),
+                start_time=start_time,
+                end_time=end_time,
+                venue=_intern(row["venue"]),
+                tied_to=[_intern(s) for s in row.get("tied_to", [])],
+                lecturer=_intern(row["lecturer"]),
             )
         except (ValueError, KeyError) as e:
             # Log error to stderr for debugging without polluting stdout
             print(f"Skipping row due to error: {e} in row {row}", file=sys.stderr)
             continue
+
+
+def columns_from_rows(classes_data: List[Dict]) -> Dict[str, Any]:
+    """Convert JSON class rows to the columnar layout."""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def string_id(value: str) -> int:
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(strings)
+            strings.append(value)
+        return index
+
+    def minutes(value: str) -> int:
+        hours, mins = value.split(":")[:2]
+        return int(hours) * 60 + int(mins)
+
+    columns: Dict[str, Any] = {name: [] for name in CLASS_COLUMNS}
+    for row in classes_data:
+        for name in STRING_COLUMNS:
+            columns[name].append(string_id(row[name]))
+        columns["start"].append(minutes(row["start_time"]))
+        columns["end"].append(minutes(row["end_time"]))
+        columns["tied_to"].append([string_id(s) for s in row.get("tied_to", [])])
+    for name in DB_ID_COLUMNS:
+        if any(name in row for row in classes_data):
+            columns[name] = [row.get(name) for row in classes_data]
+    columns["strings"] = strings
+    return columns
+
+
+def load_classes_from_columns(columns: Dict[str, Any]) -> List[Class]:
+    """Load classes from the columnar layout (see CLASS_COLUMNS)."""
+    try:
+        strings = [_intern(value) for value in columns["strings"]]
+        data = [columns[name] for name in CLASS_COLUMNS]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid columnar classes: missing {e}.")
+    if len({len(column) for column in data}) > 1:
+        raise ValueError("Invalid columnar classes: columns have different lengths.")
+
+    times: Dict[int, time] = {}  # One time object per distinct minute
+
+    def to_time(minutes: int) -> time:
+        value = times.get(minutes)
+        if value is None:
+            value = times[minutes] = time(minutes // 60, minutes % 60)
+        return value
+
+    def string(index: int) -> str:
+        # Python would read a negative id from the end of the table
+        if index < 0:
+            raise IndexError(f"string id {index} out of range")
+        return strings[index]
+
+    classes = []
+    try:
+        for code, subject, activity, section, days, venue, lecturer, start, end, tied_to in zip(*data):
+            classes.append(Class(
+                code=string(code),
+                subject=string(subject),
+                activity=string(activity),
+                section=string(section),
+                days=string(days),
+                start_time=to_time(start),
+                end_time=to_time(end),
+                venue=string(venue),
+                tied_to=[string(s) for s in tied_to],
+                lecturer=string(lecturer),
+            ))
+    except (IndexError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid columnar classes: {e}.")
     return classes
 
 
+def load_classes_from_document(document: Dict[str, Any]) -> List[Class]:
+    """Load the classes of a request or export from "class_columns" or "classes"."""
+    if document.get("class_columns") is not None:
+        return load_classes_from_columns(document["class_columns"])
+    return load_classes_from_json(document.get("classes") or [])
+
+
+def load_catalogue_from_document(document: Dict[str, Any]) -> SectionCatalogue:
+    """
+    Load a catalogue export ("class_columns" or "classes") as a SectionCatalogue,
+    keeping its db ids (DB_ID_COLUMNS) when it has them.
+    """
+    columns = document.get("class_columns")
+    if columns is not None:
+        classes = load_classes_from_columns(columns)
+        id_columns = [columns.get(name) or [None] * len(classes) for name in DB_ID_COLUMNS]
+        if any(len(column) != len(classes) for column in id_columns):
+            raise ValueError("Invalid columnar classes: columns have different lengths.")
+        db_ids = [(_db_id(subject), _db_id(lecturer)) for subject, lecturer in zip(*id_columns)]
+    else:
+        classes, db_ids = [], []
+        for row, cls in _iter_json_rows(document.get("classes") or []):
+            classes.append(cls)
+            db_ids.append(tuple(_db_id(row.get(name)) for name in DB_ID_COLUMNS))
+    return SectionCatalogue.from_classes(classes, db_ids)
+
+
+def _db_id(value: Any) -> int:
+    """A db id from an export, or -1 when absent."""
+    if value is None:
+        return -1
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"Invalid catalogue id {value!r}.")
+    return value
+
+
 def group_classes_by_section(classes: List[Class]) -> Dict[str, Dict[str, List[Class]]]:
     """
     Group classes by subject and section.
@@ -93,9 +287,11 @@ def group_classes_by_section(classes: List[Class]) -> Dict[str, Dict[str, List[C
         Dict[subject][activity_section] -> List[Class]
         Example: {"Math101": {"Lecture_A": [class1, class2], "Tutorial_T1": [class3]}}
     """
-    from collections import defaultdict
-    
-    section_groups: Dict[str, Dict[str, List[Class]]] = defaultdict(lambda: defaultdict(list))
+    section_groups: Dict[str, Dict[str, List[Class]]] = {}
+    section_keys: Dict[tuple, str] = {}  # Build each key string only once
     for cls in classes:
-        section_groups[cls.subject][f"{cls.activity}_{cls.section}"].append(cls)
+        key = section_keys.get((cls.activity, cls.section))
+        if key is None:
+            key = section_keys[(cls.activity, cls.section)] = f"{cls.activity}_{cls.section}"
+        section_groups.setdefault(cls.subject, {}).setdefault(key, []).append(cls)
     return section_groups
@@ -0,0 +1,202 @@
+"""
+Incremental (delta) fitness evaluation.
+
+A timetable's fitness is a sum of per-day parts (gap and streak scores), the
+number of days used and per-class preference bonuses. DeltaEvaluator keeps
+those parts for recently scored timetables. When a child differs from its
+parent in a few genes (the usual result of mutation), it copies the parent's
+state, rebuilds only the days touched by the changed sections and re-sums the
+parts. The cost is then O(changed days) instead of building a Timetable and
+rescanning every day.
+
+Scores equal TimetableGenerator's full evaluation exactly: each day's classes
+are ordered as Timetable.add_section orders them, and every part is computed
+and summed in the same order as ScoreCalculator.
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from constants import (
+    DAYS, BASE_SCORE, IDEAL_GAP_MINUTES, MAX_GAP_MINUTES, STREAK_GAP_MINUTES,
+    MAX_CONSECUTIVE_CLASSES, DELTA_STATE_CACHE_SIZE,
+)
+
+# A scheduled class: (start minute, gene position, index in section, end minute).
+# Sorting by it reproduces Timetable.add_section's stable start-time order.
+_Entry = Tuple[int, int, int, int]
+
+
+class _State:
+    """Per-day classes and partial scores of one scored timetable."""
+    __slots__ = ("section_ids", "days", "day_scores", "bonus")
+
+    def __init__(self, section_ids, days, day_scores, bonus):
+        self.section_ids: Tuple[int, ...] = section_ids
+        self.days: List[Tuple[_Entry, ...]] = days
+        self.day_scores: List[Optional[Tuple[float, int]]] = day_scores  # (gap, streak)
+        self.bonus: int = bonus
+
+
+class DeltaEvaluator:
+    """Scores feasible section-id tuples, reusing their parents' day scores."""
+
+    def __init__(self, generator, max_states: int = DELTA_STATE_CACHE_SIZE):
+        calculator = generator.score_calculator
+        self.style = calculator.style
+        self.profile = calculator.scoring_profile
+        self.single_day_penalty = (
+            self.profile["penalty_for_single_class_day"] if self.style == "spaced_out"
+            else self.profile["streak_penalty_1"]
+        )
+
+        # Per candidate section: its classes as (day index, start, end) and their bonus
+        self.section_classes: List[List[Tuple[int, int, int]]] = []
+        self.section_bonus: List[int] = []
+        # Classes on days a Timetable cannot hold are left to the full evaluation
+        self.supported = True
+        for section in generator.candidate_sections:
+            if any(cls.day_index < 0 for cls in section):
+                self.supported = False
+            self.section_classes.append(
+                [(cls.day_index, cls.start_minutes, cls.end_minutes) for cls in section]
+            )
+            self.section_bonus.append(
+                sum(calculator.class_preference_bonus(cls) for cls in section)
+            )
+
+        self.states: "OrderedDict[Tuple[int, ...], _State]" = OrderedDict()
+        self.max_states = max_states
+        self.full_evaluations = 0
+        self.delta_evaluations = 0
+
+    def score(self, section_ids: Sequence[int],
+              parent_ids: Optional[Sequence[int]] = None) -> float:
+        """
+        Score a feasible timetable, starting from its parent's state if known.
+
+        Args:
+            section_ids: Candidate section ids in decode order.
+            parent_ids: Section ids of the individual this one was derived from.
+        """
+        section_ids = tuple(section_ids)
+        parent = self.states.get(tuple(parent_ids)) if parent_ids is not None else None
+        if parent is not None and len(parent.section_ids) == len(section_ids):
+            state = self._derive(parent, section_ids)
+            self.delta_evaluations += 1
+        else:
+            state = self._build(section_ids)
+            self.full_evaluations += 1
+
+        self.states[section_ids] = state
+        self.states.move_to_end(section_ids)
+        if len(self.states) > self.max_states:
+            self.states.popitem(last=False)
+        return self._total(state)
+
+    def _build(self, section_ids: Tuple[int, ...]) -> _State:
+        days: List[List[_Entry]] = [[] for _ in DAYS]
+        bonus = 0
+        for position, section_id in enumerate(section_ids):
+            bonus += self.section_bonus[section_id]
+            for index, (day, start, end) in enumerate(self.section_classes[section_id]):
+                days[day].append((start, position, index, end))
+        day_tuples = [tuple(sorted(entries)) for entries in days]
+        return _State(section_ids, day_tuples,
+                      [self._day_score(entries) for entries in day_tuples], bonus)
+
+    def _derive(self, parent: _State, section_ids: Tuple[int, ...]) -> _State:
+        changed = [
+            position for position, (old, new) in enumerate(zip(parent.section_ids, section_ids))
+            if old != new
+        ]
+        days = list(parent.days)
+        day_scores = list(parent.day_scores)
+        bonus = parent.bonus
+        if not changed:
+            return _State(section_ids, days, day_scores, bonus)
+
+        changed_positions = set(changed)
+        added: List[List[_Entry]] = [[] for _ in DAYS]
+        touched = set()
+        for position in changed:
+            old, new = parent.section_ids[position], section_ids[position]
+            bonus += self.section_bonus[new] - self.section_bonus[old]
+            for day, _, _ in self.section_classes[old]:
+                touched.add(day)
+            for index, (day, start, end) in enumerate(self.section_classes[new]):
+                touched.add(day)
+                added[day].append((start, position, index, end))
+
+        for day in touched:
+            entries = [entry for entry in days[day] if entry[1] not in changed_positions]
+            entries.extend(added[day])
+            days[day] = tuple(sorted(entries))
+            day_scores[day] = self._day_score(days[day])
+        return _State(section_ids, days, day_scores, bonus)
+
+    def _day_score(self, entries: Tuple[_Entry, ...]) -> Optional[Tuple[float, int]]:
+        """(gap score, streak score) of one day, as ScoreCalculator computes them."""
+        if not entries:
+            return None
+        if len(entries) == 1:
+            return 1.0, -self.single_day_penalty
+
+        total_gap_score = 0
+        consecutive_count = 1
+        streak_score = 0
+        streak = 1
+        for i in range(1, len(entries)):
+            gap = entries[i][0] - entries[i - 1][3]
+
+            if gap <= STREAK_GAP_MINUTES:
+                streak += 1
+            else:
+                streak_score += self._score_streak(streak)
+                streak = 1
+
+            if gap <= 0:
+                consecutive_count += 1
+                continue
+            elif gap <= IDEAL_GAP_MINUTES:
+                total_gap_score += 1.0
+            elif gap <= MAX_GAP_MINUTES:
+                total_gap_score += 0.5
+            else:
+                total_gap_score += 0.1
+            consecutive_count = 1
+
+        streak_score += self._score_streak(streak)
+        if consecutive_count > MAX_CONSECUTIVE_CLASSES:
+            total_gap_score *= 0.7
+        return total_gap_score / (len(entries) - 1), streak_score
+
+    def _score_streak(self, length: int) -> int:
+        if length == 1:
+            return -self.profile["streak_penalty_1"]
+        elif length == 2:
+            return self.profile["streak_bonus_2"]
+        return -(length - 2) * self.profile["streak_penalty_3_plus"]
+
+    def _total(self, state: _State) -> float:
+        used = [day_score for day_score in state.day_scores if day_score is not None]
+
+        if self.style == "compact":
+            utilization = self.profile["days_score_map"].get(len(used), -4000)
+        else:
+            utilization = -len(used) * self.profile["days_penalty_per_day"]
+
+        if used:
+            total_gap_score = 0
+            for gap_score, _ in used:
+                total_gap_score += gap_score
+            gap_scores = total_gap_score / len(used) * self.profile["gap_score_weight"]
+        else:
+            gap_scores = 0
+
+        score = BASE_SCORE
+        score += utilization
+        score += state.bonus
+        score += gap_scores
+        score += sum(streak for _, streak in used)
+        return score
@@ -0,0 +1,201 @@
+"""
+Exact branch-and-bound solver for small search spaces.
+
+When students pick a handful of subjects the space of section combinations is
+often only a few thousand timetables. ExactSolver searches it completely over
+the same gene map, conflict index and scoring as the genetic algorithm, so the
+timetable it returns is provably the best one (or provably none exists).
+
+The search assigns one gene-map item (a subject's lecture/tutorial pair, or
+one independent activity) at a time:
+
+- Propagation: choices clashing with anything already chosen are removed from
+  every unassigned item; an item with no choice left prunes the branch.
+- Variable ordering: the item with the fewest remaining choices goes next.
+- Value ordering: choices adding the fewest new days (then the largest
+  preference bonus) are tried first, so a good incumbent is found early.
+- Bounding: a branch is abandoned when an optimistic bound on its best score
+  (exact preference bonus and day utilization so far, the best remaining
+  bonuses, and the highest possible gap and streak scores) cannot beat the
+  incumbent (or, when several timetables are wanted, the worst one kept).
+
+Complete timetables are scored with TimetableGenerator.evaluate, so scores are
+identical to the GA's. The search can be stopped early (deadline or
+cancellation), in which case the best timetable found so far is returned.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from constants import BASE_SCORE, DAYS, EXACT_SOLVER_CHECK_INTERVAL
+
+
+@dataclass
+class _Choice:
+    """One way to satisfy a gene-map item."""
+    genes: Tuple[int, ...]
+    mask: int  # Bit per candidate section id
+    conflicts: int  # Sections clashing with any of this choice's sections
+    days: int  # Bit per day index used
+    bonus: int  # Preference bonus of its classes
+    classes: int  # Number of classes
+
+
+class _Interrupted(Exception):
+    """Unwinds the search when should_stop() gives a reason to stop."""
+
+
+class ExactSolver:
+    """Finds the best timetable of a TimetableGenerator by exhaustive search."""
+
+    def __init__(self, generator, hall_of_fame=None):
+        """
+        Args:
+            generator: The TimetableGenerator whose search space is solved.
+            hall_of_fame: Optional DiverseHallOfFame offered every complete
+                timetable; branches are then bounded by its threshold, so it
+                ends up holding the best distinct timetables.
+        """
+        self.generator = generator
+        self.hall_of_fame = hall_of_fame
+        calculator = generator.score_calculator
+        profile = calculator.scoring_profile
+        self.domains = self._build_domains()
+
+        # Best possible day utilization once at least n days are used
+        if calculator.style == "compact":
+            utilization = [profile["days_score_map"].get(n, -4000) for n in range(len(DAYS) + 1)]
+        else:
+            utilization = [-n * profile["days_penalty_per_day"] for n in range(len(DAYS) + 1)]
+        self.utilization_bound = [
+            max(utilization[max(n, 1):]) for n in range(len(DAYS) + 1)
+        ]
+
+        # Each day's gap score is at most 1.0, so their average is too; the only
+        # positive streak score is a streak of two, at most one per two classes
+        max_classes = sum(
+            max((choice.classes for choice in domain), default=0) for domain in self.domains
+        )
+        self.fixed_bound = (
+            BASE_SCORE
+            + profile["gap_score_weight"]
+            + max(0, profile["streak_bonus_2"]) * (max_classes // 2)
+        )
+
+        # Filled in by solve()
+        self.nodes = 0
+        self.leaves = 0
+        self.best_score = 0.0
+        self.best_genes: Optional[List[int]] = None
+        self.interrupted: Optional[str] = None  # Why the search stopped early
+
+        self._should_stop: Optional[Callable[[], Optional[str]]] = None
+        self._until_check = 0
+
+    def _build_domains(self) -> List[List[_Choice]]:
+        """List every internally clash-free choice for each gene-map item."""
+        generator = self.generator
+        calculator = generator.score_calculator
+        conflict_sets = generator.conflict_sets
+
+        def make_choice(genes, section_ids) -> Optional[_Choice]:
+            mask = conflicts = days = 0
+            bonus = classes = 0
+            for section_id in section_ids:
+                if conflict_sets[section_id] & mask:
+                    return None  # The lecture clashes with its own tutorial
+                mask |= 1 << section_id
+                conflicts |= conflict_sets[section_id]
+                for cls in generator.candidate_sections[section_id]:
+                    if cls.day_index >= 0:
+                        days |= 1 << cls.day_index
+                    bonus += calculator.class_preference_bonus(cls)
+                    classes += 1
+            return _Choice(tuple(genes), mask, conflicts, days, bonus, classes)
+
+        domains = []
+        for options in generator.item_choices():
+            choices = [make_choice(genes, section_ids) for genes, section_ids in options]
+            domains.append([choice for choice in choices if choice is not None])
+        return domains
+
+    def solve(self, should_stop: Optional[Callable[[], Optional[str]]] = None
+              ) -> Optional[List[int]]:
+        """
+        Search the whole space; return the best individual's genes, or None.
+
+        Args:
+            should_stop: Polled every EXACT_SOLVER_CHECK_INTERVAL nodes; a
+                non-empty return value (the reason) stops the search, which
+                then returns the best genes found so far and sets interrupted.
+        """
+        self.nodes = self.leaves = 0
+        self.best_score = 0.0
+        self.best_genes = None
+        self.interrupted = None
+        self._should_stop = should_stop
+        # The first check comes after a full interval, by which time the
+        # value ordering has usually reached a first timetable to return
+        self._until_check = EXACT_SOLVER_CHECK_INTERVAL
+        if not all(self.domains):
+            return None  # Some item has no clash-free choice at all
+        assignment: List[Optional[_Choice]] = [None] * len(self.domains)
+        try:
+            self._search(assignment, list(range(len(self.domains))), self.domains, 0, 0, 0)
+        except _Interrupted:
+            pass
+        return self.best_genes
+
+    def _search(self, assignment, unassigned: List[int], domains: List[List[_Choice]],
+                blocked: int, days: int, bonus: int):
+        self.nodes += 1
+        if self._should_stop is not None:
+            self._until_check -= 1
+            if self._until_check <= 0:
+                self._until_check = EXACT_SOLVER_CHECK_INTERVAL
+                self.interrupted = self._should_stop()
+                if self.interrupted:
+                    raise _Interrupted
+        if not unassigned:
+            self._score_leaf(assignment)
+            return
+
+        # Optimistic bound: every remaining item takes its best bonus and the
+        # day count stays as low as it is now
+        remaining_bonus = sum(max(c.bonus for c in domains[i]) for i in unassigned)
+        bound = (self.fixed_bound + bonus + remaining_bonus
+                 + self.utilization_bound[bin(days).count("1")])
+        if bound <= (self.best_score if self.hall_of_fame is None
+                     else self.hall_of_fame.threshold):
+            return
+
+        # Fail-first: branch on the item with the fewest remaining choices
+        item = min(unassigned, key=lambda i: len(domains[i]))
+        rest = [i for i in unassigned if i != item]
+        ordered = sorted(
+            domains[item], key=lambda c: (bin(c.days & ~days).count("1"), -c.bonus)
+        )
+
+        for choice in ordered:
+            # Forward checking: drop choices that clash with this one
+            new_blocked = blocked | choice.conflicts
+            pruned = list(domains)
+            for other in rest:
+                pruned[other] = [c for c in domains[other] if not c.mask & new_blocked]
+                if not pruned[other]:
+                    break
+            else:
+                assignment[item] = choice
+                self._search(assignment, rest, pruned, new_blocked,
+                             days | choice.days, bonus + choice.bonus)
+                assignment[item] = None
+
+    def _score_leaf(self, assignment: List[_Choice]):
+        self.leaves += 1
+        genes = [gene for choice in assignment for gene in choice.genes]
+        score = self.generator.evaluate(genes)[0]
+        if score > self.best_score:
+            self.best_score = score
+            self.best_genes = genes
+        if self.hall_of_fame is not None:
+            self.hall_of_fame.insert(genes, score)
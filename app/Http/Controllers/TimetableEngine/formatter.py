@@ -5,19 +5,37 @@ This module handles converting timetable objects into various output formats,
 primarily JSON for API responses.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Tuple
 from collections import defaultdict
 from models import Timetable
 
 
-def format_timetable_as_json(timetable: Optional[Timetable]) -> Dict:
-    """Convert the Timetable object to a JSON-serializable dictionary."""
+def format_timetable_as_json(timetable: Optional[Timetable],
+                             alternatives: Optional[Sequence[Tuple[float, Timetable]]] = None) -> Dict:
+    """
+    Convert the Timetable object to a JSON-serializable dictionary.
+
+    If given, alternatives ((fitness, Timetable) pairs, best first, as in
+    TimetableGenerator.top_timetables) are added as a ranked "alternatives"
+    list, each entry with its rank, fitness, timetable and summary.
+    """
     if not timetable:
         return {
             "status": "error", 
             "message": "No timetable could be generated."
         }
 
+    output = {"status": "success", **_timetable_document(timetable)}
+    if alternatives is not None:
+        output["alternatives"] = [
+            {"rank": rank, "fitness": float(fitness), **_timetable_document(alternative)}
+            for rank, (fitness, alternative) in enumerate(alternatives, start=1)
+        ]
+    return output
+
+
+def _timetable_document(timetable: Timetable) -> Dict:
+    """The "timetable" (classes by day) and "summary" of one timetable."""
     schedule_dict = defaultdict(list)
     for day, scheduled_classes in timetable.schedule.items():
         for sc in scheduled_classes:
@@ -33,7 +51,6 @@ def format_timetable_as_json(timetable: Optional[Timetable]) -> Dict:
             })
 
     return {
-        "status": "success",
         "timetable": schedule_dict,
         "summary": {
             "total_classes": len(timetable.scheduled_classes),
@@ -5,41 +5,118 @@ This module contains the core genetic algorithm logic that evolves
 populations of timetable configurations to find optimal solutions.
 """
 
+import hashlib
+import math
+import multiprocessing
 import random
 import sys
-from typing import List, Dict, Optional, Tuple
+import time
+from typing import Any, Callable, List, Dict, Optional, Tuple
 import numpy as np
 from deap import base, creator, tools, algorithms
 
-from models import Class, Timetable
+from models import Class, Timetable, section_occupancy
 from data_loader import group_classes_by_section
 from scoring import ScoreCalculator
+from batch_evaluator import PopulationEvaluator
+from delta_evaluator import DeltaEvaluator
+from cache import FitnessCache, shared_cache
+from exact_solver import ExactSolver
+from hall_of_fame import DiverseHallOfFame
+from operators import FeasibilityOperators
+from adaptive import ConvergenceMonitor, size_search, stagnation_window
 from constants import (
-    BASE_SCORE, DEFAULT_GENERATIONS, DEFAULT_POPULATION_SIZE,
+    BASE_SCORE,
     CROSSOVER_PROBABILITY, MUTATION_PROBABILITY, TOURNAMENT_SIZE,
-    GOOD_FITNESS_THRESHOLD
+    CROSSOVER_GENE_PROBABILITY, MUTATION_GENE_PROBABILITY, GA_CORES,
+    BATCH_EVALUATION_MIN_SIZE, FITNESS_CACHE_SIZE,
+    EXACT_SOLVER_MAX_SPACE, ALTERNATIVE_MIN_DISTANCE
 )
 
+ENGINES = ("auto", "ga", "exact")
+
 # Initialize DEAP (only create if not already created)
 if not hasattr(creator, "FitnessMax"):
     creator.create("FitnessMax", base.Fitness, weights=(1.0,))
 if not hasattr(creator, "Individual"):
     creator.create("Individual", list, fitness=creator.FitnessMax)
 
+# Generator rebuilt once per evaluation worker process (parallel mode)
+_worker_generator = None
+
+
+def _init_evaluation_worker(classes: List[Class], user_preferences: dict):
+    """Pool initializer: rebuild the immutable gene map and indexes once."""
+    global _worker_generator
+    _worker_generator = TimetableGenerator(classes, user_preferences)
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, ...]]) -> List[float]:
+    """Evaluate a chunk of individuals inside a worker process."""
+    return [fit[0] for fit in _worker_generator.evaluate_population(chunk)]
+
 
 class TimetableGenerator:
     """Main genetic algorithm engine for timetable generation."""
     
-    def __init__(self, classes: List[Class], user_preferences: dict):
+    def __init__(self, classes: List[Class], user_preferences: dict,
+                 vectorized: bool = True, workers: int = 1,
+                 seed: Optional[int] = None, islands: int = 1,
+                 cache_size: Optional[int] = FITNESS_CACHE_SIZE,
+                 share_cache: bool = False, engine: str = "auto",
+                 feasible_operators: bool = True, incremental: bool = True,
+                 ga_core: str = "deap",
+                 island_rates: Optional[List[Tuple[float, float]]] = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'; expected one of {', '.join(ENGINES)}.")
+        if ga_core not in GA_CORES:
+            raise ValueError(f"Unknown ga_core '{ga_core}'; expected one of {', '.join(GA_CORES)}.")
+        # The exact solver runs no GA and island workers always evolve with DEAP
+        if ga_core != "deap" and (engine == "exact" or islands > 1):
+            raise ValueError(f"ga_core '{ga_core}' cannot be combined with "
+                             f"{'engine exact' if engine == 'exact' else 'islands'}.")
+        for rates in island_rates or []:
+            if len(rates) != 2 or not all(0.0 <= rate <= 1.0 for rate in rates):
+                raise ValueError("island_rates must be (crossover, mutation) pairs between 0 and 1.")
         self.classes = classes
         self.user_preferences = user_preferences
         self.enforce_ties = user_preferences.get("enforce_ties", True)
         self.section_groups = group_classes_by_section(classes)
         self.gene_map = []
         self.score_calculator = ScoreCalculator(user_preferences)
-        self.fitness_cache = {}  # Cache for fitness evaluations
+        self.vectorized = vectorized  # Score large batches with NumPy
+        self._population_evaluator = None
+        self.incremental = incremental  # Rescore only the days a child changed
+        self._delta_evaluator = None
+        self.workers = workers  # > 1 evaluates across a process pool in run()
+        self.seed = seed  # Seeds the GA's random choices for reproducible runs
+        self._pool = None
+        self.islands = islands  # > 1 runs an island model, one process per island
+        # (crossover, mutation) per island; islands without a pair use the rates below
+        self.island_rates = list(island_rates or [])
+        self.island_model = None  # Per-island progress of the last island run
+        self.crossover_probability = CROSSOVER_PROBABILITY
+        self.mutation_probability = MUTATION_PROBABILITY
+        self.engine = engine  # "auto" solves small search spaces exactly
+        self.ga_core = ga_core  # "numpy" evolves a gene matrix instead of DEAP individuals
+        # Build and repair individuals so they avoid clashes where possible
+        self.feasible_operators = feasible_operators
+        self.run_stats = {}  # Statistics of the last run()
+        self.hall_of_fame = None  # Best distinct timetables of the running search
+        self.top_timetables: List[Tuple[float, Timetable]] = []  # Ranked, from the last run()
+        self._progress_callback = None
+        self._reported_best = 0.0
+        self._deadline = None  # time.monotonic() by which run() must stop
+        self._cancel_event = None
         self.setup_deap()
 
+        # Bounded LRU cache of fitness evaluations; a shared cache is reused by
+        # every generator in this process with the same fingerprint()
+        if share_cache:
+            self.fitness_cache = shared_cache(self.fingerprint(), cache_size)
+        else:
+            self.fitness_cache = FitnessCache(cache_size)
+
     def setup_deap(self):
         """Set up DEAP toolbox based on whether ties are enforced."""
         self.toolbox = base.Toolbox()
@@ -55,6 +132,8 @@ class TimetableGenerator:
                 "No valid sections found for the selected subjects with the chosen constraints."
             )
 
+        self.gene_upper_bounds = gene_upper_bounds
+        self._index_sections()
         self._register_genetic_operators(gene_upper_bounds)
 
     def _setup_tied_genes(self, gene_upper_bounds: List[int]):
@@ -134,13 +213,119 @@ class TimetableGenerator:
                 })
                 gene_upper_bounds.append(len(tutorials) - 1)
 
+    def _index_sections(self):
+        """
+        Give every candidate section in the gene map an integer id.
+
+        Each section's occupancy bitmask is computed once here, and the gene map
+        gets id tables (``pair_ids`` / ``section_ids``) so individuals can be
+        decoded and clash-checked without touching Class objects.
+        """
+        self.candidate_sections: List[List[Class]] = []
+        self.section_masks: List[int] = []
+        ids_by_object: Dict[int, int] = {}
+
+        def section_id(section: List[Class]) -> int:
+            key = id(section)
+            if key not in ids_by_object:
+                ids_by_object[key] = len(self.candidate_sections)
+                self.candidate_sections.append(section)
+                self.section_masks.append(section_occupancy(section))
+            return ids_by_object[key]
+
+        for map_item in self.gene_map:
+            if map_item["type"] == "tied_subject":
+                map_item["pair_ids"] = [
+                    (section_id(lecture), [section_id(tut) for tut in tutorials])
+                    for lecture, tutorials in map_item["pairs"]
+                ]
+            else:
+                map_item["section_ids"] = [
+                    section_id(section) for section in map_item["sections"]
+                ]
+
+        self._build_conflict_index()
+
+    def _build_conflict_index(self):
+        """
+        Precompute which candidate sections clash with each other.
+
+        ``conflict_sets[i]`` is an adjacency bitset (bit j set when sections i
+        and j overlap) and ``conflict_matrix`` is the same relation as a boolean
+        NumPy matrix for inspection. A section that occupies any time conflicts
+        with itself, so choosing the same section twice is infeasible too.
+        """
+        masks = self.section_masks
+        count = len(masks)
+        self.conflict_matrix = np.zeros((count, count), dtype=bool)
+        self.conflict_sets: List[int] = [0] * count
+
+        for i in range(count):
+            for j in range(i, count):
+                if masks[i] & masks[j]:
+                    self.conflict_matrix[i, j] = self.conflict_matrix[j, i] = True
+                    self.conflict_sets[i] |= 1 << j
+                    self.conflict_sets[j] |= 1 << i
+
+    def item_choices(self) -> List[List[Tuple[Tuple[int, ...], Tuple[int, ...]]]]:
+        """
+        List every (genes, section ids) option of each gene-map item.
+
+        A tied subject offers one option per lecture and tied tutorial (the
+        tutorial gene is its index in that lecture's list); an independent
+        activity offers one option per section.
+        """
+        choices = []
+        for map_item in self.gene_map:
+            if map_item["type"] == "tied_subject":
+                choices.append([
+                    ((lecture_choice, tutorial_choice), (lecture_id, tutorial_id))
+                    for lecture_choice, (lecture_id, tutorial_ids) in enumerate(map_item["pair_ids"])
+                    for tutorial_choice, tutorial_id in enumerate(tutorial_ids)
+                ])
+            else:
+                choices.append([
+                    ((choice,), (section_id,))
+                    for choice, section_id in enumerate(map_item["section_ids"])
+                ])
+        return choices
+
+    def estimate_search_space(self) -> int:
+        """
+        Count the distinct section combinations the gene map can express.
+
+        Clashes are not excluded, so this is an upper bound on the number of
+        feasible timetables.
+        """
+        size = 1
+        for map_item in self.gene_map:
+            if map_item["type"] == "tied_subject":
+                size *= sum(len(tutorial_ids) for _, tutorial_ids in map_item["pair_ids"])
+            else:
+                size *= len(map_item["section_ids"])
+        return size
+
+    def is_feasible(self, section_ids: List[int]) -> bool:
+        """Check a set of candidate section ids for clashes using the conflict index."""
+        chosen = 0
+        for section_id in section_ids:
+            if self.conflict_sets[section_id] & chosen:
+                return False
+            chosen |= 1 << section_id
+        return True
+
     def _register_genetic_operators(self, gene_upper_bounds: List[int]):
         """Register genetic operators with DEAP."""
-        self.toolbox.register(
-            "indices",
-            lambda bounds: [random.randint(0, b) for b in bounds],
-            gene_upper_bounds,
-        )
+        if self.feasible_operators:
+            operators = FeasibilityOperators(self)
+            self.toolbox.register("indices", operators.construct)
+            self.toolbox.register("repair", operators.repair)
+        else:
+            self.toolbox.register(
+                "indices",
+                lambda bounds: [random.randint(0, b) for b in bounds],
+                gene_upper_bounds,
+            )
         self.toolbox.register(
             "individual", tools.initIterate, creator.Individual, self.toolbox.indices
         )
@@ -149,13 +334,13 @@ class TimetableGenerator:
         )
 
         self.toolbox.register("evaluate", self.evaluate)
-        self.toolbox.register("mate", tools.cxUniform, indpb=0.5)
+        self.toolbox.register("mate", tools.cxUniform, indpb=CROSSOVER_GENE_PROBABILITY)
         self.toolbox.register(
             "mutate",
             tools.mutUniformInt,
             low=[0] * len(gene_upper_bounds),
             up=gene_upper_bounds,
-            indpb=0.1,
+            indpb=MUTATION_GENE_PROBABILITY,
         )
         self.toolbox.register("select", tools.selTournament, tournsize=TOURNAMENT_SIZE)
         
@@ -164,24 +349,65 @@ class TimetableGenerator:
             return creator.Individual(ind)
         self.toolbox.register("clone", clone_individual)
 
+    def fingerprint(self) -> str:
+        """
+        Identify everything a fitness score depends on.
+
+        Two generators with the same fingerprint score every individual the
+        same way, so they can share a fitness cache.
+        """
+        calculator = self.score_calculator
+        digest = hashlib.sha1(repr((
+            self.enforce_ties,
+            calculator.style,
+            sorted(calculator.preferred_lecturers),
+            sorted(calculator.preferred_days),
+            calculator.preferred_start,
+            calculator.preferred_end,
+            [map_item.get("pair_ids") or map_item["section_ids"] for map_item in self.gene_map],
+        )).encode("utf-8"))
+        for section in self.candidate_sections:
+            digest.update(repr([
+                (cls.days, cls.start_minutes, cls.end_minutes, cls.lecturer) for cls in section
+            ]).encode("utf-8"))
+        return digest.hexdigest()
+
     def evaluate(self, individual: List[int]) -> Tuple[float,]:
         """Evaluate the fitness of an individual (timetable configuration)."""
         # Use tuple for hashable cache key
         cache_key = tuple(individual)
-        if cache_key in self.fitness_cache:
-            return (self.fitness_cache[cache_key],)
-        
-        timetable = Timetable()
+        score = self.fitness_cache.get(cache_key)
+        if score is None:
+            score = self._compute_fitness(cache_key, getattr(individual, "parent_genes", None))
+            self.fitness_cache[cache_key] = score
+        return (score,)
 
-        # Decode the individual into sections to schedule
-        sections_to_schedule = self._decode_individual(individual)
+    def _compute_fitness(self, individual: Tuple[int, ...],
+                         parent: Optional[Tuple[int, ...]] = None) -> float:
+        """
+        Score one individual without consulting the fitness cache.
+
+        When incremental evaluation is on and the individual's parent (the
+        genes it was varied from) is given, only the days touched by the
+        changed sections are rescored.
+        """
+        # Decode the individual into candidate section ids
+        section_ids = self._decode_section_ids(individual)
+
+        # Check for hard constraints (time clashes) in the conflict index
+        # before building any ScheduledClass objects
+        if not self.is_feasible(section_ids):
+            return 0  # Invalid timetable
+
+        if self.incremental:
+            evaluator = self._get_delta_evaluator()
+            if evaluator.supported:
+                parent_ids = self._decode_section_ids(parent) if parent is not None else None
+                return evaluator.score(section_ids, parent_ids)
 
-        # Check for hard constraints (time clashes)
-        for section in sections_to_schedule:
-            if not timetable.can_add_section(section):
-                self.fitness_cache[cache_key] = 0
-                return (0,)  # Invalid timetable
-            timetable.add_section(section)
+        timetable = Timetable()
+        for section_id in section_ids:
+            timetable.add_section(self.candidate_sections[section_id])
 
         # Calculate fitness score
         score = BASE_SCORE
@@ -191,107 +417,471 @@ class TimetableGenerator:
         score += self.score_calculator.calculate_preference_bonuses(timetable)
         score += self.score_calculator.calculate_gap_scores(timetable)
         score += self.score_calculator.calculate_streak_scores(timetable)
-
-        self.fitness_cache[cache_key] = score
-        return (score,)
-
-    def _decode_individual(self, individual: List[int]) -> List[List[Class]]:
-        """Decode an individual's genes into actual class sections."""
-        sections_to_schedule = []
+        return score
+
+    def evaluate_population(self, individuals: List[List[int]],
+                            parents: Optional[List[Optional[Tuple[int, ...]]]] = None
+                            ) -> List[Tuple[float,]]:
+        """
+        Evaluate many individuals at once, returning one fitness tuple each.
+
+        Individuals already in the fitness cache are not re-scored. With
+        incremental evaluation on (and no worker pool), children are scored
+        from their parents by the DeltaEvaluator however many there are. When
+        enough other distinct individuals remain (and vectorized mode is on)
+        they are scored together by the NumPy PopulationEvaluator, which gives
+        exactly the same scores as evaluate(). parents gives each individual's
+        parent genes for incremental evaluation; by default they are read from
+        the individuals' parent_genes attribute.
+        """
+        keys = [tuple(individual) for individual in individuals]
+        if parents is None:
+            parents = [getattr(individual, "parent_genes", None) for individual in individuals]
+        parents = {key: parent for key, parent in zip(keys, parents) if parent is not None}
+        scores = {}
+        pending = []
+        for key in dict.fromkeys(keys):
+            score = self.fitness_cache.get(key)
+            if score is None:
+                pending.append(key)
+            else:
+                scores[key] = score
+
+        if (self.incremental and parents and self._pool is None
+                and self._get_delta_evaluator().supported):
+            # Children are scored from their parents' day scores, which also
+            # keeps their own for the next generation's children; only the
+            # rest (such as an initial population) are batched
+            batch = [key for key in pending if key not in parents]
+        else:
+            batch = pending
+
+        if self._pool is not None and len(batch) >= 2 * BATCH_EVALUATION_MIN_SIZE:
+            # Split the uncached individuals into one chunk per worker (but no
+            # smaller than a useful batch) and evaluate them in parallel
+            chunk_size = max(BATCH_EVALUATION_MIN_SIZE, math.ceil(len(batch) / self.workers))
+            chunks = [batch[i:i + chunk_size] for i in range(0, len(batch), chunk_size)]
+            chunk_scores = self.toolbox.map(_evaluate_chunk, chunks)
+            scores.update(zip(batch, (score for chunk in chunk_scores for score in chunk)))
+        elif self.vectorized and len(batch) >= BATCH_EVALUATION_MIN_SIZE:
+            evaluator = self._get_population_evaluator()
+            if evaluator.supported:
+                scores.update(zip(batch, evaluator.evaluate(batch)))
+            else:
+                self.vectorized = False
+
+        for key in pending:
+            score = scores.get(key)
+            if score is None:
+                score = scores[key] = self._compute_fitness(key, parents.get(key))
+            self.fitness_cache[key] = score
+
+        return [(scores[key],) for key in keys]
+
+    def _get_delta_evaluator(self):
+        """Build the incremental evaluator on first use."""
+        if self._delta_evaluator is None:
+            self._delta_evaluator = DeltaEvaluator(self)
+        return self._delta_evaluator
+
+    def _get_population_evaluator(self):
+        """Build the NumPy population evaluator on first use."""
+        if self._population_evaluator is None:
+            self._population_evaluator = PopulationEvaluator(self)
+        return self._population_evaluator
+
+    def _decode_section_ids(self, individual: List[int]) -> List[int]:
+        """Decode an individual's genes into candidate section ids."""
+        section_ids = []
         
         if self.enforce_ties:
             gene_idx = 0
             for map_item in self.gene_map:
                 lecture_choice, tutorial_choice = individual[gene_idx], individual[gene_idx + 1]
-                chosen_pair = map_item["pairs"][lecture_choice]
-                sections_to_schedule.append(chosen_pair[0])  # Lecture section
+                lecture_id, tutorial_ids = map_item["pair_ids"][lecture_choice]
+                section_ids.append(lecture_id)  # Lecture section
                 
-                tied_tutorials = chosen_pair[1]
-                if tied_tutorials:
-                    sections_to_schedule.append(
-                        tied_tutorials[tutorial_choice % len(tied_tutorials)]
-                    )
+                if tutorial_ids:
+                    section_ids.append(tutorial_ids[tutorial_choice % len(tutorial_ids)])
                 gene_idx += 2
         else:
             for i, map_item in enumerate(self.gene_map):
-                sections_to_schedule.append(map_item["sections"][individual[i]])
+                section_ids.append(map_item["section_ids"][individual[i]])
 
-        return sections_to_schedule
+        return section_ids
 
-    def run(self, generations: int = DEFAULT_GENERATIONS, 
-            pop_size: int = DEFAULT_POPULATION_SIZE) -> Optional[Timetable]:
-        """Run the genetic algorithm to find the best timetable."""
+    def _decode_individual(self, individual: List[int]) -> List[List[Class]]:
+        """Decode an individual's genes into actual class sections."""
+        return [
+            self.candidate_sections[section_id]
+            for section_id in self._decode_section_ids(individual)
+        ]
+
+    def search_budget(self) -> Tuple[int, int]:
+        """(generations, population size) sized from the search space (see adaptive.py)."""
+        return size_search(self.estimate_search_space())
+
+    def run(self, generations: Optional[int] = None,
+            pop_size: Optional[int] = None,
+            progress_callback: Optional[Callable[[Dict[str, Any]], Optional[bool]]] = None,
+            deadline_ms: Optional[float] = None, cancel_event=None,
+            top_k: int = 1, min_distance: int = ALTERNATIVE_MIN_DISTANCE
+            ) -> Optional[Timetable]:
+        """
+        Run the genetic algorithm to find the best timetable.
+
+        The search is anytime: when it is cancelled or runs out of time it
+        returns the best timetable found so far. run_stats["termination"]
+        records why it stopped ("completed", "stagnated", "converged",
+        "deadline" or "cancelled"). There is no good-enough score: every
+        feasible timetable scores above BASE_SCORE, so only the
+        ConvergenceMonitor ends a search before its generation budget.
+
+        Args:
+            generations: Maximum number of generations; by default sized from
+                the search space (search_budget()).
+            pop_size: Population size; by default sized the same way.
+            progress_callback: Called once per generation with a progress event
+                (see _report_progress). Returning False cancels the run.
+            deadline_ms: Wall-clock budget for the search in milliseconds. It
+                is checked between generations (and periodically by the exact
+                solver), so a run overshoots it by at most one generation.
+            cancel_event: Any object with an is_set() method, such as a
+                threading or multiprocessing Event; setting it cancels the run.
+            top_k: Number of distinct feasible timetables to keep. After the
+                run, top_timetables holds up to top_k (fitness, Timetable)
+                pairs, best first; the first is the returned timetable.
+            min_distance: Sections by which any two of the top_k timetables
+                must differ (see hall_of_fame.py).
+        """
+        self.top_timetables = []
         if not self.gene_map:
             return None
 
+        if self.seed is not None:
+            random.seed(self.seed)
+
+        cache_before = self.fitness_cache.stats()
+        self.run_stats = {}
+        self._progress_callback = progress_callback
+        self._reported_best = 0.0
+        self._deadline = None if deadline_ms is None else time.monotonic() + deadline_ms / 1000
+        self._cancel_event = cancel_event
+        self.hall_of_fame = DiverseHallOfFame(max(1, top_k), min_distance,
+                                              self._decode_section_ids)
+        try:
+            best = self._run_search(generations, pop_size)
+            if best is not None:
+                ranked = list(self.hall_of_fame)
+                self.top_timetables = [(ranked[0][1], best)] + [
+                    (fitness, self._build_timetable_from_individual(genes))
+                    for genes, fitness in ranked[1:]
+                ]
+            return best
+        finally:
+            self._progress_callback = None
+            self._cancel_event = None
+            self.hall_of_fame = None
+            if not self.run_stats.get("termination"):
+                self.run_stats["termination"] = "completed"
+            cache_stats = self.fitness_cache.stats_since(cache_before)
+            self.run_stats["fitness_cache"] = cache_stats
+            if self._delta_evaluator is not None:
+                self.run_stats["delta_evaluation"] = {
+                    "full": self._delta_evaluator.full_evaluations,
+                    "incremental": self._delta_evaluator.delta_evaluations,
+                }
+            print(f"Fitness cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                  f"{cache_stats['evictions']} evictions ({cache_stats['hit_rate']:.0%} hit rate)",
+                  file=sys.stderr)
+
+    def _run_search(self, generations: Optional[int],
+                    pop_size: Optional[int]) -> Optional[Timetable]:
+        """Pick the exact, island, parallel or serial search for run()."""
+        search_space = self.estimate_search_space()
+        if self.engine == "exact" or (
+                self.engine == "auto" and search_space <= EXACT_SOLVER_MAX_SPACE):
+            self.run_stats["engine"] = "exact"
+            self.run_stats["ga_core"] = None  # No GA ran
+            return self._run_exact()
+        self.run_stats["engine"] = "ga"
+        self.run_stats["ga_core"] = self.ga_core
+        budget_generations, budget_population = size_search(search_space)
+        if generations is None:
+            generations = budget_generations
+        if pop_size is None:
+            pop_size = budget_population
+        self.run_stats["budget"] = {"generations": generations, "population": pop_size}
+
+        if self.islands > 1:
+            # Imported here because the island workers import this module
+            from islands import IslandModel
+            self.island_model = IslandModel(self, islands=self.islands,
+                                            rates=self.island_rates)
+            return self.island_model.run(generations, pop_size)
+
+        evolve = self._run_native_evolution if self.ga_core == "numpy" else self._run_evolution
+        if self.workers <= 1:
+            return evolve(generations, pop_size)
+
+        # Parallel evaluation: ship the catalogue and preferences to each worker
+        # once, and route DEAP's map through the pool for the duration of the run
+        with multiprocessing.Pool(
+            processes=self.workers,
+            initializer=_init_evaluation_worker,
+            initargs=(self.classes, self.user_preferences),
+        ) as pool:
+            self._pool = pool
+            self.toolbox.register("map", pool.map)
+            try:
+                return evolve(generations, pop_size)
+            finally:
+                self._pool = None
+                self.toolbox.register("map", map)
+
+    def _run_exact(self) -> Optional[Timetable]:
+        """Solve the whole search space with the branch-and-bound solver."""
+        solver = ExactSolver(self, self.hall_of_fame)
+        best = solver.solve(should_stop=self._interruption)
+        self.run_stats["exact_solver"] = {
+            "nodes": solver.nodes,
+            "leaves": solver.leaves,
+            "best_fitness": solver.best_score,
+            "complete": solver.interrupted is None,
+        }
+        if solver.interrupted is not None:
+            self.run_stats["termination"] = solver.interrupted
+        print(f"Exact search: {solver.nodes} nodes, {solver.leaves} timetables scored, "
+              f"best fitness {solver.best_score:.1f}"
+              + (f" (stopped: {solver.interrupted})" if solver.interrupted else ""),
+              file=sys.stderr)
+        if best is None:
+            return None
+        self._report_progress(0, solver.best_score, solver.best_score, best)
+        return self._build_timetable_from_individual(best)
+
+    def _run_evolution(self, generations: int, pop_size: int) -> Optional[Timetable]:
+        """The evolution loop behind run()."""
         # Initialize population and statistics
         pop = self.toolbox.population(n=pop_size)
-        hof = tools.HallOfFame(1)
+        hof = self.hall_of_fame
         stats = tools.Statistics(lambda ind: ind.fitness.values[0])
-        stats.register("avg", np.mean)
-        stats.register("max", np.max)
-        stats.register("min", np.min)
+        stats.register("avg", lambda values: sum(values) / len(values))
+        stats.register("max", max)
+        stats.register("min", min)
 
         # Custom evolution loop with early termination
-        best_fitness_last_5_gens = []
-        
+        monitor = ConvergenceMonitor(stagnation_window(generations))
+
         for gen in range(generations):
             # Evaluate the population
-            fitnesses = list(map(self.toolbox.evaluate, pop))
-            for ind, fit in zip(pop, fitnesses):
-                ind.fitness.values = fit
+            self.assign_fitness(pop)
             
             # Update hall of fame and stats
             hof.update(pop)
             record = stats.compile(pop)
-            current_best = hof[0].fitness.values[0]
-            
-            # Track best fitness for stagnation detection
-            best_fitness_last_5_gens.append(current_best)
-            if len(best_fitness_last_5_gens) > 5:
-                best_fitness_last_5_gens.pop(0)
-            
-            # Print progress every 5 generations (more frequent for shorter runs)
-            if gen % 5 == 0 and gen > 0:  # Don't print at generation 0
-                print(f"Gen {gen}: Max={record['max']:.1f}, Avg={record['avg']:.1f}", file=sys.stderr)
-            
-            # Early termination conditions
-            if current_best >= GOOD_FITNESS_THRESHOLD:
-                print(f"Early termination at generation {gen} with fitness {current_best:.1f}", file=sys.stderr)
-                break
-            
-            # Stop if no improvement for 5 generations and we have a decent solution
-            if (len(best_fitness_last_5_gens) == 5 and 
-                max(best_fitness_last_5_gens) - min(best_fitness_last_5_gens) < 50 and
-                current_best > 3000):
-                print(f"Stopping due to stagnation at generation {gen} with fitness {current_best:.1f}", file=sys.stderr)
+            best_genes, current_best = next(iter(hof), (None, 0.0))
+            if self._end_generation(gen, current_best, record, best_genes, monitor):
                 break
-            
+
             # Select, crossover, and mutate for next generation
             if gen < generations - 1:  # Don't evolve on the last generation
-                offspring = self.toolbox.select(pop, len(pop))
-                offspring = list(map(self.toolbox.clone, offspring))
-                
-                # Apply crossover and mutation
-                for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                    if random.random() < CROSSOVER_PROBABILITY:
-                        self.toolbox.mate(child1, child2)
-                        del child1.fitness.values
-                        del child2.fitness.values
-                
-                for mutant in offspring:
-                    if random.random() < MUTATION_PROBABILITY:
-                        self.toolbox.mutate(mutant)
-                        del mutant.fitness.values
-                
-                pop[:] = offspring
+                pop[:] = self.next_generation(pop)
 
         # Check if a valid solution was found
-        if not hof or hof[0].fitness.values[0] == 0:
+        if not hof:
             return None
 
         # Build the best timetable
-        return self._build_timetable_from_individual(hof[0])
+        return self._build_timetable_from_individual(best_genes)
+
+    def _run_native_evolution(self, generations: int, pop_size: int) -> Optional[Timetable]:
+        """
+        The evolution loop of the "numpy" GA core.
+
+        The population is an integer matrix, one row per individual, and
+        selection, crossover and mutation are array operations over the whole
+        of it, with the DEAP core's operators and probabilities. Only fitness
+        evaluation (shared with the DEAP core, cache included) and the repair
+        of changed rows work row by row.
+        """
+        rng = np.random.default_rng(self.seed)
+        upper = np.array(self.gene_upper_bounds, dtype=np.int64)
+        if self.feasible_operators:
+            pop = np.array([self.toolbox.indices() for _ in range(pop_size)], dtype=np.int64)
+        else:
+            pop = rng.integers(0, upper + 1, size=(pop_size, len(upper)))
+        parents = None
+        hof = self.hall_of_fame
+        monitor = ConvergenceMonitor(stagnation_window(generations))
+        best_genes = None
+
+        for gen in range(generations):
+            rows = pop.tolist()
+            fitness = np.array([fit[0] for fit in self.evaluate_population(rows, parents)])
+            # Only individuals that beat the hall of fame's worst entry can enter
+            for index in np.flatnonzero(fitness > hof.threshold):
+                hof.insert(rows[index], float(fitness[index]))
+            record = {"avg": float(fitness.mean()), "max": float(fitness.max()),
+                      "min": float(fitness.min())}
+            best_genes, current_best = next(iter(hof), (None, 0.0))
+            if self._end_generation(gen, current_best, record, best_genes, monitor):
+                break
+
+            if gen < generations - 1:  # Don't evolve on the last generation
+                pop, parents = self._next_generation_matrix(pop, fitness, upper, rng)
+
+        if not hof:
+            return None
+        return self._build_timetable_from_individual(best_genes)
+
+    def _next_generation_matrix(self, pop, fitness, upper, rng):
+        """
+        Select, crossover and mutate a gene matrix into its offspring.
+
+        Returns the offspring and each row's parent genes (None for rows that
+        were copied unchanged, whose fitness is already cached).
+        """
+        count, width = pop.shape
+
+        # Tournament selection: each slot goes to the fittest of TOURNAMENT_SIZE
+        # random individuals (the first of them on ties, as in DEAP)
+        contestants = rng.integers(0, count, size=(count, TOURNAMENT_SIZE))
+        winners = contestants[np.arange(count), fitness[contestants].argmax(axis=1)]
+        selected = pop[winners]
+        offspring = selected.copy()
+        changed = np.zeros(count, dtype=bool)
+
+        # Uniform crossover of consecutive pairs
+        pairs = count // 2
+        first, second = offspring[0:2 * pairs:2], offspring[1:2 * pairs:2]
+        mate = rng.random(pairs) < self.crossover_probability
+        swap = (rng.random((pairs, width)) < CROSSOVER_GENE_PROBABILITY) & mate[:, None]
+        first[swap], second[swap] = second[swap], first[swap]
+        changed[0:2 * pairs:2] |= mate
+        changed[1:2 * pairs:2] |= mate
+
+        # Uniform integer mutation
+        mutants = rng.random(count) < self.mutation_probability
+        redraw = (rng.random((count, width)) < MUTATION_GENE_PROBABILITY) & mutants[:, None]
+        offspring[redraw] = rng.integers(0, upper + 1, size=(count, width))[redraw]
+        changed |= mutants
+
+        # Move clashing genes of changed rows to fitting sections
+        if self.feasible_operators:
+            for index in np.flatnonzero(changed):
+                offspring[index] = self.toolbox.repair(offspring[index].tolist())
+
+        parents = [tuple(row) if is_changed else None
+                   for row, is_changed in zip(selected.tolist(), changed)]
+        return offspring, parents
+
+    def _end_generation(self, gen: int, current_best: float, record: Dict[str, float],
+                        best_genes: Optional[List[int]], monitor: ConvergenceMonitor) -> bool:
+        """
+        Report an evaluated generation and decide whether the run stops there.
+
+        record holds the population's "avg", "max" and "min" fitness and
+        monitor the run's ConvergenceMonitor (updated here). Sets
+        run_stats["termination"] and returns True when the run must stop.
+        """
+        # Print progress every 5 generations (more frequent for shorter runs)
+        if gen % 5 == 0 and gen > 0:  # Don't print at generation 0
+            print(f"Gen {gen}: Max={record['max']:.1f}, Avg={record['avg']:.1f}", file=sys.stderr)
+
+        self.run_stats["generations"] = gen + 1
+        if not self._report_progress(gen, current_best, record["avg"], best_genes):
+            self.run_stats["termination"] = "cancelled"
+        else:
+            self.run_stats["termination"] = self._interruption()
+        if self.run_stats["termination"]:
+            print(f"Stopped ({self.run_stats['termination']}) at generation {gen} "
+                  f"with fitness {current_best:.1f}", file=sys.stderr)
+            return True
+
+        # Stop once the best has stalled or the population has converged
+        stalled = monitor.update(current_best, record["avg"])
+        if stalled:
+            self.run_stats["termination"] = stalled
+            print(f"Stopping ({stalled}) at generation {gen} with fitness {current_best:.1f}", file=sys.stderr)
+            return True
+        return False
+
+    def assign_fitness(self, population: List[List[int]]):
+        """Evaluate a population and store each individual's fitness."""
+        fitnesses = self.evaluate_population(population)
+        for ind, fit in zip(population, fitnesses):
+            ind.fitness.values = fit
+
+    def next_generation(self, population: List[List[int]]) -> List[List[int]]:
+        """Select, crossover and mutate a population into its offspring."""
+        offspring = self.toolbox.select(population, len(population))
+        offspring = list(map(self.toolbox.clone, offspring))
+        # Remember each child's starting genes for incremental evaluation
+        for child in offspring:
+            child.parent_genes = tuple(child)
+
+        # Apply crossover and mutation
+        for child1, child2 in zip(offspring[::2], offspring[1::2]):
+            if random.random() < self.crossover_probability:
+                self.toolbox.mate(child1, child2)
+                del child1.fitness.values
+                del child2.fitness.values
+
+        for mutant in offspring:
+            if random.random() < self.mutation_probability:
+                self.toolbox.mutate(mutant)
+                del mutant.fitness.values
+
+        # Move clashing genes of changed individuals to fitting sections
+        if self.feasible_operators:
+            for child in offspring:
+                if not child.fitness.valid:
+                    self.toolbox.repair(child)
+
+        return offspring
+
+    def _interruption(self) -> Optional[str]:
+        """Why run() must stop now ("cancelled" or "deadline"), or None."""
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            self.run_stats["cancelled"] = True
+            return "cancelled"
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return "deadline"
+        return None
+
+    def remaining_time(self) -> Optional[float]:
+        """Seconds left before the running search's deadline, or None."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def _report_progress(self, generation: int, best: float, average: float,
+                         best_individual: List[int]) -> bool:
+        """
+        Send a progress event to the run's callback; False means cancel.
+
+        The event holds the generation, the best and average fitness, and the
+        best timetable so far ("timetable", only when the best has improved
+        since the last event, otherwise None).
+        """
+        if self._progress_callback is None:
+            return True
+
+        timetable = None
+        if best > self._reported_best:
+            self._reported_best = best
+            timetable = self._build_timetable_from_individual(best_individual)
+        event = {
+            "generation": generation,
+            "best": float(best),
+            "average": float(average),
+            "timetable": timetable,
+        }
+        if self._progress_callback(event) is False:
+            self.run_stats["cancelled"] = True
+            return False
+        return True
 
     def _build_timetable_from_individual(self, individual: List[int]) -> Timetable:
         """Build a complete timetable from the best individual."""
@@ -0,0 +1,80 @@
+"""
+Hall of fame of distinct, diverse timetables.
+
+DEAP's HallOfFame keeps the best individuals, but near-identical timetables
+(the same sections reached through different genes, or one tutorial swapped)
+crowd it out. DiverseHallOfFame keeps the best K feasible timetables whose
+section sets differ pairwise by at least min_distance sections, so one run can
+offer the student real alternatives.
+
+The distance between two timetables is the number of sections one has that
+the other lacks (a Hamming distance over sections, which also works when tied
+lectures bring different numbers of tutorials). A newcomer closer than
+min_distance to kept entries replaces them only if it beats all of them.
+"""
+
+from typing import Callable, FrozenSet, Iterator, List, Sequence, Tuple
+
+Entry = Tuple[float, List[int], FrozenSet[int]]  # (fitness, genes, section ids)
+
+
+def section_distance(a: FrozenSet[int], b: FrozenSet[int]) -> int:
+    """Sections in one timetable but not the other (the larger direction)."""
+    return max(len(a - b), len(b - a))
+
+
+class DiverseHallOfFame:
+    """The best maxsize feasible individuals, at least min_distance sections apart."""
+
+    def __init__(self, maxsize: int, min_distance: int,
+                 sections: Callable[[Sequence[int]], Sequence[int]]):
+        """
+        Args:
+            maxsize: Number of timetables to keep.
+            min_distance: Smallest allowed section distance between two kept
+                timetables; 1 only rules out identical timetables.
+            sections: Decodes genes into section ids
+                (TimetableGenerator._decode_section_ids).
+        """
+        self.maxsize = maxsize
+        self.min_distance = max(1, min_distance)
+        self.sections = sections
+        self.entries: List[Entry] = []  # Best first
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Tuple[List[int], float]]:
+        """(genes, fitness) pairs, best first."""
+        return ((genes, fitness) for fitness, genes, _ in self.entries)
+
+    @property
+    def threshold(self) -> float:
+        """A fitness that cannot get in: the worst kept one when full, else 0."""
+        if len(self.entries) < self.maxsize:
+            return 0.0
+        return self.entries[-1][0]
+
+    def insert(self, genes: Sequence[int], fitness: float) -> bool:
+        """Offer one individual; return whether it was kept."""
+        if fitness <= 0 or (len(self.entries) >= self.maxsize and fitness <= self.entries[-1][0]):
+            return False  # Infeasible, or worse than everything kept
+        section_ids = frozenset(self.sections(genes))
+        close = [entry for entry in self.entries
+                 if section_distance(section_ids, entry[2]) < self.min_distance]
+        if any(entry[0] >= fitness for entry in close):
+            return False
+        for entry in close:
+            self.entries.remove(entry)
+
+        position = len(self.entries)
+        while position and self.entries[position - 1][0] < fitness:
+            position -= 1
+        self.entries.insert(position, (fitness, list(genes), section_ids))
+        del self.entries[self.maxsize:]
+        return True
+
+    def update(self, population: Sequence):
+        """Offer every evaluated individual of a DEAP population."""
+        for individual in population:
+            self.insert(individual, individual.fitness.values[0])
@@ -0,0 +1,274 @@
+"""
+Island-model genetic algorithm.
+
+Several independent populations ("islands") evolve in separate processes,
+each with its own random seed and optionally its own crossover and mutation
+rates. Every MIGRATION_INTERVAL generations each island sends copies of its
+best individuals to the next island in a ring, where they replace the worst
+individuals. Isolated islands keep exploring different regions of the search
+space while migration spreads good building blocks between them, which helps
+on heavily clashing catalogues where a single small population stagnates.
+"""
+
+import multiprocessing
+import random
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from deap import creator, tools
+
+from models import Timetable
+from hall_of_fame import DiverseHallOfFame
+from adaptive import ConvergenceMonitor, stagnation_window
+from constants import (
+    DEFAULT_ISLANDS,
+    MIGRATION_INTERVAL, MIGRATION_SIZE,
+)
+
+# (genes, fitness) pairs cross process boundaries instead of DEAP individuals
+Migrant = Tuple[List[int], float]
+
+
+@dataclass
+class IslandConfig:
+    """Seed and variation rates for one island."""
+    seed: int
+    crossover_probability: float
+    mutation_probability: float
+
+
+def _record(generation: int, population: Sequence) -> Dict[str, float]:
+    fitnesses = [ind.fitness.values[0] for ind in population]
+    return {
+        "generation": generation,
+        "max": max(fitnesses),
+        "avg": sum(fitnesses) / len(fitnesses),
+        "min": min(fitnesses),
+    }
+
+
+def _receive_migrants(population: List, migrants: Sequence[Migrant]):
+    """Replace the worst individuals of a population with migrants."""
+    if not migrants:
+        return
+    worst = sorted(range(len(population)), key=lambda i: population[i].fitness.values[0])
+    for index, (genes, fitness) in zip(worst, migrants):
+        individual = creator.Individual(genes)
+        individual.fitness.values = (fitness,)
+        population[index] = individual
+
+
+def _island_worker(conn, classes, user_preferences, vectorized: bool,
+                   feasible_operators: bool, config: IslandConfig, pop_size: int,
+                   migration_size: int, top_k: int, min_distance: int):
+    """
+    Evolve one island until told to stop.
+
+    Commands arrive over the pipe as (generations, migrants, time budget in
+    seconds or None); the reply is (progress records, best individual,
+    emigrants, the island's top_k distinct individuals). An island that runs
+    out of budget replies early. None stops the island.
+    """
+    # Imported here: genetic_algorithm imports this module lazily
+    from genetic_algorithm import TimetableGenerator
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent handles Ctrl+C
+    random.seed(config.seed)
+    generator = TimetableGenerator(classes, user_preferences, vectorized=vectorized,
+                                   engine="ga", feasible_operators=feasible_operators)
+    generator.crossover_probability = config.crossover_probability
+    generator.mutation_probability = config.mutation_probability
+
+    population = generator.toolbox.population(n=pop_size)
+    generator.assign_fitness(population)
+    hof = DiverseHallOfFame(top_k, min_distance, generator._decode_section_ids)
+    hof.update(population)
+    generation = 0
+    records = [_record(generation, population)]
+
+    while True:
+        elites = list(hof)
+        best = elites[0] if elites else ([], 0.0)  # No feasible individual yet
+        emigrants = [
+            (list(ind), ind.fitness.values[0])
+            for ind in tools.selBest(population, migration_size)
+        ]
+        conn.send((records, best, emigrants, elites))
+
+        command = conn.recv()
+        if command is None:
+            break
+        generations, migrants, budget = command
+        stop_at = None if budget is None else time.monotonic() + budget
+
+        _receive_migrants(population, migrants)
+        records = []
+        for _ in range(generations):
+            if stop_at is not None and time.monotonic() >= stop_at:
+                break
+            population[:] = generator.next_generation(population)
+            generator.assign_fitness(population)
+            hof.update(population)
+            generation += 1
+            records.append(_record(generation, population))
+    conn.close()
+
+
+class IslandModel:
+    """Runs a TimetableGenerator's search as several migrating populations."""
+
+    def __init__(self, generator, islands: int = DEFAULT_ISLANDS,
+                 migration_interval: int = MIGRATION_INTERVAL,
+                 migration_size: int = MIGRATION_SIZE,
+                 rates: Optional[Sequence[Tuple[float, float]]] = None):
+        """
+        Args:
+            generator: The TimetableGenerator whose catalogue and preferences
+                every island searches; it also decodes the winner.
+            islands: Number of island processes.
+            migration_interval: Generations between migrations.
+            migration_size: Individuals each island sends to its neighbour.
+            rates: Optional (crossover, mutation) probabilities per island;
+                islands without an entry use the generator's rates.
+        """
+        if islands < 1:
+            raise ValueError("At least one island is required.")
+        self.generator = generator
+        self.islands = islands
+        self.migration_interval = max(1, migration_interval)
+        self.migration_size = migration_size
+        self.rates = list(rates or [])
+
+        # Filled in by run()
+        self.progress: List[List[Dict[str, float]]] = [[] for _ in range(islands)]
+        self.best_fitness = 0.0
+        self.best_island: Optional[int] = None
+
+    def _island_configs(self) -> List[IslandConfig]:
+        rng = random.Random(self.generator.seed)
+        configs = []
+        for island in range(self.islands):
+            if island < len(self.rates):
+                crossover, mutation = self.rates[island]
+            else:
+                crossover = self.generator.crossover_probability
+                mutation = self.generator.mutation_probability
+            configs.append(IslandConfig(rng.randrange(2 ** 32), crossover, mutation))
+        return configs
+
+    def run(self, generations: Optional[int] = None,
+            pop_size: Optional[int] = None) -> Optional[Timetable]:
+        """
+        Evolve every island and return the best timetable found by any.
+
+        generations and pop_size (per island) default to the generator's
+        search_budget().
+        """
+        generator = self.generator
+        if not generator.gene_map:
+            return None
+        budget_generations, budget_population = generator.search_budget()
+        if generations is None:
+            generations = budget_generations
+        if pop_size is None:
+            pop_size = budget_population
+
+        self.progress = [[] for _ in range(self.islands)]
+        # Every island's distinct best individuals are merged here
+        hall_of_fame = generator.hall_of_fame
+        if hall_of_fame is None:
+            hall_of_fame = DiverseHallOfFame(1, 1, generator._decode_section_ids)
+        connections = []
+        processes = []
+        try:
+            for config in self._island_configs():
+                parent_conn, child_conn = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_island_worker,
+                    args=(child_conn, generator.classes, generator.user_preferences,
+                          generator.vectorized, generator.feasible_operators, config,
+                          pop_size, self.migration_size, hall_of_fame.maxsize,
+                          hall_of_fame.min_distance),
+                    daemon=True,
+                )
+                process.start()
+                child_conn.close()
+                connections.append(parent_conn)
+                processes.append(process)
+
+            best: Optional[Migrant] = None
+            generation = 0
+            # Updated once per epoch, so the window is counted in epochs
+            epochs = -(-stagnation_window(generations) // self.migration_interval)
+            monitor = ConvergenceMonitor(max(2, epochs))
+            while True:
+                # Collect every island's report for this epoch
+                reports = [conn.recv() for conn in connections]
+                for island, (records, island_best, _, elites) in enumerate(reports):
+                    self.progress[island].extend(records)
+                    if best is None or island_best[1] > best[1]:
+                        best = island_best
+                        self.best_island = island
+                    for genes, fitness in elites:
+                        hall_of_fame.insert(genes, fitness)
+                self._print_progress(generation, reports, best)
+
+                # An island that ran out of time budget may report no records
+                latest = [records[-1] for records, _, _, _ in reports if records]
+                average = sum(r["avg"] for r in latest) / len(latest) if latest else 0.0
+                generator.run_stats["generations"] = generation + 1
+                if not generator._report_progress(generation, best[1], average, best[0]):
+                    generator.run_stats["termination"] = "cancelled"
+                else:
+                    generator.run_stats["termination"] = generator._interruption()
+                if generator.run_stats["termination"]:
+                    print(f"Stopped ({generator.run_stats['termination']}) at generation "
+                          f"{generation}", file=sys.stderr)
+                    break
+
+                # The archipelago stops as one: once its best has stalled or
+                # its islands have converged
+                stalled = monitor.update(best[1], average)
+                if stalled:
+                    generator.run_stats["termination"] = stalled
+                    print(f"Stopping ({stalled}) at generation {generation} with fitness "
+                          f"{best[1]:.1f} from island {self.best_island}", file=sys.stderr)
+                    break
+                if generation >= generations - 1:
+                    break
+
+                # Ring migration: island i receives island i-1's best
+                step = min(self.migration_interval, generations - 1 - generation)
+                budget = generator.remaining_time()
+                for island, conn in enumerate(connections):
+                    conn.send((step, reports[island - 1][2], budget))
+                generation += step
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        self.best_fitness = best[1]
+        if best[1] == 0:
+            return None
+        return generator._build_timetable_from_individual(best[0])
+
+    def _print_progress(self, generation: int, reports, best: Migrant):
+        for island, (records, _, _, _) in enumerate(reports):
+            if not records:
+                continue
+            record = records[-1]
+            print(f"Island {island} Gen {record['generation']}: "
+                  f"Max={record['max']:.1f}, Avg={record['avg']:.1f}", file=sys.stderr)
+        print(f"Gen {generation}: global best {best[1]:.1f} (island {self.best_island})",
+              file=sys.stderr)
@@ -7,16 +7,68 @@ It reads JSON input from stdin and outputs a generated timetable as JSON to stdo
 
 Usage:
     echo '{"classes": [...], "preferences": {...}}' | python main.py
+
+Options:
+    "deadline_ms" (in a top-level "options" object, or in "preferences") caps
+    the search's wall-clock time; when it runs out the best timetable found so
+    far is returned and stats.termination is "deadline".
+
+Alternatives:
+    "alternatives" (in "options") asks for up to that many distinct timetables
+    from the one run, returned best first as a ranked "alternatives" list next
+    to the usual best timetable. "alternatives_min_distance" sets how many
+    sections any two of them must differ by (default 1: merely distinct).
+
+GA core:
+    "ga_core": "numpy" (in "options") runs the genetic algorithm on a NumPy
+    gene matrix with vectorized selection, crossover and mutation instead of
+    DEAP individuals (the default, "deap").
+
+Metrics:
+    With "metrics": true in "options" the output gains a "metrics" block (wall
+    and CPU time per phase, evaluations, cache hit rate, generations,
+    termination, peak RSS growth and lifetime peak RSS); "profile" also writes a cProfile (or
+    pyinstrument) profile of the request. See metrics.py.
+
+Compact transport:
+    "class_columns" may replace "classes": the same rows as columns over a
+    shared string table, with times in minutes (see data_loader.CLASS_COLUMNS).
+    With "compact": true the output is written without indentation or spaces.
+
+Catalogue snapshots:
+    Instead of "classes", a request may send "catalogue_version" and the engine
+    selects the classes from its stored snapshot of that version, matching
+    subjects and lecturers by the preferences' "subject_ids" and
+    "lecturer_ids" when given (see snapshot.py). An unknown version fails with code
+    "unknown_catalogue_version"; the caller then stores it with
+    {"command": "load_catalogue", "version": ..., "classes": [...]} (or
+    "class_columns") and retries.
+
+Streaming:
+    With "stream": true in the input document, progress is written as
+    newline-delimited JSON while the search runs: one {"event": "progress", ...}
+    line per generation (generation, best, average and, whenever the best
+    improves, the best timetable so far), then one {"event": "result", ...}
+    line holding the usual output document. Closing stdout cancels the search.
+
+For production traffic prefer the long-lived engine server (server.py), which
+speaks the same JSON contract without paying interpreter and DEAP start-up
+costs on every request. This stdin mode remains the fallback, so it keeps its
+own start-up cheap: the GA module (and with it DEAP and NumPy) is imported only
+once a request has passed validation and its classes are loaded, so malformed
+requests and load_catalogue commands never pay for it.
 """
 
 import sys
 import json
 from datetime import datetime, time
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from data_loader import load_classes_from_json
-from genetic_algorithm import TimetableGenerator
+from data_loader import load_classes_from_document
+from snapshot import get_store
 from formatter import format_timetable_as_json
+from constants import MAX_ALTERNATIVES, ALTERNATIVE_MIN_DISTANCE, GA_CORES
+from metrics import RequestMetrics, parse_profiler
 
 
 def parse_time_preferences(user_prefs: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,7 +92,8 @@ def parse_time_preferences(user_prefs: Dict[str, Any]) -> Dict[str, Any]:
 
 def validate_input(input_data: Dict[str, Any]) -> None:
     """Validate the input data structure."""
-    if not input_data.get("classes"):
+    if not (input_data.get("classes") or input_data.get("class_columns")
+            or "catalogue_version" in input_data):
         raise ValueError("Missing 'classes' in JSON input.")
     
     if not input_data.get("preferences"):
@@ -50,44 +103,205 @@ def validate_input(input_data: Dict[str, Any]) -> None:
     if not prefs.get("subjects"):
         raise ValueError("Missing 'subjects' in preferences.")
 
+    if not isinstance(input_data.get("options", {}), dict):
+        raise ValueError("'options' must be an object.")
+
+
+def parse_deadline(input_data: Dict[str, Any]) -> Optional[float]:
+    """
+    Read deadline_ms from the options block or, failing that, the preferences.
+
+    It is removed from the preferences, which only describe the timetable.
+    """
+    deadline_ms = input_data["preferences"].pop("deadline_ms", None)
+    deadline_ms = (input_data.get("options") or {}).get("deadline_ms", deadline_ms)
+    if deadline_ms is None:
+        return None
+    if isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float)) or deadline_ms < 0:
+        raise ValueError("'deadline_ms' must be a non-negative number of milliseconds.")
+    return float(deadline_ms)
+
+
+def parse_alternatives(input_data: Dict[str, Any]) -> Tuple[int, int]:
+    """Read (alternatives, alternatives_min_distance) from the options block."""
+    options = input_data.get("options") or {}
+    count = options.get("alternatives", 1)
+    distance = options.get("alternatives_min_distance", ALTERNATIVE_MIN_DISTANCE)
+    if isinstance(count, bool) or not isinstance(count, int) or not 1 <= count <= MAX_ALTERNATIVES:
+        raise ValueError(f"'alternatives' must be a whole number from 1 to {MAX_ALTERNATIVES}.")
+    if isinstance(distance, bool) or not isinstance(distance, int) or distance < 1:
+        raise ValueError("'alternatives_min_distance' must be a positive whole number.")
+    return count, distance
+
+
+def parse_ga_core(input_data: Dict[str, Any]) -> str:
+    """Read ga_core from the options block ("deap" by default)."""
+    ga_core = (input_data.get("options") or {}).get("ga_core", "deap")
+    if ga_core not in GA_CORES:
+        raise ValueError(f"'ga_core' must be one of: {', '.join(GA_CORES)}.")
+    return ga_core
+
+
+def progress_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a TimetableGenerator progress event to its JSON form."""
+    output = {
+        "event": "progress",
+        "generation": event["generation"],
+        "best": event["best"],
+        "average": event["average"],
+    }
+    if event["timetable"] is not None:
+        output["timetable"] = format_timetable_as_json(event["timetable"])["timetable"]
+    return output
+
+
+ProgressCallback = Callable[[Dict[str, Any]], Optional[bool]]
+
+
+def generate_timetable(input_data: Dict[str, Any],
+                       progress: Optional[ProgressCallback] = None,
+                       cancel_event=None,
+                       metrics: Optional[RequestMetrics] = None) -> Dict[str, Any]:
+    """
+    Generate a timetable for one request and return the output document.
+
+    This is the request/response contract shared by the stdin mode below and
+    the long-lived engine server (server.py). If given, progress is called
+    with each JSON progress event; returning False, or setting cancel_event,
+    cancels the search. metrics may carry phases timed by the caller (such as
+    JSON parsing); it is reported when options.metrics is set.
+    """
+    metrics = metrics or RequestMetrics()
+
+    # 1. Validate input data
+    with metrics.phase("validate"):
+        validate_input(input_data)
+        deadline_ms = parse_deadline(input_data)
+        alternatives, min_distance = parse_alternatives(input_data)
+        ga_core = parse_ga_core(input_data)
+        options = input_data.get("options") or {}
+        profiler = parse_profiler(options.get("profile"))
+
+        # 2. Parse time preferences
+        user_prefs = parse_time_preferences(input_data["preferences"])
+
+    with metrics.profiled(profiler):
+        # 3. Load class data, or select it from a stored catalogue snapshot
+        with metrics.phase("load"):
+            if input_data.get("classes") or input_data.get("class_columns"):
+                classes = load_classes_from_document(input_data)
+                if not classes:
+                    raise ValueError("Could not load any valid classes from the provided data.")
+            else:
+                snapshot = get_store().get(input_data["catalogue_version"])
+                classes = snapshot.select(user_prefs)
+                if not classes:
+                    raise ValueError("No valid sections can be generated for the selected criteria.")
+
+        # 4. Generate the timetable
+        # Identical catalogue/preference requests in a long-lived process (the
+        # engine server) reuse each other's fitness evaluations
+        with metrics.phase("setup"):
+            # Imported here rather than at the top: DEAP and NumPy are most of
+            # this script's cold-start time (see test_startup_imports)
+            from genetic_algorithm import TimetableGenerator
+            generator = TimetableGenerator(classes, user_prefs, share_cache=True,
+                                           ga_core=ga_core)
+        callback = None
+        if progress is not None:
+            callback = lambda event: progress(progress_event(event))
+        with metrics.phase("search"):
+            best_timetable = generator.run(progress_callback=callback, deadline_ms=deadline_ms,
+                                           cancel_event=cancel_event, top_k=alternatives,
+                                           min_distance=min_distance)
+
+        # 5. Format the result
+        with metrics.phase("format"):
+            output = format_timetable_as_json(
+                best_timetable, generator.top_timetables if alternatives > 1 else None
+            )
+    output["stats"] = generator.run_stats
+    if options.get("metrics"):
+        output["metrics"] = metrics.document(generator.run_stats)
+    return output
+
+
+def handle_request(input_data: Dict[str, Any],
+                   progress: Optional[ProgressCallback] = None,
+                   cancel_event=None,
+                   metrics: Optional[RequestMetrics] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Run a single request, converting expected failures into an error document.
+
+    Returns:
+        (output document, exit code) where a non-zero exit code means error.
+    """
+    try:
+        if isinstance(input_data, dict) and input_data.get("command") == "load_catalogue":
+            return load_catalogue(input_data), 0
+        return generate_timetable(input_data, progress, cancel_event, metrics), 0
+    except (ValueError, KeyError) as e:
+        output = {"status": "error", "message": str(e)}
+        if getattr(e, "code", None):
+            output["code"] = e.code
+        return output, 1
+
+
+def load_catalogue(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a catalogue snapshot sent as {"version": ..., "classes": [...]}."""
+    if not input_data.get("version") or not (
+            input_data.get("classes") or input_data.get("class_columns")):
+        raise ValueError("load_catalogue needs a 'version' and 'classes'.")
+    snapshot = get_store().put(str(input_data["version"]), input_data)
+    return {"status": "success", "version": snapshot.version, "classes": len(snapshot)}
+
 
 def main():
     """
     Main function to be called when the script is executed.
     Reads JSON from stdin, generates a timetable, and prints JSON to stdout.
     """
+    metrics = RequestMetrics()
     try:
-        # 1. Read and validate input data
-        input_data = json.load(sys.stdin)
-        validate_input(input_data)
-        
-        classes_data = input_data["classes"]
-        user_prefs = input_data["preferences"]
+        with metrics.phase("parse"):
+            input_data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        # If the input is not valid JSON, print an error JSON to stdout
+        json.dump({"status": "error", "message": str(e)}, sys.stdout, indent=4)
+        sys.exit(1)
 
-        # 2. Load and process class data
-        classes = load_classes_from_json(classes_data)
-        if not classes:
-            raise ValueError("Could not load any valid classes from the provided data.")
+    if isinstance(input_data, dict) and input_data.get("stream"):
+        exit_code = stream_request(input_data, metrics)
+    else:
+        output_json, exit_code = handle_request(input_data, metrics=metrics)
+        sys.stdout.write(dumps_output(output_json, isinstance(input_data, dict)
+                                      and bool(input_data.get("compact"))))
+    if exit_code:
+        sys.exit(exit_code)
 
-        # 3. Parse time preferences
-        user_prefs = parse_time_preferences(user_prefs)
 
-        # 4. Generate the timetable
-        generator = TimetableGenerator(classes, user_prefs)
-        best_timetable = generator.run()
-
-        # 5. Format and output the result
-        output_json = format_timetable_as_json(best_timetable)
-        json.dump(output_json, sys.stdout, indent=4)
-
-    except (json.JSONDecodeError, ValueError, KeyError) as e:
-        # If any error occurs, print an error JSON to stdout
-        error_output = {
-            "status": "error",
-            "message": str(e)
-        }
-        json.dump(error_output, sys.stdout, indent=4)
-        sys.exit(1)
+def dumps_output(document: Dict[str, Any], compact: bool = False) -> str:
+    """Serialize an output document: indented, or as small as possible if compact."""
+    if compact:
+        return json.dumps(document, separators=(",", ":"))
+    return json.dumps(document, indent=4)
+
+
+def write_event(event: Dict[str, Any]) -> bool:
+    """Write one NDJSON line to stdout; False if the reader has gone away."""
+    try:
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+        return True
+    except BrokenPipeError:
+        return False
+
+
+def stream_request(input_data: Dict[str, Any], metrics: Optional[RequestMetrics] = None) -> int:
+    """Run a request in streaming mode, writing NDJSON events to stdout."""
+    output_json, exit_code = handle_request(input_data, write_event, metrics=metrics)
+    write_event({"event": "result", **output_json})
+    return exit_code
 
 
 if __name__ == "__main__":
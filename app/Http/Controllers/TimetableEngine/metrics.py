@@ -0,0 +1,140 @@
+"""
+Per-request timing and profiling instrumentation.
+
+A request with {"options": {"metrics": true}} gets a "metrics" block in its
+output: wall and CPU time per phase (parse, validate, load, setup, search,
+format), evaluations performed, fitness cache hit rate, generations run,
+termination reason and memory. The platform only reports a process's peak RSS
+over its whole lifetime, so a warm server worker reports the largest request it
+has served: process_peak_rss_kib is that lifetime peak, and
+peak_rss_growth_kib is how far this request raised it (0 when the request fit
+under an earlier peak).
+
+{"options": {"profile": true}} (or "cprofile", or "pyinstrument" when that
+package is installed) also profiles the request and writes the profile to
+TIMETABLE_ENGINE_PROFILE_DIR (the system temporary directory by default); the
+path is reported as metrics.profile. The directory is set by the operator,
+never by the request.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class RequestMetrics:
+    """Wall and CPU time of each phase of one request."""
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.profile_path: Optional[str] = None
+        self._baseline_pid: Optional[int] = None
+        self.baseline_rss_kib: Optional[int] = None  # The peak before this request
+        self._mark_baseline()
+
+    def _mark_baseline(self):
+        # The baseline belongs to the process that runs the request: the
+        # server parses a request itself, then hands it to a pool worker
+        if self._baseline_pid != os.getpid():
+            self._baseline_pid = os.getpid()
+            self.baseline_rss_kib = peak_rss_kib()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase name (repeated phases add up)."""
+        self._mark_baseline()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, {"wall_ms": 0.0, "cpu_ms": 0.0})
+            totals["wall_ms"] += (time.perf_counter() - wall) * 1000
+            totals["cpu_ms"] += (time.process_time() - cpu) * 1000
+
+    def document(self, run_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """The output "metrics" block, given the generator's run_stats."""
+        cache = run_stats.get("fitness_cache") or {}
+        self._mark_baseline()
+        peak = peak_rss_kib()
+        document = {
+            "phases": {name: {key: round(value, 3) for key, value in totals.items()}
+                       for name, totals in self.phases.items()},
+            "total": {
+                key: round(sum(totals[key] for totals in self.phases.values()), 3)
+                for key in ("wall_ms", "cpu_ms")
+            },
+            "engine": run_stats.get("engine"),
+            "evaluations": cache.get("misses", 0),
+            "cache_hit_rate": cache.get("hit_rate", 0.0),
+            "generations": run_stats.get("generations", 0),
+            "termination": run_stats.get("termination"),
+            "peak_rss_growth_kib": None if peak is None else peak - self.baseline_rss_kib,
+            "process_peak_rss_kib": peak,
+        }
+        if self.profile_path:
+            document["profile"] = self.profile_path
+        return document
+
+    @contextmanager
+    def profiled(self, profiler: Optional[str]):
+        """Profile the enclosed block with profiler (see PROFILERS), if any."""
+        if profiler is None:
+            yield
+            return
+        directory = os.environ.get("TIMETABLE_ENGINE_PROFILE_DIR") or tempfile.gettempdir()
+        path = os.path.join(directory, f"timetable-{time.time_ns()}-{os.getpid()}")
+
+        if profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ValueError("options.profile 'pyinstrument' requires the pyinstrument package.")
+            session = Profiler()
+            session.start()
+            try:
+                yield
+            finally:
+                session.stop()
+                self.profile_path = path + ".html"
+                with open(self.profile_path, "w", encoding="utf-8") as file:
+                    file.write(session.output_html())
+            return
+
+        import cProfile
+        session = cProfile.Profile()
+        session.enable()
+        try:
+            yield
+        finally:
+            session.disable()
+            self.profile_path = path + ".prof"  # Read with pstats or snakeviz
+            session.dump_stats(self.profile_path)
+
+
+def parse_profiler(value: Any) -> Optional[str]:
+    """The profiler named by options.profile: None, "cprofile" or "pyinstrument"."""
+    if value is None or value is False:
+        return None
+    if value is True:
+        return "cprofile"
+    if value in PROFILERS:
+        return value
+    raise ValueError(f"'profile' must be true, false or one of: {', '.join(PROFILERS)}.")
+
+
+def peak_rss_kib() -> Optional[int]:
+    """Lifetime peak resident set size of this process in KiB, where the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
@@ -8,14 +8,51 @@ This module contains the core data structures used throughout the system:
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Iterable
 from datetime import time, datetime, timedelta
-from constants import DAYS
+from constants import DAYS, MINUTES_PER_DAY
+
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
+
+def time_to_minutes(value: time) -> int:
+    """Convert a time of day to whole minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+def occupancy_mask(day_index: int, start_minutes: int, end_minutes: int) -> int:
+    """
+    Return a whole-week bitmask of the minutes occupied by a class.
+
+    Bit ``day_index * MINUTES_PER_DAY + minute`` is set for every minute in
+    [start_minutes, end_minutes), so two classes clash exactly when their masks
+    share a bit. Classes on days outside DAYS (day_index -1) occupy nothing.
+    """
+    if day_index < 0 or end_minutes <= start_minutes:
+        return 0
+    width = end_minutes - start_minutes
+    return ((1 << width) - 1) << (day_index * MINUTES_PER_DAY + start_minutes)
+
+
+def section_occupancy(section_classes: Iterable["Class"]) -> int:
+    """Return the combined occupancy bitmask of all classes in a section."""
+    mask = 0
+    for cls in section_classes:
+        mask |= cls.occupancy
+    return mask
 
 
 @dataclass
 class Class:
     """Represents a single class session with all its properties."""
+    # Slotted: catalogues hold thousands of these, so no per-instance __dict__.
+    # The last four slots are derived in __post_init__ and are not fields.
+    __slots__ = (
+        "code", "subject", "activity", "section", "days", "start_time", "end_time",
+        "venue", "tied_to", "lecturer",
+        "start_minutes", "end_minutes", "day_index", "occupancy",
+    )
+
     code: str
     subject: str
     activity: str  # "Lecture" or "Tutorial"
@@ -27,12 +64,19 @@ class Class:
     tied_to: List[str]  # List of tutorial sections tied to this lecture
     lecturer: str
 
+    def __post_init__(self):
+        # Integer forms precomputed at load time; scoring and clash checks use
+        # these instead of datetime arithmetic (times are minute-granular)
+        self.start_minutes = time_to_minutes(self.start_time)
+        self.end_minutes = time_to_minutes(self.end_time)
+        self.day_index = DAY_INDEX.get(self.days, -1)
+        # Precompute once so clash checks are a single AND
+        self.occupancy = occupancy_mask(self.day_index, self.start_minutes, self.end_minutes)
+
     @property
     def duration(self) -> int:
         """Calculate duration in minutes."""
-        start = datetime.combine(datetime.today(), self.start_time)
-        end = datetime.combine(datetime.today(), self.end_time)
-        return int((end - start).total_seconds() / 60)
+        return self.end_minutes - self.start_minutes
 
     @property
     def time_tuple(self) -> Tuple[datetime, datetime]:
@@ -47,6 +91,8 @@ class Class:
 @dataclass
 class ScheduledClass:
     """A class that has been placed in a specific time slot."""
+    __slots__ = ("class_obj", "day", "start_time", "end_time")
+
     class_obj: Class
     day: str
     start_time: time
@@ -59,20 +105,12 @@ class Timetable:
     def __init__(self):
         self.schedule: Dict[str, List[ScheduledClass]] = {day: [] for day in DAYS}
         self.scheduled_classes: List[ScheduledClass] = []
+        self.occupancy = 0  # Bitmask of occupied minutes, see occupancy_mask
 
     def can_add_section(self, section_classes: List[Class]) -> bool:
         """Check if we can add all classes in this section without time clashes."""
-        for cls in section_classes:
-            # Check time conflicts with existing classes on the same day
-            for existing in self.schedule[cls.days]:
-                # A clash occurs if the new class starts before the existing one ends
-                # AND the new class ends after the existing one starts
-                if (
-                    cls.start_time < existing.end_time
-                    and cls.end_time > existing.start_time
-                ):
-                    return False
-        return True
+        # A clash occurs if any minute of the section is already occupied
+        return not (self.occupancy & section_occupancy(section_classes))
 
     def add_section(self, section_classes: List[Class]):
         """Add all classes in a section. Assumes can_add_section was checked."""
@@ -83,10 +121,16 @@ class Timetable:
                 start_time=cls.start_time,
                 end_time=cls.end_time,
             )
-            self.schedule[cls.days].append(scheduled_class)
-            # Sort the day's schedule by start time after adding
-            self.schedule[cls.days].sort(key=lambda x: x.start_time)
+            # Insert in start-time order (after any equal start times, as a
+            # stable sort would) instead of re-sorting the day
+            day_classes = self.schedule[cls.days]
+            position = len(day_classes)
+            while (position and
+                   day_classes[position - 1].class_obj.start_minutes > cls.start_minutes):
+                position -= 1
+            day_classes.insert(position, scheduled_class)
             self.scheduled_classes.append(scheduled_class)
+            self.occupancy |= cls.occupancy
 
     def get_utilized_days(self) -> int:
         """Return the number of days that have at least one class."""
@@ -0,0 +1,137 @@
+"""
+Feasibility-preserving genetic operators.
+
+On clash-heavy catalogues most uniformly random genomes contain a time clash
+and score 0, so the GA spends its generations on dead individuals. These
+operators keep the population feasible wherever the catalogue allows:
+
+- construct() builds an individual greedily: gene-map items are visited in a
+  random order and each takes a random option that does not clash with the
+  options already taken.
+- repair() walks an individual's items in a random order and keeps every
+  option that fits; a clashing (or internally clashing) option is moved to the
+  nearest option, by position in the item's option list, that fits. If some
+  item has no fitting option, the walk is retried in another order (up to
+  REPAIR_ATTEMPTS passes).
+
+Both use the generator's precomputed conflict index. An item with no fitting
+option is left as it is, so infeasible individuals remain possible (and score
+0) only when greedy construction cannot avoid a clash.
+"""
+
+import random
+from typing import List, Optional, Sequence
+
+from constants import REPAIR_ATTEMPTS
+
+
+class FeasibilityOperators:
+    """Constructive initialization and clash repair for a TimetableGenerator."""
+
+    def __init__(self, generator):
+        conflict_sets = generator.conflict_sets
+        self.width = 2 if generator.enforce_ties else 1  # Genes per gene-map item
+
+        # Per item: each option's genes, section bitmask and the sections it
+        # clashes with (None when the option clashes with itself)
+        self.genes: List[List[Sequence[int]]] = []
+        self.masks: List[List[int]] = []
+        self.conflicts: List[List[Optional[int]]] = []
+        for options in generator.item_choices():
+            item_genes, item_masks, item_conflicts = [], [], []
+            for genes, section_ids in options:
+                mask = conflicts = 0
+                for section_id in section_ids:
+                    if conflict_sets[section_id] & mask:
+                        conflicts = None
+                        break
+                    mask |= 1 << section_id
+                    conflicts |= conflict_sets[section_id]
+                item_genes.append(genes)
+                item_masks.append(mask)
+                item_conflicts.append(conflicts)
+            self.genes.append(item_genes)
+            self.masks.append(item_masks)
+            self.conflicts.append(item_conflicts)
+
+        # Tied items: option index of each lecture's first tutorial
+        self.offsets: List[List[int]] = []
+        self.tutorial_counts: List[List[int]] = []
+        if generator.enforce_ties:
+            for map_item in generator.gene_map:
+                counts = [len(tutorial_ids) for _, tutorial_ids in map_item["pair_ids"]]
+                offsets, total = [], 0
+                for count in counts:
+                    offsets.append(total)
+                    total += count
+                self.offsets.append(offsets)
+                self.tutorial_counts.append(counts)
+
+    def _fits(self, item: int, option: int, chosen: int) -> bool:
+        conflicts = self.conflicts[item][option]
+        return conflicts is not None and not conflicts & chosen
+
+    def _option(self, individual: Sequence[int], item: int) -> int:
+        """Index of the option an individual's genes select for an item."""
+        position = item * self.width
+        if self.width == 1:
+            return individual[position]
+        lecture = individual[position]
+        tutorial = individual[position + 1] % self.tutorial_counts[item][lecture]
+        return self.offsets[item][lecture] + tutorial
+
+    def construct(self) -> List[int]:
+        """Build a random individual greedily, avoiding clashes where possible."""
+        individual = [0] * (len(self.genes) * self.width)
+        order = list(range(len(self.genes)))
+        random.shuffle(order)
+        chosen = 0
+        stuck = False
+        for item in order:
+            options = range(len(self.genes[item]))
+            fitting = [option for option in options if self._fits(item, option, chosen)]
+            stuck = stuck or not fitting
+            option = random.choice(fitting or options)
+            position = item * self.width
+            individual[position:position + self.width] = self.genes[item][option]
+            chosen |= self.masks[item][option]
+        # A greedy dead end is often fixable by repairing in another order
+        return self.repair(individual) if stuck else individual
+
+    def repair(self, individual: List[int]) -> List[int]:
+        """Move clashing options to their nearest fitting option, in place."""
+        for _ in range(REPAIR_ATTEMPTS):
+            if self._repair_pass(individual):
+                break
+        return individual
+
+    def _repair_pass(self, individual: List[int]) -> bool:
+        """One repair pass in a random item order; True if no clash is left."""
+        order = list(range(len(self.genes)))
+        random.shuffle(order)
+        chosen = 0
+        repaired = True
+        for item in order:
+            option = self._option(individual, item)
+            if not self._fits(item, option, chosen):
+                replacement = self._nearest_fitting(item, option, chosen)
+                if replacement is None:
+                    repaired = False
+                else:
+                    option = replacement
+                    position = item * self.width
+                    individual[position:position + self.width] = self.genes[item][option]
+            chosen |= self.masks[item][option]
+        return repaired
+
+    def _nearest_fitting(self, item: int, option: int, chosen: int) -> Optional[int]:
+        count = len(self.genes[item])
+        for distance in range(1, count):
+            # Look on both sides, in a random order so neither side is favoured
+            sides = (option - distance, option + distance)
+            if random.random() < 0.5:
+                sides = sides[::-1]
+            for candidate in sides:
+                if 0 <= candidate < count and self._fits(item, candidate, chosen):
+                    return candidate
+        return None
@@ -5,10 +5,14 @@ This module contains the scoring algorithms that evaluate how good a timetable i
 based on various criteria like gaps between classes, day utilization, and user preferences.
 """
 
-from typing import List
-from datetime import datetime, timedelta
-from models import Timetable, ScheduledClass
-from constants import DAYS, IDEAL_GAP, MAX_GAP, MAX_CONSECUTIVE_CLASSES, SCORING_PROFILES
+from typing import List, Optional
+from datetime import time
+from models import Class, Timetable, ScheduledClass, time_to_minutes
+from constants import (
+    DAYS, IDEAL_GAP_MINUTES, MAX_GAP_MINUTES, STREAK_GAP_MINUTES,
+    MAX_CONSECUTIVE_CLASSES, SCORING_PROFILES,
+    PREFERRED_LECTURER_BONUS, PREFERRED_DAY_BONUS, PREFERRED_TIME_BONUS,
+)
 
 
 class ScoreCalculator:
@@ -18,10 +22,19 @@ class ScoreCalculator:
         self.user_preferences = user_preferences
         self.style = user_preferences.get("schedule_style", "compact")
         self.scoring_profile = SCORING_PROFILES[self.style]
+        self.preferred_lecturers = user_preferences.get("preferred_lecturers", [])
+        self.preferred_days = user_preferences.get("preferred_days", [])
+        self.preferred_start = self._preference_minutes("preferred_start")
+        self.preferred_end = self._preference_minutes("preferred_end")
+
+    def _preference_minutes(self, key: str) -> Optional[int]:
+        """Convert a preferred time of day to minutes once, up front."""
+        value = self.user_preferences.get(key)
+        return time_to_minutes(value) if isinstance(value, time) else None
     
     def calculate_day_gaps_score(self, timetable: Timetable, day: str) -> float:
         """Calculate score based on gaps between classes on a single day."""
-        day_classes = sorted(timetable.schedule[day], key=lambda x: x.start_time)
+        day_classes = timetable.schedule[day]  # Kept in start-time order
         if len(day_classes) < 2:
             return 1.0  # No gaps if only one class
 
@@ -29,16 +42,14 @@ class ScoreCalculator:
         consecutive_count = 1
 
         for i in range(1, len(day_classes)):
-            prev_end = datetime.combine(datetime.today(), day_classes[i - 1].end_time)
-            curr_start = datetime.combine(datetime.today(), day_classes[i].start_time)
-            gap = curr_start - prev_end
+            gap = day_classes[i].class_obj.start_minutes - day_classes[i - 1].class_obj.end_minutes
 
-            if gap <= timedelta(0):
+            if gap <= 0:
                 consecutive_count += 1
                 continue  # No gap or overlap
-            elif gap <= IDEAL_GAP:
+            elif gap <= IDEAL_GAP_MINUTES:
                 total_gap_score += 1.0  # Perfect gap
-            elif gap <= MAX_GAP:
+            elif gap <= MAX_GAP_MINUTES:
                 total_gap_score += 0.5  # Acceptable gap
             else:
                 total_gap_score += 0.1  # Too long gap
@@ -50,27 +61,24 @@ class ScoreCalculator:
             total_gap_score *= 0.7  # Reduce score for too many consecutive classes
 
         return total_gap_score / (len(day_classes) - 1) if len(day_classes) > 1 else 1.0
+
+    def class_preference_bonus(self, cls: Class) -> int:
+        """Calculate the preference bonus earned by a single class."""
+        bonus = 0
+        if cls.lecturer in self.preferred_lecturers:
+            bonus += PREFERRED_LECTURER_BONUS
+        if cls.days in self.preferred_days:
+            bonus += PREFERRED_DAY_BONUS
+        if (self.preferred_start is not None and self.preferred_end is not None and
+                self.preferred_start <= cls.start_minutes <= self.preferred_end):
+            bonus += PREFERRED_TIME_BONUS
+        return bonus
     
     def calculate_preference_bonuses(self, timetable: Timetable) -> float:
         """Calculate bonuses based on user preferences."""
-        from constants import PREFERRED_LECTURER_BONUS, PREFERRED_DAY_BONUS, PREFERRED_TIME_BONUS
-        
-        bonus = 0
-        preferred_lecturers = self.user_preferences.get("preferred_lecturers", [])
-        preferred_days = self.user_preferences.get("preferred_days", [])
-        preferred_start = self.user_preferences.get("preferred_start")
-        preferred_end = self.user_preferences.get("preferred_end")
-        
-        for sc in timetable.scheduled_classes:
-            if sc.class_obj.lecturer in preferred_lecturers:
-                bonus += PREFERRED_LECTURER_BONUS
-            if sc.day in preferred_days:
-                bonus += PREFERRED_DAY_BONUS
-            if (preferred_start and preferred_end and
-                preferred_start <= sc.start_time <= preferred_end):
-                bonus += PREFERRED_TIME_BONUS
-        
-        return bonus
+        return sum(
+            self.class_preference_bonus(sc.class_obj) for sc in timetable.scheduled_classes
+        )
     
     def calculate_day_utilization_score(self, timetable: Timetable) -> float:
         """Calculate score based on how days are utilized."""
@@ -102,14 +110,10 @@ class ScoreCalculator:
             # Process consecutive streaks for multi-class days
             consecutive_streak = 1
             for i in range(1, len(day_classes)):
-                prev_end_dt = datetime.combine(
-                    datetime.today(), day_classes[i - 1].end_time
-                )
-                curr_start_dt = datetime.combine(
-                    datetime.today(), day_classes[i].start_time
-                )
-
-                if (curr_start_dt - prev_end_dt) <= timedelta(minutes=15):
+                gap = (day_classes[i].class_obj.start_minutes -
+                       day_classes[i - 1].class_obj.end_minutes)
+
+                if gap <= STREAK_GAP_MINUTES:
                     consecutive_streak += 1
                 else:
                     total_streak_score += self._score_streak(consecutive_streak)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Long-lived Timetable Engine Server
+
+Runs the timetable engine as a daemon so that requests do not pay interpreter
+start-up, DEAP/NumPy imports and DEAP type creation on every call. A pool of
+worker processes is started (and pre-warmed) once; each request is handed to
+a free worker.
+
+Protocol:
+    Newline-delimited JSON over a Unix socket or a localhost TCP socket.
+    Each request is one line holding the same document main.py reads from
+    stdin ({"classes": [...], "preferences": {...}}); each response is one
+    line holding the same document main.py writes to stdout. A connection
+    may carry several requests in sequence.
+
+    Requests may reference a stored catalogue snapshot by "catalogue_version"
+    instead of sending "classes"; {"command": "load_catalogue", ...} stores a
+    new version (see main.py). Snapshots live in --catalogue-dir (a temporary
+    directory by default), which --catalogue files are preloaded into.
+
+    A request with "stream": true is answered like main.py's streaming mode:
+    {"event": "progress", ...} lines while the search runs, then one
+    {"event": "result", ...} line. Closing the connection cancels the search.
+
+Usage:
+    python server.py --socket /tmp/timetable-engine.sock --workers 4
+    python server.py --port 8765 --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from main import handle_request
+from metrics import RequestMetrics
+from snapshot import SnapshotStore, configure_store
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+DEFAULT_REQUEST_TIMEOUT = 120  # Seconds before a stuck generation is abandoned
+STREAM_POLL_INTERVAL = 0.1  # Seconds between checks for a finished streaming request
+
+
+def warm_worker(catalogue_dir: Optional[str] = None):
+    """
+    Pool initializer: pay the heavy imports once per worker process.
+
+    Shared by the engine server's pool and the job worker's (worker.py).
+    """
+    # Importing the GA module pulls in DEAP and NumPy and registers the
+    # DEAP creator types, which is the bulk of main.py's cold-start cost.
+    import genetic_algorithm  # noqa: F401
+    # Every worker reads and writes catalogue snapshots in the same directory
+    if catalogue_dir:
+        configure_store(catalogue_dir)
+    # Workers are stopped by the parent; let it handle Ctrl+C.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _ping(_: int = 0) -> int:
+    return os.getpid()
+
+
+def _stream_request(input_data: Any, events, cancel, metrics: Optional[RequestMetrics] = None):
+    """Pool task: run a request, forwarding its progress events to a queue."""
+    return handle_request(input_data, events.put, cancel, metrics)
+
+
+class EngineServer:
+    """Owns the worker pool and runs requests against it."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS,
+                 request_timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+                 max_tasks_per_worker: Optional[int] = None,
+                 catalogue_dir: Optional[str] = None,
+                 catalogue_files: Sequence[str] = ()):
+        self.workers = workers
+        self.request_timeout = request_timeout
+        # Shared by the workers so a snapshot stored by one is seen by all
+        self.snapshots = SnapshotStore(catalogue_dir)
+        self._temporary_catalogue_dir = catalogue_dir is None
+        for path in catalogue_files:
+            snapshot = self.snapshots.add_file(path)
+            print(f"Loaded catalogue {snapshot.version} ({len(snapshot)} classes)", file=sys.stderr)
+        self.pool = multiprocessing.Pool(
+            processes=workers,
+            initializer=warm_worker,
+            initargs=(self.snapshots.directory,),
+            maxtasksperchild=max_tasks_per_worker,
+        )
+        # Block until every worker has finished its imports so the first
+        # real request does not pay for them.
+        self.pool.map(_ping, range(workers), chunksize=1)
+        # Carries progress events and cancellation between the request
+        # threads and the workers; started on the first request
+        self._manager = None
+        self._manager_lock = threading.Lock()
+
+    def _cancel_event(self):
+        """A cancellation event the request thread can set and a worker can see."""
+        with self._manager_lock:
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+        return self._manager.Event()
+
+    def handle(self, input_data: Any,
+               metrics: Optional[RequestMetrics] = None) -> Dict[str, Any]:
+        """Run one request on the pool and return the output document."""
+        cancel = self._cancel_event()
+        try:
+            output, _ = self.pool.apply_async(handle_request, (input_data, None, cancel, metrics)).get(
+                self.request_timeout
+            )
+        except multiprocessing.TimeoutError:
+            # Stop the abandoned search so its worker is free for the next request
+            cancel.set()
+            output = {
+                "status": "error",
+                "message": "Timetable generation timed out.",
+            }
+        except Exception as e:
+            # Unexpected failure inside the worker (the stdin mode would have
+            # crashed with a traceback); report it without killing the server.
+            output = {"status": "error", "message": f"Engine failure: {e}"}
+        return output
+
+    def handle_stream(self, input_data: Any, emit: Callable[[Dict[str, Any]], bool],
+                      metrics: Optional[RequestMetrics] = None) -> Dict[str, Any]:
+        """
+        Run one request on the pool, passing its progress events to emit.
+
+        emit returns False once the client has gone away, which cancels the
+        search. Returns the output document.
+        """
+        cancel = self._cancel_event()
+        events = self._manager.Queue()
+        result = self.pool.apply_async(_stream_request, (input_data, events, cancel, metrics))
+        deadline = (time.monotonic() + self.request_timeout
+                    if self.request_timeout is not None else None)
+
+        while True:
+            try:
+                event = events.get(timeout=STREAM_POLL_INTERVAL)
+            except queue.Empty:
+                if result.ready() and events.empty():
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    cancel.set()
+                    return {"status": "error", "message": "Timetable generation timed out."}
+                continue
+            if not cancel.is_set() and not emit(event):
+                cancel.set()
+
+        try:
+            output, _ = result.get()
+        except Exception as e:
+            output = {"status": "error", "message": f"Engine failure: {e}"}
+        return output
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+        if self._manager is not None:
+            self._manager.shutdown()
+        if self._temporary_catalogue_dir:
+            shutil.rmtree(self.snapshots.directory, ignore_errors=True)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads newline-delimited JSON requests and writes one response each."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            metrics = RequestMetrics()
+            try:
+                with metrics.phase("parse"):
+                    input_data = json.loads(line)
+            except json.JSONDecodeError as e:
+                output = {"status": "error", "message": str(e)}
+            else:
+                if isinstance(input_data, dict) and input_data.get("stream"):
+                    output = self.server.engine.handle_stream(input_data, self.write, metrics)
+                    output = {"event": "result", **output}
+                else:
+                    output = self.server.engine.handle(input_data, metrics)
+            if not self.write(output):
+                return
+
+    def write(self, document: Dict[str, Any]) -> bool:
+        """Send one JSON line; False if the client has disconnected."""
+        try:
+            # Responses are single lines, so skip the separator spaces too
+            self.wfile.write(json.dumps(document, separators=(",", ":")).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            return True
+        except (BrokenPipeError, ConnectionResetError):
+            return False
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def create_server(engine: EngineServer, socket_path: Optional[str] = None,
+                  host: str = "127.0.0.1", port: Optional[int] = None):
+    """Bind a threaded socket server in front of the engine."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixServer(socket_path, _RequestHandler)
+    elif port is not None:
+        server = _TCPServer((host, port), _RequestHandler)
+    else:
+        raise ValueError("Either a socket path or a port is required.")
+    server.engine = engine
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timetable engine server")
+    parser.add_argument("--socket", help="Unix socket path to listen on")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (with --port)")
+    parser.add_argument("--port", type=int, help="TCP port to listen on")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Number of pre-warmed engine worker processes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                        help="Per-request timeout in seconds")
+    parser.add_argument("--max-tasks-per-worker", type=int, default=None,
+                        help="Recycle a worker after this many requests")
+    parser.add_argument("--catalogue-dir", default=None,
+                        help="Directory for catalogue snapshots (default: a temporary directory)")
+    parser.add_argument("--catalogue", action="append", default=[],
+                        help="Catalogue export (.json) or seeder CSV to preload; repeatable")
+    args = parser.parse_args()
+
+    if not args.socket and args.port is None:
+        parser.error("one of --socket or --port is required")
+
+    engine = EngineServer(args.workers, args.timeout, args.max_tasks_per_worker,
+                          args.catalogue_dir, args.catalogue)
+    server = create_server(engine, args.socket, args.host, args.port)
+    address = args.socket or f"{args.host}:{args.port}"
+    print(f"Timetable engine listening on {address} with {args.workers} workers",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        engine.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Versioned catalogue snapshots.
+
+Sending the whole section list with every request means PHP encodes, and the
+engine parses, hundreds of rows per call. A long-lived engine instead keeps
+the catalogue as a snapshot: parsed once into a SectionCatalogue (catalogue.py),
+so thousands of sections stay a handful of flat arrays, and identified by the
+catalogue version Laravel keeps (Section::catalogueVersion()). A
+request then sends only {"catalogue_version": ..., "preferences": ...} and the
+engine selects the sections the controller would have sent.
+
+Snapshots are written to a directory as JSON exports
+({"version": ..., "classes": [...]} or "class_columns", as a request carries them),
+so every engine process can load a version the first time it sees it. A
+process keeps the most recent SNAPSHOT_CACHE_SIZE versions in memory.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from models import Class, time_to_minutes
+from catalogue import SectionCatalogue
+from data_loader import load_classes_from_csv, load_catalogue_from_document
+from constants import SNAPSHOT_CACHE_SIZE
+
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class UnknownCatalogueVersion(ValueError):
+    """A request referenced a catalogue version this engine does not have."""
+    code = "unknown_catalogue_version"
+
+
+class CatalogueSnapshot:
+    """One catalogue version's sections, held as a SectionCatalogue."""
+
+    def __init__(self, version: str, catalogue: SectionCatalogue):
+        self.version = version
+        self.catalogue = catalogue
+
+    def __len__(self) -> int:
+        return len(self.catalogue)
+
+    def select(self, preferences: Dict[str, Any]) -> List[Class]:
+        """
+        The classes of the preferred subjects that pass the controller's filters.
+
+        Mirrors GeneratedTimetableController::generateAvailableSections: a
+        class must belong to a preferred subject, fall on a preferred day (when
+        any are given), inside the preferred start/end window and be taught by
+        a preferred lecturer (when any are given). Like the controller's query,
+        subjects and lecturers are matched by db id ("subject_ids" and
+        "lecturer_ids") when both the request and the export carry them, so
+        renamed or same-named subjects and lecturers select the right sections;
+        otherwise by name. Expects parsed preferences (see
+        main.parse_time_preferences).
+        """
+        catalogue = self.catalogue
+        start = preferences.get("preferred_start")
+        end = preferences.get("preferred_end")
+        lecturers = lecturer_db_ids = None
+        if catalogue.has_db_ids and preferences.get("subject_ids") is not None:
+            section_ids = catalogue.sections_for_subject_db_ids(preferences["subject_ids"])
+            lecturer_db_ids = preferences.get("lecturer_ids")
+        else:
+            section_ids = catalogue.sections_for_subjects(preferences.get("subjects", ()))
+            lecturers = preferences.get("preferred_lecturers")
+        return catalogue.classes_where(
+            section_ids,
+            days=preferences.get("preferred_days"),
+            start=None if start is None else time_to_minutes(start),
+            end=None if end is None else time_to_minutes(end),
+            lecturers=lecturers,
+            lecturer_db_ids=lecturer_db_ids,
+        )
+
+
+def load_snapshot_file(path: str, version: Optional[str] = None) -> CatalogueSnapshot:
+    """Load a JSON export, or a CSV in the seeder format (version defaults to the file name)."""
+    if path.endswith(".csv"):
+        catalogue = SectionCatalogue.from_classes(load_classes_from_csv(path))
+    else:
+        with open(path, encoding="utf-8") as file:
+            export = json.load(file)
+        version = version or export.get("version")
+        catalogue = load_catalogue_from_document(export)
+    if not version:
+        version = os.path.splitext(os.path.basename(path))[0]
+    return CatalogueSnapshot(str(version), catalogue)
+
+
+class SnapshotStore:
+    """Catalogue snapshots on disk, with the most recent ones kept in memory."""
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_snapshots: int = SNAPSHOT_CACHE_SIZE):
+        self.directory = directory or tempfile.mkdtemp(prefix="timetable-catalogue-")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, CatalogueSnapshot]" = OrderedDict()
+
+    def _path(self, version: str) -> str:
+        if not _VERSION_PATTERN.match(version):
+            raise ValueError(f"Invalid catalogue version '{version}'.")
+        return os.path.join(self.directory, f"catalogue-{version}.json")
+
+    def _remember(self, snapshot: CatalogueSnapshot):
+        self._snapshots[snapshot.version] = snapshot
+        self._snapshots.move_to_end(snapshot.version)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+
+    def put(self, version: str, export: Dict[str, Any]) -> CatalogueSnapshot:
+        """Store a catalogue export ("classes" or "class_columns") for every engine process."""
+        path = self._path(version)
+        snapshot = CatalogueSnapshot(version, load_catalogue_from_document(export))
+        classes_key = "class_columns" if export.get("class_columns") is not None else "classes"
+        # Write then rename, so readers never see a partial file
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"version": version, classes_key: export[classes_key]}, file)
+        os.replace(temporary, path)
+        self._remember(snapshot)
+        return snapshot
+
+    def get(self, version: str) -> CatalogueSnapshot:
+        """The snapshot for a version; UnknownCatalogueVersion if it was never stored."""
+        version = str(version)
+        snapshot = self._snapshots.get(version)
+        if snapshot is not None:
+            self._snapshots.move_to_end(version)
+            return snapshot
+        path = self._path(version)
+        if not os.path.exists(path):
+            raise UnknownCatalogueVersion(f"Unknown catalogue version '{version}'.")
+        snapshot = load_snapshot_file(path, version)
+        self._remember(snapshot)
+        return snapshot
+
+    def add_file(self, path: str) -> CatalogueSnapshot:
+        """Preload a JSON export or CSV file (for example at server start-up)."""
+        snapshot = load_snapshot_file(path)
+        if not path.endswith(".csv"):
+            shutil.copyfile(path, self._path(snapshot.version))  # Keeps its db ids
+        else:
+            with open(self._path(snapshot.version), "w", encoding="utf-8") as file:
+                json.dump({"version": snapshot.version, "classes": [
+                    _class_row(cls) for cls in snapshot.catalogue.to_classes()
+                ]}, file)
+        self._remember(snapshot)
+        return snapshot
+
+
+def _class_row(cls: Class) -> Dict[str, Any]:
+    """A Class as a JSON class row (the inverse of load_classes_from_json)."""
+    return {
+        "code": cls.code, "subject": cls.subject, "activity": cls.activity,
+        "section": cls.section, "days": cls.days,
+        "start_time": cls.start_time.strftime("%H:%M:%S"),
+        "end_time": cls.end_time.strftime("%H:%M:%S"),
+        "venue": cls.venue, "tied_to": list(cls.tied_to), "lecturer": cls.lecturer,
+    }
+
+
+# Store used by main.generate_timetable; configured once per process
+_store: Optional[SnapshotStore] = None
+
+
+def configure_store(directory: Optional[str] = None) -> SnapshotStore:
+    """Set (and return) this process's snapshot store."""
+    global _store
+    _store = SnapshotStore(directory)
+    return _store
+
+
+def get_store() -> SnapshotStore:
+    """This process's snapshot store, created on first use from TIMETABLE_CATALOGUE_DIR."""
+    if _store is None:
+        return configure_store(os.environ.get("TIMETABLE_CATALOGUE_DIR"))
+    return _store
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Timetable Generation Worker
+
+Runs queued timetable generations (POST /api/generate-timetable/jobs) outside
+the web tier, so PHP workers return immediately and generation throughput is
+bounded by engine processes rather than HTTP workers.
+
+Jobs live in the timetable_generation_jobs table. The worker claims up to
+--batch queued jobs at a time, runs them on a pool of pre-warmed engine
+processes (the same request contract as main.py and server.py), then saves
+each result as the user's new active generated_timetables row and marks the
+job completed, or marks it failed with the engine's message.
+
+Several workers may share one database: jobs are claimed inside a write
+transaction (SELECT ... FOR UPDATE SKIP LOCKED on MySQL), and a job whose
+worker died is claimed again after --retry-after seconds, up to
+--max-attempts attempts.
+
+Database settings come from the same variables as Laravel's .env:
+DB_CONNECTION (mysql or sqlite), DB_HOST, DB_PORT, DB_DATABASE, DB_USERNAME
+and DB_PASSWORD. MySQL needs the PyMySQL package.
+
+Usage:
+    python worker.py --workers 4 --batch 8
+    python worker.py --once    # Process one batch, then exit
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from main import handle_request
+from server import DEFAULT_WORKERS, warm_worker
+
+JOBS_TABLE = "timetable_generation_jobs"
+DEFAULT_QUEUE = "timetables"
+DEFAULT_RETRY_AFTER = 300  # Seconds before a running job is presumed abandoned
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 1.0  # Seconds to sleep when the queue is empty
+
+# (job id, user id, engine input document)
+Job = Tuple[int, int, Dict[str, Any]]
+
+
+def _timestamp() -> str:
+    """A Laravel timestamp column value (UTC)."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def connect(environ=os.environ):
+    """Open a DB-API connection from Laravel's DB_* settings; return (connection, dialect)."""
+    dialect = environ.get("DB_CONNECTION", "sqlite")
+    if dialect == "sqlite":
+        import sqlite3
+        path = environ.get("DB_DATABASE") or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..",
+            "database", "database.sqlite",
+        )
+        # Autocommit; JobStore opens its own transactions
+        return sqlite3.connect(path, isolation_level=None), dialect
+    if dialect in ("mysql", "mariadb"):
+        try:
+            import pymysql
+        except ImportError:
+            raise ValueError("DB_CONNECTION=mysql requires the PyMySQL package.")
+        connection = pymysql.connect(
+            host=environ.get("DB_HOST", "127.0.0.1"),
+            port=int(environ.get("DB_PORT", 3306)),
+            user=environ.get("DB_USERNAME", "root"),
+            password=environ.get("DB_PASSWORD", ""),
+            database=environ.get("DB_DATABASE", "laravel"),
+            charset="utf8mb4",
+            autocommit=True,
+        )
+        return connection, "mysql"
+    raise ValueError(f"Unsupported DB_CONNECTION '{dialect}'; expected mysql or sqlite.")
+
+
+class JobStore:
+    """Claims and settles timetable generation jobs in the application database."""
+
+    def __init__(self, connection, dialect: str, queue: str = DEFAULT_QUEUE):
+        self.connection = connection
+        self.dialect = dialect
+        self.queue = queue
+
+    def _execute(self, cursor, sql: str, params: Tuple = ()):
+        if self.dialect == "mysql":
+            sql = sql.replace("?", "%s")
+        cursor.execute(sql, params)
+        return cursor
+
+    def _begin(self, cursor):
+        # SQLite takes the database write lock up front so two workers cannot
+        # claim the same rows; MySQL locks the selected rows instead
+        self._execute(cursor, "BEGIN IMMEDIATE" if self.dialect == "sqlite" else "BEGIN")
+
+    def claim(self, limit: int, retry_after: int = DEFAULT_RETRY_AFTER,
+              max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> List[Job]:
+        """
+        Reserve up to limit jobs: queued ones, and running ones whose worker
+        has not finished them within retry_after seconds. Abandoned jobs that
+        have used up max_attempts are marked failed instead.
+        """
+        now = int(time.time())
+        lock = " FOR UPDATE SKIP LOCKED" if self.dialect == "mysql" else ""
+        cursor = self.connection.cursor()
+        self._begin(cursor)
+        try:
+            rows = self._execute(
+                cursor,
+                f"SELECT id, user_id, input, attempts FROM {JOBS_TABLE} "
+                "WHERE queue = ? AND ((status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND reserved_at <= ?)) "
+                f"ORDER BY id LIMIT ?{lock}",
+                (self.queue, now, now - retry_after, limit),
+            ).fetchall()
+
+            jobs = []
+            for job_id, user_id, input_json, attempts in rows:
+                if attempts >= max_attempts:
+                    self._execute(
+                        cursor,
+                        f"UPDATE {JOBS_TABLE} SET status = 'failed', reserved_at = NULL, "
+                        "error = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+                        ("The job was abandoned too many times.", _timestamp(), _timestamp(), job_id),
+                    )
+                    continue
+                self._execute(
+                    cursor,
+                    f"UPDATE {JOBS_TABLE} SET status = 'running', reserved_at = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (now, _timestamp(), job_id),
+                )
+                jobs.append((job_id, user_id, input_json))
+            self._execute(cursor, "COMMIT")
+        except BaseException:
+            self._execute(cursor, "ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+        claimed = []
+        for job_id, user_id, input_json in jobs:
+            try:
+                claimed.append((job_id, user_id, json.loads(input_json)))
+            except ValueError as e:
+                self.fail(job_id, f"Invalid job input: {e}")
+        return claimed
+
+    def complete(self, job_id: int, user_id: int, timetable: Dict[str, Any]) -> int:
+        """Save a timetable as the user's only active one; return its id."""
+        now = _timestamp()
+        cursor = self.connection.cursor()
+        self._begin(cursor)
+        try:
+            self._execute(
+                cursor,
+                "UPDATE generated_timetables SET active = 0, updated_at = ? WHERE user_id = ?",
+                (now, user_id),
+            )
+            self._execute(
+                cursor,
+                "INSERT INTO generated_timetables (user_id, timetable, active, created_at, updated_at) "
+                "VALUES (?, ?, 1, ?, ?)",
+                (user_id, json.dumps(timetable), now, now),
+            )
+            timetable_id = cursor.lastrowid
+            self._execute(
+                cursor,
+                f"UPDATE {JOBS_TABLE} SET status = 'completed', generated_timetable_id = ?, "
+                "reserved_at = NULL, error = NULL, finished_at = ?, updated_at = ? WHERE id = ?",
+                (timetable_id, now, now, job_id),
+            )
+            self._execute(cursor, "COMMIT")
+        except BaseException:
+            self._execute(cursor, "ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        return timetable_id
+
+    def fail(self, job_id: int, message: str):
+        now = _timestamp()
+        cursor = self.connection.cursor()
+        try:
+            self._execute(
+                cursor,
+                f"UPDATE {JOBS_TABLE} SET status = 'failed', reserved_at = NULL, "
+                "error = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+                (message, now, now, job_id),
+            )
+        finally:
+            cursor.close()
+
+
+def _run_job(job: Job) -> Tuple[int, int, Dict[str, Any]]:
+    """Pool task: run one job's engine request."""
+    job_id, user_id, input_data = job
+    try:
+        output, _ = handle_request(input_data)
+    except Exception as e:
+        # Unexpected engine failure; report it rather than killing the pool
+        output = {"status": "error", "message": f"Engine failure: {e}"}
+    return job_id, user_id, output
+
+
+class JobWorker:
+    """Owns the engine pool and settles claimed jobs as they finish."""
+
+    def __init__(self, store: JobStore, workers: int = DEFAULT_WORKERS,
+                 batch: Optional[int] = None, retry_after: int = DEFAULT_RETRY_AFTER,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.store = store
+        self.batch = batch or workers
+        self.retry_after = retry_after
+        self.max_attempts = max_attempts
+        self.pool = multiprocessing.Pool(processes=workers, initializer=warm_worker)
+        self.stopping = False
+
+    def run_once(self) -> int:
+        """Claim and run one batch of jobs; return how many were claimed."""
+        jobs = self.store.claim(self.batch, self.retry_after, self.max_attempts)
+        for job_id, user_id, output in self.pool.imap_unordered(_run_job, jobs):
+            if output.get("status") == "success" and output.get("timetable") is not None:
+                try:
+                    self.store.complete(job_id, user_id, output["timetable"])
+                except Exception as e:
+                    # complete() rolled back; fail this job rather than the whole batch
+                    message = f"Could not save the timetable: {e}"
+                else:
+                    print(f"Job {job_id}: completed", file=sys.stderr)
+                    continue
+            else:
+                message = output.get("message") or "No timetable could be generated."
+            self.store.fail(job_id, message)
+            print(f"Job {job_id}: failed ({message})", file=sys.stderr)
+        return len(jobs)
+
+    def run(self, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """Process batches until stop() is called, sleeping while the queue is empty."""
+        while not self.stopping:
+            if not self.run_once():
+                time.sleep(poll_interval)
+
+    def stop(self, *_):
+        """Finish the current batch, then return from run()."""
+        self.stopping = True
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued timetable generations.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Engine processes (default: {DEFAULT_WORKERS}).")
+    parser.add_argument("--batch", type=int, default=None,
+                        help="Jobs claimed at a time (default: --workers).")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE, help="Queue name to take jobs from.")
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_RETRY_AFTER,
+                        help="Seconds before an unfinished running job is claimed again.")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="Claims allowed per job before it is marked failed.")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Seconds to wait when the queue is empty.")
+    parser.add_argument("--once", action="store_true", help="Process one batch, then exit.")
+    args = parser.parse_args()
+
+    try:
+        connection, dialect = connect()
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    worker = JobWorker(JobStore(connection, dialect, args.queue), workers=args.workers,
+                       batch=args.batch, retry_after=args.retry_after,
+                       max_attempts=args.max_attempts)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    print(f"Timetable worker started with {args.workers} engine processes", file=sys.stderr)
+    try:
+        if args.once:
+            worker.run_once()
+        else:
+            worker.run(args.poll_interval)
+    finally:
+        worker.close()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -60,9 +60,10 @@ def main():
         # 3. Convert time strings in preferences to time objects
         user_prefs = parse_time_preferences(user_prefs)
 
-        # 4. Generate the timetable
+        # 4. Generate the timetable (population and generations are sized
+        # from the search space)
         generator = TimetableGenerator(classes, user_prefs)
-        best_timetable = generator.run(generations=150, pop_size=500)
+        best_timetable = generator.run()
 
         # 5. Format and print the output
         output_json = format_timetable_as_json(best_timetable)
@@ -0,0 +1,241 @@
+"""
+Benchmark Suite for TimetableEngine
+
+Runs three benchmarks over a grid of seeded synthetic catalogues
+(synthetic_catalogue.py) that scale subjects, sections per subject, tied
+tutorials and clash density:
+
+- load:   load_classes_from_json - rows/second and peak memory
+- score:  ScoreCalculator over prebuilt clash-free timetables - evaluations/second
+          and peak memory
+- run:    TimetableGenerator.run (GA engine, cold fitness cache, no stagnation
+          or convergence stop, so every run spends its whole generation
+          budget) - evaluations/second,
+          time to the first feasible timetable, time to the best one, total
+          time, best fitness and peak memory
+
+Times are the best of --repeat runs; peak memory is measured in a separate
+tracemalloc pass so it does not slow the timed runs. Results can be saved with
+--save and compared with an earlier save with --baseline, which flags every
+metric that got worse by more than --tolerance.
+
+--ga-core picks the GA core the run benchmark uses (see TimetableGenerator).
+
+Run with: python3 benchmark_suite.py [--quick] [--repeat N] [--save FILE]
+                                     [--baseline FILE] [--tolerance 0.25]
+                                     [--ga-core deap|numpy]
+"""
+
+import sys
+import os
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+from unittest import mock
+
+# Add the TimetableEngine directory to the path (its modules use flat imports)
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TimetableEngine"
+))
+
+from adaptive import ConvergenceMonitor
+from data_loader import load_classes_from_json
+from genetic_algorithm import TimetableGenerator
+from models import Timetable
+from constants import BASE_SCORE, GA_CORES
+
+from synthetic_catalogue import make_catalogue, make_preferences
+
+# (name, catalogue subjects, sections per subject, tutorials per lecture,
+#  clash density, subjects the student takes)
+SCENARIOS = [
+    ("small", 4, 3, 2, 0.3, 4),
+    ("wide", 12, 4, 1, 0.3, 6),
+    ("no-tutorials", 12, 4, 0, 0.3, 8),
+    ("clashing", 12, 4, 1, 0.6, 4),
+    ("large", 40, 8, 2, 0.3, 5),
+]
+QUICK_SCENARIOS = SCENARIOS[:2]
+
+CATALOGUE_SUBJECTS = 400  # Subjects in the catalogue parsed by the load benchmark
+SCORE_SAMPLES = 2000  # Timetables scored by the score benchmark
+
+# Whether a larger value of each metric is better, for --baseline
+HIGHER_IS_BETTER = {
+    "rows_per_s": True, "evals_per_s": True, "best_fitness": True,
+    "first_feasible_ms": False, "best_ms": False, "total_ms": False, "peak_kib": False,
+}
+
+
+def best_of(repeat: int, function: Callable[[], Any]) -> Tuple[float, Any]:
+    """Fastest of repeat calls, in seconds, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_kib(function: Callable[[], Any]) -> float:
+    """Peak traced memory of one call, in KiB."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_load(rows: List[Dict], repeat: int) -> Dict[str, float]:
+    seconds, _ = best_of(repeat, lambda: load_classes_from_json(rows))
+    return {"rows_per_s": len(rows) / seconds,
+            "peak_kib": peak_kib(lambda: load_classes_from_json(rows))}
+
+
+def bench_score(rows: List[Dict], preferences: Dict, repeat: int) -> Dict[str, float]:
+    generator = TimetableGenerator(load_classes_from_json(rows), preferences, engine="ga")
+    calculator = generator.score_calculator
+    random.seed(0)
+
+    # Random clash-free timetables, built up front so only scoring is timed
+    timetables = []
+    for _ in range(SCORE_SAMPLES * 20):
+        genes = generator.toolbox.individual()
+        section_ids = generator._decode_section_ids(genes)
+        if generator.is_feasible(section_ids):
+            timetable = Timetable()
+            for section_id in section_ids:
+                timetable.add_section(generator.candidate_sections[section_id])
+            timetables.append(timetable)
+            if len(timetables) == SCORE_SAMPLES:
+                break
+    if not timetables:
+        return {}
+
+    def score_all():
+        for timetable in timetables:
+            (BASE_SCORE
+             + calculator.calculate_day_utilization_score(timetable)
+             + calculator.calculate_preference_bonuses(timetable)
+             + calculator.calculate_gap_scores(timetable)
+             + calculator.calculate_streak_scores(timetable))
+
+    seconds, _ = best_of(repeat, score_all)
+    return {"evals_per_s": len(timetables) / seconds, "peak_kib": peak_kib(score_all)}
+
+
+def bench_run(rows: List[Dict], preferences: Dict, repeat: int,
+              ga_core: str = "deap") -> Dict[str, float]:
+    classes = load_classes_from_json(rows)
+    results = []
+
+    def run_once(seed: int) -> Dict[str, float]:
+        generator = TimetableGenerator(classes, preferences, engine="ga", seed=seed,
+                                       ga_core=ga_core)
+        marks = {}
+
+        def on_progress(event):
+            elapsed = (time.perf_counter() - start) * 1000
+            if event["best"] > 0:
+                marks.setdefault("first_feasible_ms", elapsed)
+            if event["timetable"] is not None:
+                marks["best_ms"] = elapsed  # The best improved
+
+        # The convergence stop would end each run after a different number of generations
+        with mock.patch.object(ConvergenceMonitor, "update", return_value=None):
+            start = time.perf_counter()
+            generator.run(progress_callback=on_progress)
+            total = time.perf_counter() - start
+        evaluations = generator.run_stats["fitness_cache"]["misses"]
+        return dict(marks, total_ms=total * 1000, evals_per_s=evaluations / total,
+                    best_fitness=generator._reported_best)
+
+    for seed in range(repeat):
+        results.append(run_once(seed))
+    result = {
+        "total_ms": min(r["total_ms"] for r in results),
+        "evals_per_s": max(r["evals_per_s"] for r in results),
+        "best_fitness": max(r["best_fitness"] for r in results),
+    }
+    for mark in ("first_feasible_ms", "best_ms"):
+        times = [r[mark] for r in results if mark in r]
+        if times:
+            result[mark] = min(times)
+    result["peak_kib"] = peak_kib(lambda: run_once(0))
+    return result
+
+
+def run_suite(scenarios, repeat: int, ga_core: str = "deap") -> Dict[str, Dict[str, float]]:
+    """Every benchmark of every scenario, keyed "benchmark/scenario"."""
+    results = {}
+    catalogue = make_catalogue(CATALOGUE_SUBJECTS, seed=1)
+    results["load/catalogue"] = bench_load(catalogue, repeat)
+    _print_result("load/catalogue", results["load/catalogue"])
+
+    for name, subjects, sections, tutorials, density, taken in scenarios:
+        rows = make_catalogue(subjects, sections, tutorials, density, seed=1)
+        # Without tutorials there is nothing to tie
+        preferences = make_preferences(rows, taken, enforce_ties=tutorials > 0)
+        results[f"score/{name}"] = bench_score(rows, dict(preferences), repeat)
+        _print_result(f"score/{name}", results[f"score/{name}"])
+        results[f"run/{name}"] = bench_run(rows, dict(preferences), repeat, ga_core)
+        _print_result(f"run/{name}", results[f"run/{name}"])
+    return results
+
+
+def _print_result(key: str, metrics: Dict[str, float]):
+    if not metrics:
+        print(f"{key:<22} (no clash-free timetable)")
+        return
+    print(f"{key:<22} " + "  ".join(f"{name} {value:,.1f}" for name, value in metrics.items()))
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that are worse than the baseline by more than tolerance."""
+    regressions = []
+    for key, metrics in results.items():
+        for name, value in metrics.items():
+            before = baseline.get(key, {}).get(name)
+            if not before:
+                continue
+            change = (value - before) / before
+            if (change < -tolerance) if HIGHER_IS_BETTER[name] else (change > tolerance):
+                regressions.append(f"{key} {name}: {before:,.1f} -> {value:,.1f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the timetable engine.")
+    parser.add_argument("--quick", action="store_true", help="Only the smallest scenarios.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement.")
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with results saved earlier.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative change reported as a regression.")
+    parser.add_argument("--ga-core", choices=GA_CORES, default="deap",
+                        help="GA core for the run benchmark.")
+    args = parser.parse_args()
+
+    print(f"⏱️  TimetableEngine benchmark suite (best of {args.repeat})")
+    print("=" * 60)
+    results = run_suite(QUICK_SCENARIOS if args.quick else SCENARIOS, args.repeat, args.ga_core)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        print(f"\nRegressions beyond {args.tolerance:.0%}: {len(regressions)}")
+        for line in regressions:
+            print(f"  {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+CSV Ingestion Benchmark for TimetableEngine
+
+Measures rows/second for loading a large seeder-format catalogue with:
+
+- legacy:    the previous loader (csv.DictReader, two strptime calls per time)
+- streaming: the current load_classes_from_csv (csv.reader, memoized parse_clock)
+
+The catalogue is database/seeders/classes.csv repeated the given number of
+times (100 by default) in a temporary file. Both loaders must produce the
+same classes.
+
+Run with: python3 csv_benchmark.py [copies] [repeats]
+"""
+
+import sys
+import os
+import csv
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+# Add the TimetableEngine directory to the path (its modules use flat imports)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "TimetableEngine"))
+
+from data_loader import load_classes_from_csv, parse_clock, _intern
+from models import Class
+
+CLASSES_CSV = os.path.join(ROOT, "..", "..", "..", "database", "seeders", "classes.csv")
+
+
+def legacy_load_classes_from_csv(filename: str) -> List[Class]:
+    """The previous loader, kept here as the baseline."""
+    classes = []
+    with open(filename, mode="r", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            try:
+                start_time = (
+                    datetime.strptime(row["Start Time"], "%I:%M %p").time()
+                    if "AM" in row["Start Time"] or "PM" in row["Start Time"]
+                    else datetime.strptime(row["Start Time"], "%H:%M").time()
+                )
+                end_time = (
+                    datetime.strptime(row["End Time"], "%I:%M %p").time()
+                    if "AM" in row["End Time"] or "PM" in row["End Time"]
+                    else datetime.strptime(row["End Time"], "%H:%M").time()
+                )
+                tied_to_str = row.get("Tied To", "")
+                tied_to_list = [s.strip() for s in tied_to_str.split(",") if s.strip()]
+                classes.append(
+                    Class(
+                        code=_intern(row["Code"]),
+                        subject=_intern(row["subject"]),
+                        activity=_intern(row["Activity"]),
+                        section=_intern(row["Section"]),
+                        days=_intern(row["Days"]),
+                        start_time=start_time,
+                        end_time=end_time,
+                        venue=_intern(row["Venue"]),
+                        tied_to=[_intern(s) for s in tied_to_list],
+                        lecturer=_intern(row["Lecturer"]) if row["Lecturer"] else "Not Assigned",
+                    )
+                )
+            except (ValueError, KeyError) as e:
+                print(f"Skipping row due to error: {e} in row {row}", file=sys.stderr)
+                continue
+    return classes
+
+
+def write_catalogue(path: str, copies: int) -> int:
+    """Write classes.csv repeated copies times; return the number of rows."""
+    with open(CLASSES_CSV, encoding="utf-8", newline="") as source:
+        header, *rows = list(csv.reader(source))
+    with open(path, "w", encoding="utf-8", newline="") as target:
+        writer = csv.writer(target)
+        writer.writerow(header)
+        for _ in range(copies):
+            writer.writerows(rows)
+    return len(rows) * copies
+
+
+def best_time(load, path: str, repeats: int):
+    """Best wall time of repeats loads (cold memo each time); return (seconds, classes)."""
+    best, classes = float("inf"), None
+    for _ in range(repeats):
+        parse_clock.cache_clear()
+        start = time.perf_counter()
+        classes = load(path)
+        best = min(best, time.perf_counter() - start)
+    return best, classes
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalogue.csv")
+        rows = write_catalogue(path, copies)
+        print(f"📥 CSV ingestion benchmark ({rows} rows, best of {repeats})")
+        print("=" * 60)
+
+        results = {}
+        for label, load in (("legacy", legacy_load_classes_from_csv),
+                            ("streaming", load_classes_from_csv)):
+            seconds, classes = best_time(load, path, repeats)
+            results[label] = classes
+            print(f"{label:>10}: {seconds * 1000:8.1f} ms  {rows / seconds:12,.0f} rows/s")
+
+    same = len(results["legacy"]) == len(results["streaming"]) and all(
+        getattr(a, slot) == getattr(b, slot)
+        for a, b in zip(results["legacy"], results["streaming"])
+        for slot in Class.__slots__
+    )
+    print(f"\nIdentical classes: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Memory Benchmark for TimetableEngine Catalogues
+
+Measures how much memory (and how many GC-tracked objects) a loaded class
+catalogue retains in three layouts:
+
+- legacy:    the previous per-instance __dict__ dataclass with un-interned strings
+- classes:   the current slotted Class objects with interned strings
+- catalogue: the struct-of-arrays SectionCatalogue
+
+Run with: python3 memory_benchmark.py [rows]
+"""
+
+import sys
+import os
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import List
+
+# Add the TimetableEngine directory to the path (its modules use flat imports)
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TimetableEngine"
+))
+
+from data_loader import load_classes_from_json
+from catalogue import SectionCatalogue
+from models import DAY_INDEX, occupancy_mask
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+@dataclass
+class LegacyClass:
+    """The previous Class layout: a regular dataclass with a __dict__."""
+    code: str
+    subject: str
+    activity: str
+    section: str
+    days: str
+    start_time: time
+    end_time: time
+    venue: str
+    tied_to: List[str]
+    lecturer: str
+
+    def __post_init__(self):
+        self.start_minutes = self.start_time.hour * 60 + self.start_time.minute
+        self.end_minutes = self.end_time.hour * 60 + self.end_time.minute
+        self.day_index = DAY_INDEX.get(self.days, -1)
+        self.occupancy = occupancy_mask(self.day_index, self.start_minutes, self.end_minutes)
+
+
+def load_legacy(rows):
+    return [
+        LegacyClass(
+            code=row["code"], subject=row["subject"], activity=row["activity"],
+            section=row["section"], days=row["days"],
+            start_time=datetime.strptime(row["start_time"], "%H:%M:%S").time(),
+            end_time=datetime.strptime(row["end_time"], "%H:%M:%S").time(),
+            venue=row["venue"], tied_to=row.get("tied_to", []), lecturer=row["lecturer"],
+        )
+        for row in rows
+    ]
+
+
+def make_rows(count: int) -> str:
+    """A JSON catalogue of roughly `count` rows with realistic repetition."""
+    rows = []
+    subject = 0
+    while len(rows) < count:
+        for lecture in range(3):
+            hour = 8 + (subject + lecture) % 9
+            rows.append({
+                "code": f"SUB{subject:04d}", "subject": f"Subject {subject}",
+                "activity": "Lecture", "section": f"L{lecture}",
+                "days": DAYS[(subject + lecture) % 5],
+                "start_time": f"{hour:02d}:00:00", "end_time": f"{hour + 2:02d}:00:00",
+                "venue": f"LT{subject % 40}", "tied_to": [f"T{lecture}a", f"T{lecture}b"],
+                "lecturer": f"Lecturer {subject % 150}",
+            })
+            for tutorial in "ab":
+                hour = 8 + (subject * 3 + lecture) % 10
+                rows.append({
+                    "code": f"SUB{subject:04d}", "subject": f"Subject {subject}",
+                    "activity": "Tutorial", "section": f"T{lecture}{tutorial}",
+                    "days": DAYS[(subject + lecture + 2) % 5],
+                    "start_time": f"{hour:02d}:00:00", "end_time": f"{hour + 1:02d}:00:00",
+                    "venue": f"TR{subject % 60}", "tied_to": [],
+                    "lecturer": f"Tutor {subject % 200}",
+                })
+        subject += 1
+    # Round-trip through JSON so strings are distinct objects, as on the wire
+    return json.dumps(rows[:count])
+
+
+def measure(build):
+    """Return (bytes retained, GC-tracked objects created) by build()."""
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects_after = len(gc.get_objects())
+    return result, retained, objects_after - objects_before
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    payload = make_rows(count)
+    print(f"📦 Catalogue memory benchmark ({count} class rows)")
+    print("=" * 60)
+
+    _, legacy_bytes, legacy_objects = measure(lambda: load_legacy(json.loads(payload)))
+    classes, class_bytes, class_objects = measure(lambda: load_classes_from_json(json.loads(payload)))
+    _, catalogue_bytes, catalogue_objects = measure(lambda: SectionCatalogue.from_classes(classes))
+
+    results = [
+        ("legacy", legacy_bytes, legacy_objects),
+        ("classes", class_bytes, class_objects),
+        ("catalogue", catalogue_bytes, catalogue_objects),
+    ]
+    for name, retained, objects in results:
+        print(f"{name:>10}: {retained / 1024:10.1f} KiB  "
+              f"{retained / count:7.1f} B/row  {objects:8d} GC objects")
+
+    print(f"\nSlotted classes use {class_bytes / legacy_bytes:.0%} of the legacy memory; "
+          f"the catalogue uses {catalogue_bytes / legacy_bytes:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Seeded synthetic class catalogues for TimetableEngine benchmarks.
+
+make_catalogue builds engine class rows (the JSON format the controller sends)
+whose shape is controlled directly:
+
+- subjects:      number of subjects
+- sections:      lecture sections per subject
+- tutorials:     tutorials tied to each lecture (0 for lecture-only subjects)
+- clash_density: 0..1; how crowded the week is. Classes are placed in a
+                 share of the 25 two-hour weekday slots that shrinks as the
+                 density grows, so more of them overlap.
+
+The same arguments and seed always give the same rows.
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+SLOT_STARTS = [8, 10, 12, 14, 16]  # Two-hour slots per day
+SLOTS = [(day, hour) for day in DAYS for hour in SLOT_STARTS]
+
+
+def make_catalogue(subjects: int, sections: int = 3, tutorials: int = 2,
+                   clash_density: float = 0.3, seed: int = 0) -> List[Dict[str, Any]]:
+    """Engine class rows for a synthetic catalogue (see the module docstring)."""
+    if not 0 <= clash_density <= 1:
+        raise ValueError("clash_density must be between 0 and 1.")
+    rng = random.Random(seed)
+    slots = rng.sample(SLOTS, max(1, round(len(SLOTS) * (1 - clash_density))))
+    lecturers = max(1, subjects * sections // 2)
+
+    rows = []
+    for subject in range(subjects):
+        code = f"SYN{subject:04d}"
+        for lecture in range(sections):
+            tutorial_names = [f"T{lecture}{chr(97 + t)}" for t in range(tutorials)]
+            day, hour = rng.choice(slots)
+            rows.append(_row(code, f"Subject {subject}", "Lecture", f"L{lecture}", day,
+                             hour, 2, f"LT{rng.randrange(40)}", tutorial_names,
+                             f"Lecturer {rng.randrange(lecturers)}"))
+            for name in tutorial_names:
+                day, hour = rng.choice(slots)
+                rows.append(_row(code, f"Subject {subject}", "Tutorial", name, day,
+                                 hour + rng.randrange(2), 1, f"TR{rng.randrange(60)}", [],
+                                 f"Tutor {rng.randrange(lecturers * 2)}"))
+    return rows
+
+
+def _row(code, subject, activity, section, day, hour, length, venue, tied_to, lecturer):
+    return {
+        "code": code, "subject": subject, "activity": activity, "section": section,
+        "days": day, "start_time": f"{hour:02d}:00:00",
+        "end_time": f"{hour + length:02d}:00:00", "venue": venue,
+        "tied_to": tied_to, "lecturer": lecturer,
+    }
+
+
+def make_preferences(rows: List[Dict[str, Any]], subjects: Optional[int] = None,
+                     style: str = "compact", enforce_ties: bool = True) -> Dict[str, Any]:
+    """Engine preferences choosing the first `subjects` subjects of a catalogue (all by default)."""
+    names = list(dict.fromkeys(row["subject"] for row in rows))
+    return {
+        "subjects": names[:subjects] if subjects else names,
+        "schedule_style": style,
+        "enforce_ties": enforce_ties,
+        "preferred_days": DAYS[:3],
+        "preferred_lecturers": [],
+    }
@@ -0,0 +1,319 @@
+"""
+Engine Server Test Suite
+
+Tests the long-lived engine server (TimetableEngine/server.py) speaks the same
+JSON contract as the stdin mode of main.py.
+"""
+
+import sys
+import os
+import json
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add the TimetableEngine directory to the path (its modules use flat imports)
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TimetableEngine"
+))
+
+from server import EngineServer, create_server
+
+ENGINE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TimetableEngine"
+)
+HEAVY_MODULES = ("deap", "numpy", "genetic_algorithm")
+STARTUP_BUDGET_MS = 200  # Cumulative `import main` time; it was ~290 ms with eager imports
+
+
+SAMPLE_INPUT = {
+    "classes": [
+        {
+            "code": "CS101", "subject": "Computer Science", "activity": "Lecture", "section": "A",
+            "days": "Monday", "start_time": "09:00:00", "end_time": "10:00:00",
+            "venue": "LT1", "tied_to": ["T1"], "lecturer": "Dr. Smith"
+        },
+        {
+            "code": "CS101", "subject": "Computer Science", "activity": "Tutorial", "section": "T1",
+            "days": "Tuesday", "start_time": "14:00:00", "end_time": "15:00:00",
+            "venue": "TR1", "tied_to": [], "lecturer": "TA Johnson"
+        }
+    ],
+    "preferences": {
+        "subjects": ["Computer Science"],
+        "schedule_style": "compact",
+        "enforce_ties": True,
+        "preferred_days": [],
+        "preferred_lecturers": [],
+        "preferred_start": "08:00:00",
+        "preferred_end": "18:00:00"
+    }
+}
+
+
+def _slow_request(input_data, progress=None, cancel_event=None, metrics=None):
+    """Stands in for main.handle_request: {"slow": true} runs until cancelled."""
+    if input_data.get("slow"):
+        stop = time.monotonic() + 30
+        while not cancel_event.is_set() and time.monotonic() < stop:
+            time.sleep(0.01)
+    return {"status": "success"}, 0
+
+
+def large_input() -> dict:
+    """
+    A clash-free request whose search space (8 ** 5 timetables) is above
+    EXACT_SOLVER_MAX_SPACE, so engine "auto" runs the genetic algorithm.
+    """
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    classes = []
+    for s in range(5):
+        for n in range(8):
+            classes.append({
+                "code": f"S{s}", "subject": f"Subject {s}", "activity": "Lecture",
+                "section": f"L{n}", "days": days[n % 5], "start_time": f"{8 + s:02d}:00:00",
+                "end_time": f"{9 + s:02d}:00:00", "venue": "LT", "tied_to": [f"T{n}"],
+                "lecturer": f"Lecturer {n}"
+            })
+            classes.append({
+                "code": f"S{s}", "subject": f"Subject {s}", "activity": "Tutorial",
+                "section": f"T{n}", "days": days[n % 5], "start_time": f"{14 + s:02d}:00:00",
+                "end_time": f"{15 + s:02d}:00:00", "venue": "TR", "tied_to": [],
+                "lecturer": f"Tutor {n}"
+            })
+    preferences = dict(SAMPLE_INPUT["preferences"], subjects=[f"Subject {s}" for s in range(5)])
+    return {"classes": classes, "preferences": preferences}
+
+
+class TestEngineServer(unittest.TestCase):
+    """Test the Unix socket engine server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.tmpdir.name, "engine.sock")
+        cls.engine = EngineServer(workers=1)
+        cls.server = create_server(cls.engine, socket_path=cls.socket_path)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.engine.close()
+        cls.tmpdir.cleanup()
+
+    def request(self, *payloads):
+        """Send newline-delimited requests on one connection, return responses."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            for payload in payloads:
+                line = payload if isinstance(payload, str) else json.dumps(payload)
+                sock.sendall(line.encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as reader:
+                return [json.loads(line) for line in reader]
+
+    def test_generates_timetable(self):
+        """A valid request returns the same document main.py would print."""
+        [result] = self.request(SAMPLE_INPUT)
+
+        self.assertEqual(result["status"], "success")
+        self.assertIn("Monday", result["timetable"])
+        self.assertEqual(result["summary"]["total_classes"], 2)
+
+    def test_validation_error(self):
+        """Invalid input produces the same error document as stdin mode."""
+        [result] = self.request({"classes": [], "preferences": {}})
+
+        self.assertEqual(result["status"], "error")
+        self.assertIn("classes", result["message"])
+
+    def test_multiple_requests_per_connection(self):
+        """Requests on one connection are answered in order."""
+        results = self.request(SAMPLE_INPUT, "not json", SAMPLE_INPUT)
+
+        self.assertEqual([r["status"] for r in results], ["success", "error", "success"])
+
+    def test_deadline_option(self):
+        """deadline_ms is read from options or preferences and validated."""
+        preferences = dict(SAMPLE_INPUT["preferences"], deadline_ms=5000)
+        results = self.request(
+            dict(SAMPLE_INPUT, options={"deadline_ms": 5000}),
+            dict(SAMPLE_INPUT, preferences=preferences),
+            dict(SAMPLE_INPUT, options={"deadline_ms": "soon"}),
+        )
+
+        self.assertEqual([r["status"] for r in results], ["success", "success", "error"])
+        self.assertEqual(results[0]["stats"]["termination"], "completed")
+        self.assertIn("deadline_ms", results[2]["message"])
+
+    def test_catalogue_snapshot(self):
+        """Requests can reference a stored catalogue instead of sending classes."""
+        request = {"catalogue_version": "v1", "preferences": SAMPLE_INPUT["preferences"]}
+        [unknown] = self.request(request)
+        self.assertEqual(unknown["status"], "error")
+        self.assertEqual(unknown["code"], "unknown_catalogue_version")
+
+        load = {"command": "load_catalogue", "version": "v1", "classes": SAMPLE_INPUT["classes"]}
+        loaded, result, filtered = self.request(
+            load, request,
+            dict(request, preferences=dict(SAMPLE_INPUT["preferences"], preferred_end="12:00:00",
+                                          enforce_ties=False)),
+        )
+
+        self.assertEqual((loaded["status"], loaded["classes"]), ("success", 2))
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["summary"]["total_classes"], 2)
+        # The tutorial ends after the preferred window, as the controller would filter it
+        self.assertEqual(filtered["summary"]["total_classes"], 1)
+
+    def test_alternatives_option(self):
+        """options.alternatives adds a ranked list; invalid counts are rejected."""
+        results = self.request(
+            dict(SAMPLE_INPUT, options={"alternatives": 3}),
+            dict(SAMPLE_INPUT, options={"alternatives": 0}),
+        )
+
+        self.assertEqual([r["status"] for r in results], ["success", "error"])
+        # The sample catalogue has a single timetable
+        [only] = results[0]["alternatives"]
+        self.assertEqual((only["rank"], only["timetable"]), (1, results[0]["timetable"]))
+        self.assertIn("alternatives", results[1]["message"])
+
+    def test_ga_core_option(self):
+        """options.ga_core picks the GA core; unknown cores are rejected."""
+        from constants import EXACT_SOLVER_MAX_SPACE
+        self.assertGreater(8 ** 5, EXACT_SOLVER_MAX_SPACE)
+        results = self.request(
+            dict(large_input(), options={"ga_core": "numpy"}),
+            dict(large_input(), options={"ga_core": "pygad"}),
+        )
+
+        self.assertEqual([r["status"] for r in results], ["success", "error"])
+        self.assertEqual((results[0]["stats"]["engine"], results[0]["stats"]["ga_core"]),
+                         ("ga", "numpy"))
+        self.assertIn("ga_core", results[1]["message"])
+
+    def test_metrics_option(self):
+        """options.metrics adds per-phase timings; options.profile writes a profile."""
+        import pstats
+        plain, measured, profiled, invalid = self.request(
+            SAMPLE_INPUT,
+            dict(SAMPLE_INPUT, options={"metrics": True}),
+            dict(SAMPLE_INPUT, options={"metrics": True, "profile": True}),
+            dict(SAMPLE_INPUT, options={"profile": "perf"}),
+        )
+
+        self.assertNotIn("metrics", plain)
+        metrics = measured["metrics"]
+        self.assertEqual(list(metrics["phases"]),
+                         ["parse", "validate", "load", "setup", "search", "format"])
+        for phase in metrics["phases"].values():
+            self.assertGreaterEqual(phase["wall_ms"], 0)
+        self.assertEqual(metrics["termination"], measured["stats"]["termination"])
+        self.assertEqual(metrics["engine"], "exact")
+        self.assertGreater(metrics["process_peak_rss_kib"], 0)
+        self.assertGreaterEqual(metrics["peak_rss_growth_kib"], 0)
+        self.assertLessEqual(metrics["peak_rss_growth_kib"], metrics["process_peak_rss_kib"])
+        self.assertNotIn("profile", metrics)
+
+        path = profiled["metrics"]["profile"]
+        self.addCleanup(os.unlink, path)
+        self.assertTrue(pstats.Stats(path).total_calls > 0)
+        self.assertEqual(invalid["status"], "error")
+        self.assertIn("profile", invalid["message"])
+
+    def test_columnar_request(self):
+        """class_columns requests match row requests; compact output has no whitespace."""
+        from data_loader import columns_from_rows
+        from main import dumps_output
+        columnar = {"class_columns": columns_from_rows(SAMPLE_INPUT["classes"]),
+                    "preferences": SAMPLE_INPUT["preferences"]}
+        rows, columns = self.request(SAMPLE_INPUT, columnar)
+
+        self.assertEqual(columns["status"], "success")
+        self.assertEqual(columns["timetable"], rows["timetable"])
+        compact = dumps_output(columns, compact=True)
+        self.assertEqual(json.loads(compact), columns)
+        self.assertNotIn("\n", compact)
+        self.assertLess(len(compact), len(dumps_output(columns)))
+
+    def test_streaming_request(self):
+        """A streaming request sends progress events, then the result."""
+        events = self.request(dict(SAMPLE_INPUT, stream=True))
+
+        self.assertEqual([e["event"] for e in events[:-1]], ["progress"] * (len(events) - 1))
+        self.assertGreaterEqual(len(events), 2)
+        self.assertIn("Monday", events[0]["timetable"])
+        self.assertEqual(events[-1]["event"], "result")
+        self.assertEqual(events[-1]["status"], "success")
+        self.assertEqual(events[-1]["summary"]["total_classes"], 2)
+
+
+class TestRequestTimeout(unittest.TestCase):
+    """A timed-out request is cancelled and gives its worker back."""
+
+    def test_timeout_frees_worker(self):
+        with mock.patch("server.handle_request", _slow_request):
+            engine = EngineServer(workers=1, request_timeout=0.5)
+            try:
+                timed_out = engine.handle({"slow": True})
+                # With the only worker still busy this would time out too
+                start = time.monotonic()
+                after = engine.handle({"slow": False})
+            finally:
+                engine.close()
+
+        self.assertEqual(timed_out["message"], "Timetable generation timed out.")
+        self.assertEqual(after["status"], "success")
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+class TestStartupImports(unittest.TestCase):
+    """main.py defers DEAP and NumPy until a request needs the GA."""
+
+    def run_engine_python(self, *args: str, stdin: str = "") -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, *args], cwd=ENGINE_DIR, input=stdin,
+                              capture_output=True, text=True, timeout=120)
+
+    def test_import_time_budget(self):
+        """`python -X importtime -c "import main"` stays light and within budget."""
+        result = self.run_engine_python("-X", "importtime", "-c", "import main")
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        cumulative = {}  # Module -> cumulative import time in microseconds
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, total, module = line.split("|")
+                if total.strip().isdigit():
+                    cumulative[module.strip()] = int(total)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, cumulative)
+        self.assertLess(cumulative["main"] / 1000, STARTUP_BUDGET_MS)
+
+    def test_invalid_request_skips_heavy_imports(self):
+        """Requests that fail validation never import the GA."""
+        script = (
+            "import json, sys, main\n"
+            "output, code = main.handle_request({'classes': [{}], 'preferences': {}})\n"
+            f"print(json.dumps([code, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))\n"
+        )
+        result = self.run_engine_python("-c", script)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout), [1, []])
+
+    def test_valid_request_runs_ga(self):
+        """A valid request still reaches the GA through the deferred import."""
+        result = self.run_engine_python("main.py", stdin=json.dumps(SAMPLE_INPUT))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout)["status"], "success")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
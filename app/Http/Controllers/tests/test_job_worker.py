@@ -0,0 +1,153 @@
+"""
+Job Worker Test Suite
+
+Tests the queued generation worker (TimetableEngine/worker.py) against a
+SQLite database with the timetable_generation_jobs and generated_timetables
+tables.
+"""
+
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add the TimetableEngine directory to the path (its modules use flat imports)
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "TimetableEngine"
+))
+
+from worker import JobStore, JobWorker
+
+from test_engine_server import SAMPLE_INPUT
+
+SCHEMA = """
+CREATE TABLE generated_timetables (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    timetable TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT, updated_at TEXT
+);
+CREATE TABLE timetable_generation_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    queue TEXT NOT NULL DEFAULT 'timetables',
+    status TEXT NOT NULL DEFAULT 'queued',
+    input TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reserved_at INTEGER,
+    available_at INTEGER NOT NULL,
+    generated_timetable_id INTEGER,
+    error TEXT,
+    finished_at TEXT,
+    created_at TEXT, updated_at TEXT
+);
+"""
+
+
+class TestJobWorker(unittest.TestCase):
+    """Test claiming, running and settling queued generations."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.connection = sqlite3.connect(os.path.join(cls.tmpdir.name, "jobs.sqlite"),
+                                         isolation_level=None)
+        cls.connection.executescript(SCHEMA)
+        cls.store = JobStore(cls.connection, "sqlite")
+        cls.worker = JobWorker(cls.store, workers=1, batch=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.worker.close()
+        cls.connection.close()
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.connection.execute("DELETE FROM generated_timetables")
+        self.connection.execute("DELETE FROM timetable_generation_jobs")
+
+    def add_job(self, input_data, user_id=1, **columns):
+        values = dict(user_id=user_id, input=json.dumps(input_data),
+                      available_at=int(time.time()))
+        values.update(columns)
+        cursor = self.connection.execute(
+            f"INSERT INTO timetable_generation_jobs ({', '.join(values)}) "
+            f"VALUES ({', '.join('?' for _ in values)})",
+            tuple(values.values()),
+        )
+        return cursor.lastrowid
+
+    def job(self, job_id):
+        return self.connection.execute(
+            "SELECT status, attempts, generated_timetable_id, error "
+            "FROM timetable_generation_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+
+    def test_completes_and_fails_jobs(self):
+        """Successful jobs save the active timetable; engine errors fail the job."""
+        self.connection.execute(
+            "INSERT INTO generated_timetables (user_id, timetable, active) VALUES (1, '{}', 1)"
+        )
+        good = self.add_job(SAMPLE_INPUT)
+        bad = self.add_job({"classes": [], "preferences": {}})
+
+        self.assertEqual(self.worker.run_once(), 2)
+
+        status, attempts, timetable_id, _ = self.job(good)
+        self.assertEqual((status, attempts), ("completed", 1))
+        active = self.connection.execute(
+            "SELECT id, timetable FROM generated_timetables WHERE user_id = 1 AND active = 1"
+        ).fetchall()
+        self.assertEqual([row[0] for row in active], [timetable_id])
+        self.assertIn("Monday", json.loads(active[0][1]))
+
+        status, _, timetable_id, error = self.job(bad)
+        self.assertEqual(status, "failed")
+        self.assertIsNone(timetable_id)
+        self.assertIn("classes", error)
+
+        self.assertEqual(self.worker.run_once(), 0)
+
+    def test_save_errors_fail_the_job(self):
+        """A timetable that cannot be saved fails its job; the rest of the batch settles."""
+        unsaved = self.add_job(SAMPLE_INPUT, user_id=1)
+        saved = self.add_job(SAMPLE_INPUT, user_id=2)
+        complete = self.store.complete
+
+        def complete_or_reject(job_id, user_id, timetable):
+            if job_id == unsaved:
+                raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+            return complete(job_id, user_id, timetable)
+
+        with mock.patch.object(self.store, "complete", side_effect=complete_or_reject):
+            self.assertEqual(self.worker.run_once(), 2)
+
+        status, _, timetable_id, error = self.job(unsaved)
+        self.assertEqual((status, timetable_id), ("failed", None))
+        self.assertIn("FOREIGN KEY constraint failed", error)
+        self.assertEqual(self.job(saved)[0], "completed")
+
+    def test_reclaims_abandoned_jobs(self):
+        """Stale running jobs are retried until they run out of attempts."""
+        stale = int(time.time()) - 3600
+        retried = self.add_job(SAMPLE_INPUT, status="running", attempts=1, reserved_at=stale)
+        exhausted = self.add_job(SAMPLE_INPUT, status="running", attempts=3, reserved_at=stale)
+        running = self.add_job(SAMPLE_INPUT, status="running", attempts=1,
+                               reserved_at=int(time.time()))
+        later = self.add_job(SAMPLE_INPUT, available_at=int(time.time()) + 3600)
+
+        self.assertEqual(self.worker.run_once(), 1)
+
+        self.assertEqual(self.job(retried)[:2], ("completed", 2))
+        self.assertEqual(self.job(exhausted)[0], "failed")
+        self.assertEqual(self.job(running)[0], "running")
+        self.assertEqual(self.job(later)[0], "queued")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
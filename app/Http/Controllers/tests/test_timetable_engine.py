@@ -6,9 +6,14 @@ for all supported scenarios and edge cases.
 """
 
 import sys
+import io
 import os
 import json
 import unittest
+import contextlib
+import itertools
+import random
+from unittest import mock
 from datetime import time, datetime
 from typing import Dict, Any, List
 
@@ -17,8 +22,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from TimetableEngine import (
     Class, ScheduledClass, Timetable,
-    load_classes_from_json, group_classes_by_section,
-    TimetableGenerator, ScoreCalculator,
+    load_classes_from_csv, iter_classes_from_csv,
+    load_classes_from_json, load_classes_from_columns, columns_from_rows,
+    group_classes_by_section,
+    TimetableGenerator, ScoreCalculator, SectionCatalogue,
     format_timetable_as_json, format_timetable_as_text,
     constants
 )
@@ -119,6 +126,9 @@ class TestTimetableEngineCore(unittest.TestCase):
         
         # Test properties
         self.assertEqual(test_class.duration, 60)  # 1 hour = 60 minutes
+        self.assertEqual(test_class.start_minutes, 9 * 60)
+        self.assertEqual(test_class.end_minutes, 10 * 60)
+        self.assertEqual(test_class.day_index, 0)  # Monday
         self.assertIsNotNone(test_class.time_tuple)
         self.assertEqual(test_class.code, "TEST101")
         self.assertEqual(test_class.tied_to, ["T1"])
@@ -133,6 +143,18 @@ class TestTimetableEngineCore(unittest.TestCase):
         self.assertEqual(classes[0].activity, "Lecture")
         self.assertEqual(classes[0].tied_to, ["T1", "T2"])
 
+    def test_section_catalogue(self):
+        """Test the struct-of-arrays catalogue round-trips classes."""
+        classes = load_classes_from_json(self.sample_classes_data)
+        catalogue = SectionCatalogue.from_classes(classes)
+
+        self.assertEqual(len(catalogue), 5)
+        self.assertEqual(catalogue.section_count, 5)
+        self.assertEqual(catalogue.subjects(), ["Computer Science", "Mathematics"])
+        self.assertEqual(len(catalogue.sections_for_subjects(["Mathematics"])), 2)
+        self.assertEqual(catalogue.to_classes(), classes)
+        self.assertFalse(hasattr(classes[0], "__dict__"))  # Slotted
+
     def test_class_grouping(self):
         """Test grouping classes by section."""
         classes = load_classes_from_json(self.sample_classes_data)
@@ -195,6 +217,39 @@ class TestTimetableEngineCore(unittest.TestCase):
         # Second class should conflict
         self.assertFalse(timetable.can_add_section([class2]))
 
+    def test_occupancy_bitmask(self):
+        """Test that back-to-back or other-day classes do not conflict."""
+        timetable = Timetable()
+
+        class1 = Class(
+            code="TEST101", subject="Test", activity="Lecture", section="A",
+            days="Monday", start_time=time(9, 0), end_time=time(10, 0),
+            venue="Room 1", tied_to=[], lecturer="Prof A"
+        )
+        back_to_back = Class(
+            code="TEST102", subject="Test", activity="Tutorial", section="T1",
+            days="Monday", start_time=time(10, 0), end_time=time(11, 0),
+            venue="Room 2", tied_to=[], lecturer="Prof B"
+        )
+        other_day = Class(
+            code="TEST103", subject="Test", activity="Tutorial", section="T2",
+            days="Tuesday", start_time=time(9, 0), end_time=time(10, 0),
+            venue="Room 3", tied_to=[], lecturer="Prof C"
+        )
+
+        self.assertEqual(bin(class1.occupancy).count("1"), 60)
+        self.assertEqual(class1.occupancy & back_to_back.occupancy, 0)
+        self.assertEqual(class1.occupancy & other_day.occupancy, 0)
+
+        timetable.add_section([back_to_back])
+        timetable.add_section([class1])
+        self.assertTrue(timetable.can_add_section([other_day]))
+        # Day schedules stay ordered by start time
+        self.assertEqual(
+            [sc.class_obj.code for sc in timetable.schedule["Monday"]],
+            ["TEST101", "TEST102"]
+        )
+
 
 class TestTimetableGeneration(unittest.TestCase):
     """Test timetable generation functionality."""
@@ -288,6 +343,39 @@ class TestTimetableGeneration(unittest.TestCase):
         # Should return None due to impossible constraints
         self.assertIsNone(timetable)
 
+    def test_conflict_index(self):
+        """Test the precomputed section conflict index."""
+        classes = load_classes_from_json(self.sample_classes_data + [
+            {
+                "code": "MATH201", "subject": "Mathematics", "activity": "Lecture", "section": "B",
+                "days": "Monday", "start_time": "09:30:00", "end_time": "10:30:00",
+                "venue": "LT2", "tied_to": ["T2"], "lecturer": "Prof. Wilson"
+            },
+            {
+                "code": "MATH201", "subject": "Mathematics", "activity": "Tutorial", "section": "T2",
+                "days": "Thursday", "start_time": "15:00:00", "end_time": "16:00:00",
+                "venue": "TR2", "tied_to": [], "lecturer": "TA Brown"
+            }
+        ])
+        preferences = {
+            "subjects": ["Computer Science", "Mathematics"],
+            "schedule_style": "compact",
+            "enforce_ties": True,
+        }
+
+        generator = TimetableGenerator(classes, preferences)
+        sections = [s[0].section for s in generator.candidate_sections]
+        cs_lecture, math_lecture = sections.index("A"), sections.index("B")
+        cs_tutorial = sections.index("T1")
+
+        self.assertEqual(generator.conflict_matrix.shape, (4, 4))
+        self.assertTrue(generator.conflict_matrix[cs_lecture, math_lecture])
+        self.assertTrue(generator.conflict_matrix[math_lecture, cs_lecture])
+        self.assertFalse(generator.conflict_matrix[cs_lecture, cs_tutorial])
+        self.assertFalse(generator.is_feasible([cs_lecture, math_lecture]))
+        self.assertTrue(generator.is_feasible([cs_lecture, cs_tutorial]))
+        self.assertEqual(generator.evaluate([0, 0, 0, 0]), (0,))
+
 
 class TestSchedulingStyles(unittest.TestCase):
     """Test different scheduling styles."""
@@ -458,21 +546,867 @@ class TestScoreCalculator(unittest.TestCase):
         self.assertGreater(bonus, 0)
 
 
+class TestFitnessCache(unittest.TestCase):
+    """Test the bounded LRU fitness cache."""
+
+    def test_lru_eviction_and_counters(self):
+        """The least recently used entry is evicted and lookups are counted."""
+        from cache import FitnessCache
+
+        cache = FitnessCache(max_size=2)
+        cache[(0,)] = 1.0
+        cache[(1,)] = 2.0
+        self.assertEqual(cache.get((0,)), 1.0)  # (1,) is now least recently used
+        cache[(2,)] = 3.0
+
+        self.assertNotIn((1,), cache)
+        self.assertIsNone(cache.get((1,)))
+        self.assertEqual(len(cache), 2)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_shared_cache_across_runs(self):
+        """Generators with the same catalogue and preferences share evaluations."""
+        from cache import clear_shared_caches
+
+        classes = load_classes_from_json([
+            {"code": "S1", "subject": "Subject 1", "activity": "Lecture", "section": f"L{n}",
+             "days": day, "start_time": "09:00:00", "end_time": "11:00:00",
+             "venue": "LT", "tied_to": [], "lecturer": "Lecturer"}
+            for n, day in enumerate(["Monday", "Tuesday"])
+        ])
+        preferences = {"subjects": ["Subject 1"], "enforce_ties": False,
+                       "preferred_start": time.min, "preferred_end": time.max}
+        clear_shared_caches()
+
+        first = TimetableGenerator(classes, preferences, share_cache=True, seed=1, engine="ga")
+        first.run(generations=2, pop_size=4)
+        second = TimetableGenerator(classes, preferences, share_cache=True, seed=1, engine="ga")
+        second.run(generations=2, pop_size=4)
+        other = TimetableGenerator(classes, dict(preferences, schedule_style="spaced_out"),
+                                   share_cache=True)
+
+        self.assertIs(first.fitness_cache, second.fitness_cache)
+        self.assertIsNot(first.fitness_cache, other.fitness_cache)
+        self.assertEqual(second.run_stats["fitness_cache"]["misses"], 0)
+        self.assertGreater(second.run_stats["fitness_cache"]["hits"], 0)
+        clear_shared_caches()
+
+
+class TestPopulationEvaluator(unittest.TestCase):
+    """Test the vectorized whole-population evaluator."""
+
+    def setUp(self):
+        """Set up a catalogue with clashes, gaps and streaks of every kind."""
+        slots = [
+            ("Monday", "08:00:00", "09:00:00"), ("Monday", "09:00:00", "10:00:00"),
+            ("Monday", "10:10:00", "11:00:00"), ("Monday", "12:30:00", "13:30:00"),
+            ("Tuesday", "09:00:00", "11:00:00"), ("Tuesday", "16:00:00", "17:00:00"),
+            ("Wednesday", "09:30:00", "10:30:00"), ("Thursday", "14:00:00", "15:00:00"),
+            ("Friday", "08:00:00", "10:00:00"), ("Monday", "09:30:00", "10:30:00"),
+        ]
+        self.classes_data = []
+        for s, subject in enumerate(["Computer Science", "Mathematics", "Physics"]):
+            for n in range(2):
+                day, start, end = slots[(3 * s + 2 * n) % len(slots)]
+                self.classes_data.append({
+                    "code": f"S{s}", "subject": subject, "activity": "Lecture", "section": f"L{n}",
+                    "days": day, "start_time": start, "end_time": end, "venue": "LT",
+                    "tied_to": ["T0", "T1"] if n == 0 else ["T1"], "lecturer": f"Lecturer {s}{n}"
+                })
+            for n in range(2):
+                day, start, end = slots[(3 * s + 2 * n + 1) % len(slots)]
+                self.classes_data.append({
+                    "code": f"S{s}", "subject": subject, "activity": "Tutorial", "section": f"T{n}",
+                    "days": day, "start_time": start, "end_time": end, "venue": "TR",
+                    "tied_to": [], "lecturer": f"Tutor {s}{n}"
+                })
+
+    def test_matches_scalar_evaluation(self):
+        """Batch scores must equal evaluate() exactly for every individual."""
+        import itertools
+        classes = load_classes_from_json(self.classes_data)
+
+        for enforce_ties, style in itertools.product([True, False], ["compact", "spaced_out"]):
+            with self.subTest(enforce_ties=enforce_ties, style=style):
+                preferences = {
+                    "subjects": ["Computer Science", "Mathematics", "Physics"],
+                    "schedule_style": style,
+                    "enforce_ties": enforce_ties,
+                    "preferred_days": ["Monday", "Thursday"],
+                    "preferred_lecturers": ["Lecturer 00", "Tutor 11"],
+                    "preferred_start": time(9, 0),
+                    "preferred_end": time(12, 0)
+                }
+                generator = TimetableGenerator(classes, preferences)
+                bounds = generator.toolbox.mutate.keywords["up"]
+                individuals = [list(ind) for ind in itertools.product(*[range(b + 1) for b in bounds])]
+
+                expected = [generator.evaluate(ind)[0] for ind in individuals]
+                generator.fitness_cache.clear()
+                actual = generator._get_population_evaluator().evaluate(individuals)
+
+                self.assertEqual(actual, expected)
+                self.assertTrue(any(expected) and not all(expected))
+                generator.fitness_cache.clear()
+                self.assertEqual(
+                    [f[0] for f in generator.evaluate_population(individuals)], expected
+                )
+
+
+class CatalogueTestCase(unittest.TestCase):
+    """
+    Base for tests on a small clashing catalogue: four subjects, each with four
+    lectures tied to three tutorials.
+    """
+
+    def setUp(self):
+        """Set up the catalogue and preferences for all four subjects."""
+        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+        self.classes_data = []
+        for s in range(4):
+            for n in range(4):
+                self.classes_data.append({
+                    "code": f"S{s}", "subject": f"Subject {s}", "activity": "Lecture",
+                    "section": f"L{n}", "days": days[(s + n) % 5],
+                    "start_time": f"{8 + (s * 2 + n) % 8:02d}:00:00",
+                    "end_time": f"{10 + (s * 2 + n) % 8:02d}:00:00",
+                    "venue": "LT", "tied_to": ["T0", "T1", "T2"], "lecturer": f"Lecturer {n}"
+                })
+            for n in range(3):
+                self.classes_data.append({
+                    "code": f"S{s}", "subject": f"Subject {s}", "activity": "Tutorial",
+                    "section": f"T{n}", "days": days[(s + 2 * n) % 5],
+                    "start_time": f"{9 + (s + n) % 7:02d}:00:00",
+                    "end_time": f"{10 + (s + n) % 7:02d}:00:00",
+                    "venue": "TR", "tied_to": [], "lecturer": f"Tutor {n}"
+                })
+        self.preferences = {
+            "subjects": [f"Subject {s}" for s in range(4)],
+            "schedule_style": "compact",
+            "enforce_ties": True,
+            "preferred_start": time.min,
+            "preferred_end": time.max
+        }
+
+    def load_classes(self) -> List[Class]:
+        return load_classes_from_json(self.classes_data)
+
+    def make_generator(self, preferences: Dict[str, Any] = None, **kwargs) -> TimetableGenerator:
+        """A generator over the catalogue, for self.preferences unless others are given."""
+        return TimetableGenerator(self.load_classes(), preferences or self.preferences, **kwargs)
+
+
+class TestParallelEvaluation(CatalogueTestCase):
+    """Test the opt-in process-pool evaluation mode."""
+
+    def test_parallel_run_matches_serial(self):
+        """A seeded run gives the same result with or without workers."""
+        results = []
+        for workers in (1, 2):
+            generator = self.make_generator(workers=workers, seed=42, engine="ga")
+            timetable = generator.run(generations=3, pop_size=300)
+            self.assertIsNotNone(timetable)
+            results.append((
+                [(sc.class_obj.subject, sc.class_obj.section) for sc in timetable.scheduled_classes],
+                generator.fitness_cache,
+            ))
+
+        self.assertEqual(results[0][0], results[1][0])
+        self.assertEqual(results[0][1], results[1][1])
+
+
+class TestIslandModel(CatalogueTestCase):
+    """Test the island-model mode with migration between processes."""
+
+    def test_islands_report_progress_and_global_best(self):
+        """Every island reports each generation; the best of them is returned."""
+        generator = self.make_generator(seed=7, islands=3, engine="ga")
+        timetable = generator.run(generations=8, pop_size=20)
+
+        self.assertIsNotNone(timetable)
+        model = generator.island_model
+        self.assertEqual(len(model.progress), 3)
+        for records in model.progress:
+            self.assertEqual([r["generation"] for r in records], list(range(8)))
+        self.assertEqual(model.best_fitness,
+                         max(r["max"] for records in model.progress for r in records))
+        self.assertEqual(model.best_fitness,
+                         max(r["max"] for r in model.progress[model.best_island]))
+
+    def test_islands_use_generator_rates(self):
+        """island_rates given to the generator reach each island's config."""
+        from islands import IslandModel
+
+        rates = [(0.9, 0.05), (0.5, 0.4)]
+        generator = self.make_generator(seed=7, islands=3, engine="ga", island_rates=rates)
+        configs = []
+        original = IslandModel._island_configs
+
+        def record(model):
+            configs[:] = original(model)
+            return configs
+
+        with mock.patch.object(IslandModel, "_island_configs", autospec=True, side_effect=record):
+            self.assertIsNotNone(generator.run(generations=4, pop_size=12))
+
+        self.assertEqual([(c.crossover_probability, c.mutation_probability)
+                                                   for c in configs], rates + [
+            (generator.crossover_probability, generator.mutation_probability)])
+        with self.assertRaises(ValueError):
+            self.make_generator(islands=2, island_rates=[(0.5, 1.5)])
+
+    def test_migrants_replace_worst(self):
+        """Migrants take the places of the lowest-fitness individuals."""
+        from islands import _receive_migrants
+        from deap import creator
+
+        population = []
+        for genes, fitness in (([0], 5.0), ([1], 1.0), ([2], 3.0), ([3], 0.0)):
+            individual = creator.Individual(genes)
+            individual.fitness.values = (fitness,)
+            population.append(individual)
+        _receive_migrants(population, [([9], 9.0), ([8], 8.0)])
+
+        self.assertEqual([list(ind) for ind in population], [[0], [8], [2], [9]])
+
+
+class TestExactSolver(CatalogueTestCase):
+    """Test the branch-and-bound engine for small search spaces."""
+
+    def test_matches_brute_force(self):
+        """The exact engine finds the best score over every combination."""
+        for style in ("compact", "spaced_out"):
+            with self.subTest(style=style):
+                preferences = dict(self.preferences, schedule_style=style,
+                                   preferred_days=["Tuesday"])
+                generator = self.make_generator(preferences, engine="exact")
+                timetable = generator.run()
+
+                pairs = [
+                    (lecture, tutorial)
+                    for lecture, (_, tutorial_ids) in enumerate(generator.gene_map[0]["pair_ids"])
+                    for tutorial in range(len(tutorial_ids))
+                ]
+                best = max(
+                    generator.evaluate([gene for pair in combo for gene in pair])[0]
+                    for combo in itertools.product(pairs, repeat=len(generator.gene_map))
+                )
+                self.assertEqual(generator.estimate_search_space(), len(pairs) ** 4)
+                self.assertIsNotNone(timetable)
+                self.assertEqual(generator.run_stats["engine"], "exact")
+                self.assertEqual(generator.run_stats["exact_solver"]["best_fitness"], best)
+
+    def test_auto_engine_selection(self):
+        """Small spaces are solved exactly; larger ones use the GA."""
+        small = self.make_generator(dict(self.preferences, subjects=["Subject 0"]))
+        small.run()
+        self.assertEqual(small.run_stats["engine"], "exact")
+
+        with mock.patch(f"{TimetableGenerator.__module__}.EXACT_SOLVER_MAX_SPACE", 10):
+            large = self.make_generator()
+            large.run(generations=2, pop_size=10)
+        self.assertEqual(large.run_stats["engine"], "ga")
+
+        with self.assertRaises(ValueError):
+            self.make_generator(engine="simplex")
+
+
+class TestFeasibilityOperators(CatalogueTestCase):
+    """Test constructive initialization and the clash repair operator."""
+
+    def test_repair_fixes_clashes_only(self):
+        """Repair leaves clash-free individuals alone and fixes clashing ones."""
+        generator = self.make_generator(engine="ga")
+        bounds = generator.toolbox.mutate.keywords["up"]
+        rng = random.Random(3)
+        random.seed(3)
+
+        before = after = 0
+        for _ in range(200):
+            individual = [rng.randint(0, b) for b in bounds]
+            feasible = generator.is_feasible(generator._decode_section_ids(individual))
+            repaired = generator.toolbox.repair(list(individual))
+            if feasible:
+                self.assertEqual(repaired, individual)
+            before += feasible
+            after += generator.is_feasible(generator._decode_section_ids(repaired))
+        self.assertGreater(after, before)
+
+    def test_constructed_population_is_feasible(self):
+        """Constructed individuals avoid clashes when the catalogue allows."""
+        random.seed(5)
+        generator = self.make_generator(engine="ga")
+        population = generator.toolbox.population(n=50)
+        uniform = self.make_generator(engine="ga", feasible_operators=False)
+        baseline = uniform.toolbox.population(n=50)
+
+        def feasible_count(gen, individuals):
+            return sum(gen.is_feasible(gen._decode_section_ids(ind)) for ind in individuals)
+
+        self.assertGreater(feasible_count(generator, population),
+                           feasible_count(uniform, baseline))
+
+
+class TestDeltaEvaluator(CatalogueTestCase):
+    """Test incremental evaluation of children from their parents' day scores."""
+
+    def test_matches_full_evaluation(self):
+        """Mutated children score exactly as a full Timetable evaluation does."""
+        for style in ("compact", "spaced_out"):
+            with self.subTest(style=style):
+                preferences = dict(self.preferences, schedule_style=style,
+                                   preferred_days=["Monday"], preferred_lecturers=["Tutor 1"])
+                incremental = self.make_generator(preferences, engine="ga")
+                full = self.make_generator(preferences, engine="ga", incremental=False)
+                random.seed(11)
+
+                parents = [tuple(incremental.toolbox.indices()) for _ in range(20)]
+                for parent in parents:
+                    incremental._compute_fitness(parent)
+                for _ in range(300):
+                    parent = random.choice(parents)
+                    child = list(parent)
+                    incremental.toolbox.mutate(child)
+                    self.assertEqual(incremental._compute_fitness(tuple(child), parent),
+                                     full._compute_fitness(tuple(child)))
+
+                self.assertGreater(incremental._delta_evaluator.delta_evaluations, 0)
+
+    def test_applies_to_large_populations(self):
+        """Children are scored incrementally even when batches are large enough to vectorize."""
+        pop_size = 2 * constants.BATCH_EVALUATION_MIN_SIZE
+        for ga_core in constants.GA_CORES:
+            with self.subTest(ga_core=ga_core):
+                runs = []
+                for incremental in (True, False):
+                    generator = self.make_generator(engine="ga", seed=4, ga_core=ga_core,
+                                                    incremental=incremental)
+                    generator.run(generations=4, pop_size=pop_size)
+                    runs.append(generator)
+                incremental, full = runs
+
+                counts = incremental.run_stats["delta_evaluation"]
+                self.assertGreater(counts["incremental"], 0)
+                # Identical scores, so identical runs
+                self.assertEqual([fitness for fitness, _ in incremental.top_timetables],
+                                 [fitness for fitness, _ in full.top_timetables])
+
+
+class TestProgressStreaming(CatalogueTestCase):
+    """Test per-generation progress events and cancellation."""
+
+    def test_progress_events_and_cancel(self):
+        """Events carry the best so far; returning False stops the run early."""
+        generator = self.make_generator(engine="ga", seed=3)
+        events = []
+
+        def on_progress(event):
+            events.append(event)
+            return event["generation"] < 2
+
+        timetable = generator.run(generations=20, pop_size=20, progress_callback=on_progress)
+
+        self.assertEqual([e["generation"] for e in events], [0, 1, 2])
+        self.assertTrue(generator.run_stats["cancelled"])
+        self.assertIsNotNone(timetable)
+        self.assertTrue(events[0]["timetable"].scheduled_classes)
+        self.assertEqual(events[-1]["best"], max(e["best"] for e in events))
+
+
+class TestDeadlineAndCancellation(CatalogueTestCase):
+    """Test wall-clock deadlines and external cancellation of run()."""
+
+    def test_deadline_returns_best_so_far(self):
+        """An expired deadline stops the GA after the current generation."""
+        generator = self.make_generator(engine="ga", seed=5)
+
+        timetable = generator.run(generations=50, pop_size=20, deadline_ms=0)
+
+        self.assertIsNotNone(timetable)
+        self.assertEqual(generator.run_stats["termination"], "deadline")
+        self.assertEqual(generator.run_stats["generations"], 1)
+
+        generator.run(generations=3, pop_size=20, deadline_ms=60000)
+        self.assertEqual(generator.run_stats["termination"], "completed")
+        self.assertEqual(generator.run_stats["generations"], 3)
+
+    def test_cancel_event(self):
+        """A set cancel event stops the run and is recorded as cancelled."""
+        import threading
+        generator = self.make_generator(engine="ga", seed=5)
+        cancel = threading.Event()
+        cancel.set()
+
+        timetable = generator.run(generations=50, pop_size=20, cancel_event=cancel)
+
+        self.assertIsNotNone(timetable)
+        self.assertEqual(generator.run_stats["termination"], "cancelled")
+        self.assertTrue(generator.run_stats["cancelled"])
+
+    def test_exact_solver_stops_early(self):
+        """An interrupted exact search keeps its best timetable so far."""
+        from exact_solver import ExactSolver
+        generator = self.make_generator(engine="exact")
+        checks = []
+
+        def should_stop():
+            checks.append(None)
+            return "deadline" if len(checks) == 50 else None
+
+        solver = ExactSolver(generator)
+        with mock.patch(f"{ExactSolver.__module__}.EXACT_SOLVER_CHECK_INTERVAL", 1):
+            genes = solver.solve(should_stop=should_stop)
+
+        self.assertEqual(solver.interrupted, "deadline")
+        self.assertEqual(solver.nodes, 50)
+        self.assertIsNotNone(genes)
+        self.assertEqual(generator.evaluate(genes)[0], solver.best_score)
+
+        generator.run()
+        self.assertEqual(generator.run_stats["termination"], "completed")
+        self.assertTrue(generator.run_stats["exact_solver"]["complete"])
+
+
+class TestColumnarFormat(CatalogueTestCase):
+    """Test the columnar class transport."""
+
+    def test_round_trip_matches_rows(self):
+        """Columns decode to the same classes as the JSON rows."""
+        columns = columns_from_rows(self.classes_data)
+        from_rows = self.load_classes()
+        from_columns = load_classes_from_columns(json.loads(json.dumps(columns)))
+
+        self.assertEqual(len(from_columns), len(from_rows))
+        for a, b in zip(from_rows, from_columns):
+            for slot in Class.__slots__:
+                self.assertEqual(getattr(a, slot), getattr(b, slot), slot)
+        self.assertLess(len(json.dumps(columns)), len(json.dumps(self.classes_data)))
+
+    def test_invalid_columns(self):
+        """Missing, ragged or out-of-range columns raise ValueError."""
+        columns = columns_from_rows(self.classes_data)
+        missing = {k: v for k, v in columns.items() if k != "venue"}
+        ragged = dict(columns, start=columns["start"][:-1])
+        bad_id = dict(columns, subject=[len(columns["strings"])] * len(columns["subject"]))
+        negative_id = dict(columns, venue=[-1] * len(columns["venue"]))
+        negative_tie = dict(columns, tied_to=[[-1]] * len(columns["tied_to"]))
+
+        for invalid in (missing, ragged, bad_id, negative_id, negative_tie, []):
+            with self.assertRaises(ValueError):
+                load_classes_from_columns(invalid)
+
+
+class TestCatalogueSnapshot(CatalogueTestCase):
+    """Test selecting a request's classes from a stored catalogue snapshot."""
+
+    def test_select_matches_row_filters(self):
+        """select keeps exactly the classes the controller's section query would."""
+        from snapshot import CatalogueSnapshot
+        classes = self.load_classes()
+        snapshot = CatalogueSnapshot("v1", SectionCatalogue.from_classes(classes))
+        self.assertEqual(len(snapshot), len(classes))
+
+        filtered = dict(self.preferences, subjects=["Subject 1", "Subject 3"],
+                        preferred_days=["Monday", "Tuesday", "Thursday"],
+                        preferred_lecturers=["Lecturer 1", "Lecturer 2", "Tutor 0"],
+                        preferred_start=time(9), preferred_end=time(15))
+        for preferences in (self.preferences, filtered):
+            with self.subTest(filtered=preferences is filtered):
+                def key(c):
+                    return (c.subject, c.activity, c.section, c.days, c.start_time, c.lecturer)
+
+                expected = sorted(
+                    key(c) for c in classes
+                    if c.subject in preferences["subjects"]
+                    and c.days in preferences.get("preferred_days", [c.days])
+                    and c.lecturer in preferences.get("preferred_lecturers", [c.lecturer])
+                    and preferences["preferred_start"] <= c.start_time
+                    and c.end_time <= preferences["preferred_end"]
+                )
+                self.assertTrue(expected)
+                self.assertEqual(sorted(key(c) for c in snapshot.select(preferences)), expected)
+
+    def test_select_by_db_id(self):
+        """Exports with ids are matched by subject and lecturer id, not by name."""
+        from data_loader import load_catalogue_from_document
+        from snapshot import CatalogueSnapshot
+        rows = [dict(row, subject_id=int(row["code"][1:]) + 1,
+                     lecturer_id=None if row["activity"] == "Tutorial" else int(row["section"][1:]) + 1)
+                for row in self.classes_data]
+        rows[0] = dict(rows[0], subject="Subject 0 (renamed)")  # Same subject id
+        for document in ({"classes": rows}, {"class_columns": columns_from_rows(rows)}):
+            with self.subTest(columnar="class_columns" in document):
+                snapshot = CatalogueSnapshot("v1", load_catalogue_from_document(document))
+                self.assertTrue(snapshot.catalogue.has_db_ids)
+
+                selected = snapshot.select(dict(self.preferences, subjects=["Subject 0"],
+                                                subject_ids=[1], lecturer_ids=[1, 2]))
+                self.assertEqual(sorted((c.subject, c.section) for c in selected),
+                                 [("Subject 0", "L1"), ("Subject 0 (renamed)", "L0")])
+
+                # Without ids in the request, names are matched
+                by_name = snapshot.select(dict(self.preferences, subjects=["Subject 0"]))
+                self.assertEqual(len(by_name), 6)
+
+        with self.assertRaises(ValueError):
+            load_catalogue_from_document({"classes": [dict(rows[0], subject_id="S0")]})
+
+
+class TestCsvLoader(unittest.TestCase):
+    """Test the streaming seeder-format CSV loader."""
+
+    HEADER = "Code,subject,Activity,Section,Days,Start Time,End Time,Venue,Tied To,Lecturer\n"
+
+    def test_time_formats_and_ties(self):
+        """12- and 24-hour times parse alike; ties and empty lecturers are handled."""
+        lines = [
+            self.HEADER,
+            "CS1,Computing,Lecture,L1,Monday,9:00 AM,12:00 PM,LT1,\"T1, T2\",Dr. A\n",
+            "CS1,Computing,Tutorial,T1,Tuesday,12:30 AM,13:00,TR1,,\n",
+        ]
+        lecture, tutorial = iter_classes_from_csv(lines)
+
+        self.assertEqual((lecture.start_time, lecture.end_time), (time(9, 0), time(12, 0)))
+        self.assertEqual(lecture.tied_to, ["T1", "T2"])
+        self.assertEqual((tutorial.start_time, tutorial.end_time), (time(0, 30), time(13, 0)))
+        self.assertEqual(tutorial.lecturer, "Not Assigned")
+
+    def test_errors_are_aggregated(self):
+        """Bad rows are skipped and reported once with their line numbers."""
+        import tempfile
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write(self.HEADER)
+            file.write("CS1,Computing,Lecture,L1,Monday,9:00 AM,11:00 AM,LT1,,Dr. A\n")
+            file.write("CS1,Computing,Lecture,L2,Monday,13:00 PM,2:00 PM,LT1,,Dr. A\n")
+            file.write("CS1,Computing,Lecture,L3,Monday,9:00\n")
+            file.write("CS1,Computing,Lecture,L4,Monday,later,11:00,LT1,,Dr. A\n")
+        self.addCleanup(os.unlink, file.name)
+
+        errors = []
+        classes = load_classes_from_csv(file.name, errors)
+        self.assertEqual([c.section for c in classes], ["L1"])
+        self.assertEqual([line for line, _ in errors], [3, 4, 5])
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(len(load_classes_from_csv(file.name)), 1)
+        summary = stderr.getvalue().splitlines()
+        self.assertEqual(len(summary), 1)  # One summary line for all skipped rows
+        self.assertIn(f"Skipped 3 rows of {file.name}", summary[0])
+
+    def test_missing_columns(self):
+        """A header without the required columns is rejected outright."""
+        with self.assertRaises(ValueError):
+            list(iter_classes_from_csv(["Code,subject\n", "CS1,Computing\n"]))
+
+
+class TestAlternatives(CatalogueTestCase):
+    """Test top-K distinct timetables from one run."""
+
+    def test_hall_of_fame(self):
+        """Duplicates are rejected, close entries replaced only by better ones."""
+        from hall_of_fame import DiverseHallOfFame
+        hof = DiverseHallOfFame(3, 2, lambda genes: genes)
+
+        self.assertTrue(hof.insert([1, 2, 3], 10))
+        self.assertFalse(hof.insert([1, 2, 3], 10))  # Identical
+        self.assertFalse(hof.insert([1, 2, 4], 9))  # Too close, not better
+        self.assertFalse(hof.insert([7, 8, 9], 0))  # Infeasible
+        self.assertTrue(hof.insert([4, 5, 6], 8))
+        self.assertEqual(hof.threshold, 0)
+        self.assertTrue(hof.insert([1, 2, 5], 12))  # Close to [1, 2, 3] and better
+        self.assertTrue(hof.insert([7, 8, 9], 9))
+
+        self.assertEqual(list(hof), [([1, 2, 5], 12), ([7, 8, 9], 9), ([4, 5, 6], 8)])
+        self.assertEqual(hof.threshold, 8)
+        self.assertFalse(hof.insert([3, 4, 9], 8))
+
+    def test_exact_top_k(self):
+        """The exact engine returns the K best distinct timetables."""
+        generator = self.make_generator(engine="exact")
+        best = generator.run(top_k=4)
+
+        # Every timetable of the space, scored
+        scores = {}
+        for combination in itertools.product(*generator.item_choices()):
+            genes = [gene for option, _ in combination for gene in option]
+            score = generator.evaluate(genes)[0]
+            if score > 0:
+                scores[frozenset(generator._decode_section_ids(genes))] = score
+        expected = sorted(scores.values(), reverse=True)[:4]
+
+        self.assertEqual(len(generator.top_timetables), 4)
+        self.assertIs(generator.top_timetables[0][1], best)
+        self.assertEqual([fitness for fitness, _ in generator.top_timetables], expected)
+
+    def test_ga_alternatives_are_diverse(self):
+        """GA alternatives are ranked and at least min_distance sections apart."""
+        from hall_of_fame import section_distance
+        generator = self.make_generator(engine="ga", seed=2)
+        best = generator.run(generations=10, pop_size=30, top_k=3, min_distance=2)
+
+        fitnesses = [fitness for fitness, _ in generator.top_timetables]
+        self.assertIs(generator.top_timetables[0][1], best)
+        self.assertEqual(fitnesses, sorted(fitnesses, reverse=True))
+        self.assertGreater(len(fitnesses), 1)
+        sections = [
+            frozenset((sc.class_obj.subject, sc.class_obj.activity, sc.class_obj.section)
+                      for sc in timetable.scheduled_classes)
+            for _, timetable in generator.top_timetables
+        ]
+        for a, b in itertools.combinations(sections, 2):
+            self.assertGreaterEqual(section_distance(a, b), 2)
+
+    def test_ranked_output(self):
+        """format_timetable_as_json lists the alternatives by rank."""
+        generator = self.make_generator(engine="exact")
+        best = generator.run(top_k=2)
+
+        output = format_timetable_as_json(best, generator.top_timetables)
+        self.assertEqual([a["rank"] for a in output["alternatives"]], [1, 2])
+        self.assertEqual(output["alternatives"][0]["timetable"], output["timetable"])
+        self.assertIn("summary", output["alternatives"][1])
+        self.assertNotIn("alternatives", format_timetable_as_json(best))
+
+
+class TestNativeEvolution(CatalogueTestCase):
+    """Test the NumPy gene-matrix GA core (ga_core="numpy")."""
+
+    def make_generator(self, preferences: Dict[str, Any] = None, **kwargs) -> TimetableGenerator:
+        """A GA-engine generator with the numpy core unless kwargs say otherwise."""
+        return super().make_generator(preferences, **dict({"engine": "ga", "ga_core": "numpy"},
+                                                          **kwargs))
+
+    def test_unknown_core_rejected(self):
+        """Only the cores in GA_CORES are accepted."""
+        with self.assertRaises(ValueError):
+            self.make_generator(ga_core="pygad")
+
+    def test_unsupported_combinations_rejected(self):
+        """The numpy core cannot drive the exact solver or the island model."""
+        with self.assertRaises(ValueError):
+            self.make_generator(engine="exact")
+        with self.assertRaises(ValueError):
+            self.make_generator(islands=2)
+
+    def test_core_recorded_on_every_path(self):
+        """run_stats records the GA core that ran, or None when the exact solver ran."""
+        self.preferences["subjects"] = self.preferences["subjects"][:3]  # A small space
+        generator = self.make_generator(engine="auto")
+        generator.run()
+        self.assertEqual((generator.run_stats["engine"], generator.run_stats["ga_core"]),
+                         ("exact", None))
+
+    def test_quality_matches_deap(self):
+        """Seeded numpy runs repeat exactly and score like the DEAP core's."""
+        from adaptive import ConvergenceMonitor
+
+        def best_fitnesses(ga_core: str, **budget) -> List[float]:
+            results = []
+            for seed in range(8):
+                generator = self.make_generator(seed=seed, ga_core=ga_core)
+                generator.run(**budget)
+                self.assertGreater(generator.run_stats["generations"], 1)
+                results.append(generator.top_timetables[0][0])
+            return results
+
+        optimum = self.make_generator(engine="exact", ga_core="deap")
+        optimum.run()
+
+        # The same 30 generations for both cores, then the budget and stopping
+        # rules a request gets
+        with mock.patch.object(ConvergenceMonitor, "update", return_value=None):
+            native, deap = (best_fitnesses(core, generations=30, pop_size=40)
+                            for core in ("numpy", "deap"))
+            self.assertEqual(best_fitnesses("numpy", generations=30, pop_size=40), native)
+        self.assertIn(optimum.top_timetables[0][0], native)
+        self.assertGreaterEqual(sum(native) / len(native), 0.98 * sum(deap) / len(deap))
+
+        native, deap = best_fitnesses("numpy"), best_fitnesses("deap")
+        self.assertGreaterEqual(sum(native) / len(native), 0.98 * sum(deap) / len(deap))
+
+    def test_run_stats(self):
+        """run_stats names the GA core that ran."""
+        generator = self.make_generator(seed=1)
+        self.assertIsNotNone(generator.run(generations=5, pop_size=20))
+        self.assertEqual((generator.run_stats["engine"], generator.run_stats["ga_core"]),
+                         ("ga", "numpy"))
+
+    def test_next_generation_matrix(self):
+        """Selection copies rows; variation keeps genes in bounds and records parents."""
+        import numpy as np
+        generator = self.make_generator(feasible_operators=False)
+        upper = np.array(generator.gene_upper_bounds)
+        rng = np.random.default_rng(0)
+        pop = rng.integers(0, upper + 1, size=(20, len(upper)))
+        fitness = rng.random(20)
+
+        generator.crossover_probability = generator.mutation_probability = 0.0
+        offspring, parents = generator._next_generation_matrix(pop, fitness, upper, rng)
+        rows = {tuple(row) for row in pop.tolist()}
+        self.assertTrue(all(tuple(row) in rows for row in offspring.tolist()))
+        self.assertEqual(parents, [None] * 20)
+        # Every slot is won by one of TOURNAMENT_SIZE contestants, never the worst
+        self.assertNotIn(tuple(pop[fitness.argmin()]), {tuple(r) for r in offspring.tolist()})
+
+        generator.crossover_probability = generator.mutation_probability = 1.0
+        offspring, parents = generator._next_generation_matrix(pop, fitness, upper, rng)
+        self.assertTrue(((offspring >= 0) & (offspring <= upper)).all())
+        self.assertTrue(all(parent is not None and tuple(parent) in rows for parent in parents))
+
+    def test_alternatives_and_deadline(self):
+        """The numpy core fills the hall of fame and honours deadlines."""
+        generator = self.make_generator(seed=2)
+        best = generator.run(generations=10, pop_size=30, top_k=3)
+        self.assertIs(generator.top_timetables[0][1], best)
+        self.assertGreater(len(generator.top_timetables), 1)
+
+        self.assertIsNotNone(generator.run(generations=50, pop_size=20, deadline_ms=0))
+        self.assertEqual(generator.run_stats["termination"], "deadline")
+        self.assertEqual(generator.run_stats["generations"], 1)
+
+
+class TestAdaptiveSearch(CatalogueTestCase):
+    """Test search budgets and stopping rules sized from the request."""
+
+    def test_size_search(self):
+        """Budgets grow with the search space, within the configured bounds."""
+        from adaptive import size_search
+        self.assertEqual(size_search(1), (constants.MIN_GENERATIONS, constants.MIN_POPULATION_SIZE))
+        self.assertEqual(size_search(10 ** 40),
+                         (constants.MAX_GENERATIONS, constants.MAX_POPULATION_SIZE))
+        budgets = [size_search(10 ** power) for power in range(1, 20)]
+        self.assertEqual(budgets, sorted(budgets))
+        self.assertLess(budgets[0][1], budgets[-1][1])
+
+    def test_stagnation_is_relative(self):
+        """The same relative progress stalls at any fitness scale; 0 never stalls."""
+        from adaptive import ConvergenceMonitor
+
+        def decisions(scale: float, gains: List[float]) -> List[str]:
+            monitor = ConvergenceMonitor(window=3, tolerance=0.01, spread=0.0)
+            best, results = 100.0, []
+            for gain in gains:
+                best += gain
+                results.append(monitor.update(best * scale, best * scale / 2))
+            return results
+
+        gains = [0, 5, 5, 0.1, 0.1, 0.1]
+        self.assertEqual(decisions(1, gains), [None, None, None, None, "stagnated", "stagnated"])
+        self.assertEqual(decisions(1000, gains), decisions(1, gains))
+
+        monitor = ConvergenceMonitor(window=2)
+        self.assertEqual([monitor.update(0, 0) for _ in range(5)], [None] * 5)
+
+    def test_converged_population(self):
+        """A population whose average has caught up with the best has converged."""
+        from adaptive import ConvergenceMonitor
+        monitor = ConvergenceMonitor(window=2, tolerance=0.0, spread=0.01)
+        self.assertIsNone(monitor.update(100, 99.5))  # Window not yet full
+        self.assertEqual(monitor.update(110, 109.5), "converged")
+
+    def test_window_scales_with_budget(self):
+        """Long budgets get proportionally longer stagnation windows."""
+        from adaptive import stagnation_window
+        self.assertEqual(stagnation_window(20), constants.STAGNATION_WINDOW)
+        self.assertEqual(stagnation_window(150), 15)
+
+    def test_feasible_runs_keep_searching(self):
+        """A run does not stop at its first feasible timetable, only when it stops improving."""
+        for ga_core in constants.GA_CORES:
+            with self.subTest(ga_core=ga_core):
+                generator = self.make_generator(engine="ga", seed=3, ga_core=ga_core)
+                generator.run()
+                self.assertGreater(generator.top_timetables[0][0], constants.BASE_SCORE)
+                self.assertGreater(generator.run_stats["generations"], 1)
+                self.assertIn(generator.run_stats["termination"], ("stagnated", "converged"))
+
+    def test_default_run_uses_budget(self):
+        """run() without sizes uses search_budget() and reports it."""
+        generator = self.make_generator(engine="ga", seed=1)
+        self.assertIsNotNone(generator.run())
+
+        generations, population = generator.search_budget()
+        self.assertEqual(generator.run_stats["budget"],
+                         {"generations": generations, "population": population})
+        self.assertLessEqual(generator.run_stats["generations"], generations)
+        self.assertIn(generator.run_stats["termination"],
+                      ("completed", "stagnated", "converged"))
+
+
+class TestRunner(unittest.TestCase):
+    """Test that run_tests() (used by run_tests.sh) runs every test class."""
+
+    def test_every_class_registered(self):
+        """A TestCase defined here but missing from TEST_CLASSES would never run there."""
+        loader = unittest.TestLoader()
+        defined = {
+            value for value in globals().values()
+            if isinstance(value, type) and issubclass(value, unittest.TestCase)
+            and value.__module__ == __name__ and loader.getTestCaseNames(value)
+        }
+        self.assertEqual(defined - set(TEST_CLASSES), set())
+
+
+class TestSyntheticCatalogue(unittest.TestCase):
+    """Test the seeded catalogue generator used by benchmark_suite.py."""
+
+    def test_shape_and_seed(self):
+        """Row counts follow the knobs, and a seed always gives the same rows."""
+        from synthetic_catalogue import make_catalogue, make_preferences
+        rows = make_catalogue(5, sections=3, tutorials=2, seed=4)
+
+        self.assertEqual(len(rows), 5 * 3 * (1 + 2))
+        self.assertEqual(rows, make_catalogue(5, sections=3, tutorials=2, seed=4))
+        self.assertNotEqual(rows, make_catalogue(5, sections=3, tutorials=2, seed=5))
+
+        generator = TimetableGenerator(load_classes_from_json(rows), make_preferences(rows, 3))
+        self.assertEqual(len(generator.gene_map), 3)
+
+    def test_clash_density(self):
+        """Full density puts every lecture in one slot."""
+        from synthetic_catalogue import make_catalogue
+        crowded = make_catalogue(6, tutorials=0, clash_density=1.0)
+        self.assertEqual(len({(row["days"], row["start_time"]) for row in crowded}), 1)
+        with self.assertRaises(ValueError):
+            make_catalogue(6, clash_density=1.5)
+
+
+# Every test class, in the order run_tests() runs them
+TEST_CLASSES = [
+    TestTimetableEngineCore,
+    TestTimetableGeneration,
+    TestSchedulingStyles,
+    TestOutputFormatting,
+    TestScoreCalculator,
+    TestFitnessCache,
+    TestExactSolver,
+    TestPopulationEvaluator,
+    TestParallelEvaluation,
+    TestIslandModel,
+    TestFeasibilityOperators,
+    TestDeltaEvaluator,
+    TestProgressStreaming,
+    TestDeadlineAndCancellation,
+    TestColumnarFormat,
+    TestCatalogueSnapshot,
+    TestCsvLoader,
+    TestAlternatives,
+    TestNativeEvolution,
+    TestAdaptiveSearch,
+    TestSyntheticCatalogue,
+    TestRunner
+]
+
+
 def run_tests():
     """Run all tests and return results."""
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
     
-    # Add all test classes
-    test_classes = [
-        TestTimetableEngineCore,
-        TestTimetableGeneration,
-        TestSchedulingStyles,
-        TestOutputFormatting,
-        TestScoreCalculator
-    ]
-    
-    for test_class in test_classes:
+    for test_class in TEST_CLASSES:
         suite.addTests(loader.loadTestsFromTestCase(test_class))
     
     # Run tests
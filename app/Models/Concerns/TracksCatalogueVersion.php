@@ -0,0 +1,39 @@
+<?php
+
+namespace App\Models\Concerns;
+
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Str;
+
+/**
+ * Changes to a model using this trait change the section catalogue version.
+ *
+ * Everything the timetable engine input is built from (sections and the
+ * subject, lecturer and day names they carry) uses it, so cached timetable
+ * results keyed by the version are dropped whenever the catalogue changes.
+ * Query-builder mass updates bypass model events and must call
+ * bumpCatalogueVersion() themselves.
+ */
+trait TracksCatalogueVersion
+{
+    public const CATALOGUE_VERSION_KEY = 'timetable_catalogue_version';
+
+    public static function bootTracksCatalogueVersion(): void
+    {
+        static::saved(fn () => static::bumpCatalogueVersion());
+        static::deleted(fn () => static::bumpCatalogueVersion());
+    }
+
+    /**
+     * The current catalogue version (an opaque string).
+     */
+    public static function catalogueVersion(): string
+    {
+        return Cache::rememberForever(self::CATALOGUE_VERSION_KEY, fn () => (string) Str::uuid());
+    }
+
+    public static function bumpCatalogueVersion(): void
+    {
+        Cache::forever(self::CATALOGUE_VERSION_KEY, (string) Str::uuid());
+    }
+}
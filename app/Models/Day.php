@@ -2,11 +2,12 @@
 
 namespace App\Models;
 
+use App\Models\Concerns\TracksCatalogueVersion;
 use Illuminate\Database\Eloquent\Factories\HasFactory;
 use Illuminate\Database\Eloquent\Model;
 
 class Day extends Model
 {
-    use HasFactory;
+    use HasFactory, TracksCatalogueVersion;
     //
 }
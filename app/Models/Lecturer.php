@@ -2,12 +2,13 @@
 
 namespace App\Models;
 
+use App\Models\Concerns\TracksCatalogueVersion;
 use Illuminate\Database\Eloquent\Factories\HasFactory;
 use Illuminate\Database\Eloquent\Model;
 
 class Lecturer extends Model
 {
-    use HasFactory;
+    use HasFactory, TracksCatalogueVersion;
 
     protected $fillable = ['name', 'email', 'phone', 'department'];
 }
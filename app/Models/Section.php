@@ -2,6 +2,7 @@
 
 namespace App\Models;
 
+use App\Models\Concerns\TracksCatalogueVersion;
 use Illuminate\Database\Eloquent\Concerns\HasUuids;
 use Illuminate\Database\Eloquent\Factories\HasFactory;
 use Illuminate\Database\Eloquent\Model;
@@ -33,7 +34,7 @@
  */
 class Section extends Model
 {
-    use HasFactory, HasUuids;
+    use HasFactory, HasUuids, TracksCatalogueVersion;
 
     protected $table = 'sections';
 
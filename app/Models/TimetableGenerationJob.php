@@ -0,0 +1,65 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+/**
+ * @OA\Schema(
+ *     schema="TimetableGenerationJob",
+ *     type="object",
+ *     title="Timetable Generation Job",
+ *     description="A queued timetable generation and its result",
+ *     @OA\Property(property="id", type="integer", description="Job ID"),
+ *     @OA\Property(property="status", type="string", enum={"queued", "running", "completed", "failed"}, description="Job status"),
+ *     @OA\Property(property="attempts", type="integer", description="Times a worker has picked the job up"),
+ *     @OA\Property(property="error", type="string", nullable=true, description="Failure message when status is failed"),
+ *     @OA\Property(property="generated_timetable", ref="#/components/schemas/GeneratedTimetable", nullable=true, description="The saved timetable when status is completed"),
+ *     @OA\Property(property="finished_at", type="string", format="date-time", nullable=true),
+ *     @OA\Property(property="created_at", type="string", format="date-time"),
+ *     @OA\Property(property="updated_at", type="string", format="date-time")
+ * )
+ */
+class TimetableGenerationJob extends Model
+{
+    public const STATUS_QUEUED = 'queued';
+    public const STATUS_RUNNING = 'running';
+    public const STATUS_COMPLETED = 'completed';
+    public const STATUS_FAILED = 'failed';
+
+    protected $fillable = [
+        'user_id',
+        'queue',
+        'status',
+        'input',
+        'attempts',
+        'reserved_at',
+        'available_at',
+        'generated_timetable_id',
+        'error',
+        'finished_at',
+    ];
+
+    protected $casts = [
+        'input' => 'array',
+        'finished_at' => 'datetime',
+    ];
+
+    // The engine input can be large; it is only read by the worker
+    protected $hidden = [
+        'input',
+        'queue',
+        'reserved_at',
+        'available_at',
+    ];
+
+    public function user()
+    {
+        return $this->belongsTo(User::class);
+    }
+
+    public function generatedTimetable()
+    {
+        return $this->belongsTo(GeneratedTimetable::class);
+    }
+}
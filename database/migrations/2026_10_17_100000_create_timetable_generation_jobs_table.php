@@ -0,0 +1,42 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     *
+     * Queued timetable generations, claimed by the Python engine worker
+     * (TimetableEngine/worker.py). The reservation columns follow the
+     * framework's jobs table; unlike it, rows are kept after they finish so
+     * clients can poll their status and result.
+     */
+    public function up(): void
+    {
+        Schema::create('timetable_generation_jobs', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('user_id')->constrained()->onDelete('cascade');
+            $table->string('queue')->default('timetables')->index();
+            $table->string('status')->default('queued')->index();
+            $table->longText('input');
+            $table->unsignedTinyInteger('attempts')->default(0);
+            $table->unsignedInteger('reserved_at')->nullable();
+            $table->unsignedInteger('available_at');
+            $table->foreignId('generated_timetable_id')->nullable()->constrained()->nullOnDelete();
+            $table->text('error')->nullable();
+            $table->timestamp('finished_at')->nullable();
+            $table->timestamps();
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('timetable_generation_jobs');
+    }
+};
@@ -22,6 +22,9 @@
 Route::middleware('auth:sanctum')->group(function () {
     Route::post('/logout', [AuthController::class, 'logout']);
     Route::post('generate-timetable', [GeneratedTimetableController::class, 'generate']);
+    Route::post('generate-timetable/stream', [GeneratedTimetableController::class, 'generateStream']);
+    Route::post('generate-timetable/jobs', [GeneratedTimetableController::class, 'queue']);
+    Route::get('generate-timetable/jobs/{id}', [GeneratedTimetableController::class, 'jobStatus']);
     Route::apiResource('lecturers', LecturerController::class);
     Route::apiResource('timetables', TimetableController::class);
     Route::apiResource('timeslots', TimeSlotController::class);
@@ -9,6 +9,7 @@
 use App\Models\Day;
 use App\Models\User;
 use Illuminate\Foundation\Testing\RefreshDatabase;
+use Illuminate\Support\Facades\DB;
 use Laravel\Sanctum\Sanctum;
 use Tests\TestCase;
 
@@ -75,6 +76,80 @@ public function a_user_can_generate_a_timetable()
         ]);
     }
 
+    /** @test */
+    public function a_repeated_request_is_served_from_the_result_cache()
+    {
+        $user = User::factory()->create();
+        Sanctum::actingAs($user);
+        [$subject, $monday] = $this->createCatalogue();
+        $payload = $this->generationPayload($subject, $monday);
+
+        $first = $this->postJson('/api/generate-timetable', $payload);
+        $first->assertStatus(201);
+
+        // Removing rows without model events leaves the catalogue version as
+        // it was, so only the cached result can satisfy the same request
+        DB::table('sections')->delete();
+        $second = $this->postJson('/api/generate-timetable', $payload);
+
+        $second->assertStatus(201);
+        $this->assertEquals($first->json('timetable'), $second->json('timetable'));
+        $this->assertEquals(1, GeneratedTimetable::where('user_id', $user->id)->where('active', true)->count());
+    }
+
+    /** @test */
+    public function changing_a_section_invalidates_cached_results()
+    {
+        Sanctum::actingAs(User::factory()->create());
+        [$subject, $monday, $lecture] = $this->createCatalogue();
+        $payload = $this->generationPayload($subject, $monday);
+        $version = Section::catalogueVersion();
+
+        $this->postJson('/api/generate-timetable', $payload)->assertStatus(201);
+
+        $lecture->update(['start_time' => '07:00:00']);
+        $this->assertNotEquals($version, Section::catalogueVersion());
+
+        // The lecture now starts before the preferred window
+        $this->postJson('/api/generate-timetable', $payload)->assertStatus(422);
+    }
+
+    /** @test */
+    public function a_user_can_ask_for_alternative_timetables()
+    {
+        $user = User::factory()->create();
+        Sanctum::actingAs($user);
+        [$subject, $monday, $lecture] = $this->createCatalogue();
+        Section::factory()->create([
+            'subject_id' => $subject->id,
+            'lecturer_id' => $lecture->lecturer_id,
+            'section_number' => 'TC2L',
+            'activity' => 'Lecture',
+            'day_of_week' => 'Monday',
+            'start_time' => '14:00:00',
+            'end_time' => '16:00:00',
+            'tied_to' => [],
+        ]);
+        $payload = $this->generationPayload($subject, $monday);
+        $payload['preferences']['alternatives'] = 3;
+
+        $response = $this->postJson('/api/generate-timetable', $payload);
+
+        // Either lecture section makes a timetable, so there are two, ranked
+        $response->assertStatus(201);
+        $this->assertEquals([1, 2], array_column($response->json('alternatives'), 'rank'));
+        $this->assertEquals($response->json('timetable'), $response->json('alternatives.0.timetable'));
+        $this->assertEquals(1, GeneratedTimetable::where('user_id', $user->id)->where('active', true)->count());
+
+        $payload['preferences']['alternatives'] = 11;
+        $this->postJson('/api/generate-timetable', $payload)->assertStatus(422);
+
+        // Only this endpoint returns alternatives; the others refuse to drop them
+        $payload['preferences']['alternatives'] = 3;
+        $this->postJson('/api/generate-timetable/stream', $payload)->assertStatus(422);
+        $this->postJson('/api/generate-timetable/jobs', $payload)->assertStatus(422);
+    }
+
     /** @test */
     public function a_user_can_view_their_generated_timetable()
     {
@@ -87,4 +162,39 @@ public function a_user_can_view_their_generated_timetable()
         $response->assertStatus(200);
         $response->assertJsonFragment(['id' => $timetable->id]);
     }
+
+    private function createCatalogue(): array
+    {
+        $subject = Subject::factory()->create(['name' => 'Introduction to Programming', 'code' => 'CS101']);
+        $lecturer = Lecturer::factory()->create(['name' => 'Dr. Smith']);
+        $monday = Day::factory()->create(['name' => 'Monday']);
+
+        $lecture = Section::factory()->create([
+            'subject_id' => $subject->id,
+            'lecturer_id' => $lecturer->id,
+            'section_number' => 'TC1L',
+            'activity' => 'Lecture',
+            'day_of_week' => 'Monday',
+            'start_time' => '09:00:00',
+            'end_time' => '11:00:00',
+            'tied_to' => [],
+        ]);
+
+        return [$subject, $monday, $lecture];
+    }
+
+    private function generationPayload(Subject $subject, Day $day): array
+    {
+        return [
+            'preferences' => [
+                'subjects' => [$subject->id],
+                'days' => [$day->id],
+                'start_time' => '08:00',
+                'end_time' => '18:00',
+                'enforce_ties' => 'no',
+                'lecturers' => [],
+                'mode' => 1,
+            ]
+        ];
+    }
 }